@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: rank_bm25.BM25Okapi vs the vectorized core.bm25.BM25Scorer.
+
+Run from the repository root:
+    python benchmarks/bm25_benchmark.py
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.bm25 import BM25Scorer  # noqa: E402
+
+CORPUS_SIZES = [10, 100, 1_000, 10_000]
+N_QUERIES = 8
+SNIPPET_LENGTH = (15, 40)  # Serper title + snippet, in tokens
+
+
+def make_corpus(n_docs: int, rng: random.Random):
+    """Zipf-like synthetic snippets so common terms get negative IDF too."""
+    vocabulary = [f"term{i}" for i in range(5_000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    corpus = [
+        rng.choices(vocabulary, weights, k=rng.randint(*SNIPPET_LENGTH))
+        for _ in range(n_docs)
+    ]
+    queries = [rng.choices(vocabulary[:500], k=5) for _ in range(N_QUERIES)]
+    return corpus, queries
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    rng = random.Random(42)
+    print(
+        f"{'docs':>7} {'BM25Okapi (s)':>14} {'vectorized (s)':>15} "
+        f"{'speedup':>8} {'max |diff|':>11}"
+    )
+    for n_docs in CORPUS_SIZES:
+        corpus, queries = make_corpus(n_docs, rng)
+
+        # Existing path: rebuild the index for every query, score one at a time
+        def baseline():
+            return np.array([BM25Okapi(corpus).get_scores(q) for q in queries])
+
+        # New path: build once, score every query in one batch
+        def vectorized():
+            return BM25Scorer.from_tokenized(corpus).get_batch_scores(queries)
+
+        diff = np.abs(baseline() - vectorized()).max()
+        old, new = best_of(baseline), best_of(vectorized)
+        print(
+            f"{n_docs:>7} {old:>14.4f} {new:>15.4f} {old / new:>7.1f}x {diff:>11.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
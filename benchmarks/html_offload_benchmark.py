@@ -0,0 +1,130 @@
+"""
+Event-loop responsiveness while large pages are converted to markdown,
+with post-processing on the event loop vs in the HTMLProcessPool.
+
+A local server serves large article pages. They are scraped through the
+plain-HTTP fast path (no browser needed) while a heartbeat task measures how
+late the event loop wakes it up: that lag is what a concurrent browser,
+search request or Streamlit session would see.
+
+Run from the repository root:
+    python benchmarks/html_offload_benchmark.py
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.html_processing import HTMLProcessPool  # noqa: E402
+from core.politeness import HostScheduler  # noqa: E402
+from core.scrape import Crawl4AIScraper  # noqa: E402
+
+N_PAGES = 24
+WINDOW = 6
+SECTIONS = 400  # ~1 MB of HTML per page
+HEARTBEAT = 0.005
+
+SECTION = (
+    '<section><h2>Section {i}</h2><p>Paragraph {i} explains the quarterly '
+    'results in detail, with <a href="/related/{i}">a related story</a> and '
+    "<b>figures</b> for every segment of the business.</p>"
+    '<ul><li>Revenue {i}</li><li>Margin {i}</li><li><a href="/t/{i}">Tag</a></li>'
+    "</ul></section>"
+)
+PAGE = (
+    "<html><head><title>Article {n}</title></head><body><article>"
+    + "".join(SECTION.format(i=i) for i in range(SECTIONS))
+    + "</article></body></html>"
+)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGE.format(n=self.path.rsplit("/", 1)[-1]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def heartbeat(lags: list, stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(HEARTBEAT)
+        lags.append(loop.time() - start - HEARTBEAT)
+
+
+async def run(port: int, mode: str, pool: HTMLProcessPool):
+    scraper = Crawl4AIScraper(
+        max_concurrent=WINDOW,
+        monitor=False,
+        use_page_store=False,
+        host_scheduler=HostScheduler(max_per_host=WINDOW, min_interval=0),
+        offload_processing=mode == "process pool",
+        html_pool=pool,
+    )
+    # Warm up the HTTP client and (in pool mode) spawn the workers
+    await scraper.scrape_many(
+        [f"http://127.0.0.1:{port}/warmup/{i}?{mode}" for i in range(pool.workers)]
+    )
+
+    urls = [f"http://127.0.0.1:{port}/page/{n}?{mode}" for n in range(N_PAGES)]
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    start = time.perf_counter()
+    results = await scraper.scrape_many(urls)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    await scraper.close()
+
+    ok = sum(
+        r["metadata"]["success"] and r["metadata"]["renderer"] == "http"
+        for r in results
+    )
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    print(
+        f"{mode:>13} {elapsed:>9.2f} {ok:>4} {statistics.mean(lags) * 1000:>9.1f} "
+        f"{p99 * 1000:>8.1f} {lags[-1] * 1000:>8.1f}"
+    )
+
+
+async def main():
+    server = start_server()
+    port = server.server_address[1]
+    pool = HTMLProcessPool()
+    print(
+        f"{N_PAGES} pages of ~{len(PAGE) / 1e6:.1f} MB, {WINDOW} in flight, "
+        f"{pool.workers} worker(s) on {os.cpu_count()} CPU(s)"
+    )
+    print(
+        f"{'processing':>13} {'time (s)':>9} {'ok':>4} {'lag mean':>9} "
+        f"{'lag p99':>8} {'lag max':>8}  (ms)"
+    )
+    for mode in ("event loop", "process pool"):
+        await run(port, mode, pool)
+    pool.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""
+Memory held by a 30-page scrape with bodies in Python strings vs spilled to
+a PageBuffer, and the cost of building the LLM context from either.
+
+Pages are the same synthetic CrawlResults as result_projection_benchmark.py,
+formatted and projected as the scraper does when a page finishes, and kept
+until the context is built like main.py keeps scraped_data. Each mode runs in
+a fresh subprocess so peak RSS is not shared between them.
+
+Run from the repository root:
+    python benchmarks/page_buffer_benchmark.py
+"""
+
+from pathlib import Path
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from result_projection_benchmark import (  # noqa: E402
+    FIELDS,
+    HTML_BYTES,
+    N_PAGES,
+    Corpus,
+    make_page,
+)
+
+MODES = ("full", "full+buffer", "projected", "projected+buffer")
+
+
+class ParagraphCorpus(Corpus):
+    """Corpus text with sentences and paragraphs, so pages split into passages."""
+
+    def __init__(self, rng: random.Random):
+        super().__init__(rng)
+        words = self.words.split(" ")
+        for i in range(11, len(words), 12):
+            words[i] += ".\n\n" if i % 96 == 95 else "."
+        self.words = " ".join(words)
+
+
+def run(mode: str):
+    import psutil
+
+    from core.context import ContextBuilder
+    from core.page_buffer import PageBuffer
+    from core.scrape import Crawl4AIScraper
+
+    scraper = Crawl4AIScraper(monitor=False, use_page_store=False)
+    fields = scraper._check_fields(FIELDS if mode.startswith("projected") else None)
+    text = ParagraphCorpus(random.Random(7))
+    builder = ContextBuilder()
+    query = " ".join(text.words.split()[:3])  # Words the corpus repeats
+
+    baseline = psutil.Process().memory_info().rss
+    tracemalloc.start()
+    with PageBuffer() as buffer:
+        spill = buffer if mode.endswith("+buffer") else None
+        scraped_data = []
+        for n in range(N_PAGES):
+            page = make_page(text, n)
+            scraped_data.append(
+                scraper._project(scraper._format_result(page), fields, spill)
+            )
+            del page
+        held, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        context = builder.build(query, scraped_data)
+        elapsed = time.perf_counter() - start
+        _, peak_heap = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    assert context
+    print(
+        f"{(peak_rss - baseline) / 2**20:.1f} {held / 2**20:.1f} "
+        f"{peak_heap / 2**20:.1f} {buffer.size / 2**20:.1f} {elapsed * 1000:.0f}"
+    )
+
+
+def main():
+    print(f"{N_PAGES} pages, ~{HTML_BYTES / 1e6:.1f} MB HTML each")
+    print(
+        f"{'results':>17} {'peak RSS growth':>16} {'held heap':>10} "
+        f"{'peak heap':>10} {'spilled':>8}  (MB) {'context (ms)':>13}"
+    )
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        rss, held, peak, spilled, elapsed = (float(value) for value in output[-5:])
+        print(
+            f"{mode:>17} {rss:>16.1f} {held:>10.1f} {peak:>10.1f} "
+            f"{spilled:>8.1f}       {elapsed:>13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,151 @@
+"""
+Bytes transferred and page-load time of each render profile.
+
+A local fixture site serves article pages with a stylesheet, a web font,
+images, a preloaded video and two "third-party" tags. The tags are served
+from `localhost` while pages come from 127.0.0.1, and `localhost` is added to
+the tracker hosts so the tracker rules apply to them. The server counts the
+bytes it sends per profile and throttles responses to BANDWIDTH, so
+downloads cost time the way they do on a real network.
+
+Needs a Playwright browser (`playwright install chromium`). Run from the
+repository root:
+    python benchmarks/render_profile_benchmark.py
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+import asyncio
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crawl4ai import BrowserConfig  # noqa: E402
+
+from core.politeness import HostScheduler  # noqa: E402
+from core.render_profiles import PROFILES, TRACKER_HOSTS, RenderProfiles  # noqa: E402
+from core.scrape import Crawl4AIScraper  # noqa: E402
+
+N_PAGES = 20
+WINDOW = 5
+BANDWIDTH = 4 * 1024 * 1024  # Bytes per second per response
+N_IMAGES = 8
+
+ASSETS = {
+    "/style.css": ("text/css", b"body { font-family: Fixture; }" + b" " * 40_000),
+    "/font.woff2": ("font/woff2", b"\0" * 80_000),
+    "/image.jpg": ("image/jpeg", b"\xff" * 150_000),
+    "/video.mp4": ("video/mp4", b"\0" * 1_500_000),
+    "/tag.js": ("application/javascript", b"var tag = 1;" + b" " * 120_000),
+    "/pixel.gif": ("image/gif", b"\0" * 500),
+}
+
+PAGE = """<html><head><title>Article {n}</title>
+<link rel="stylesheet" href="/style.css?{query}">
+<style>@font-face {{ font-family: Fixture; src: url(/font.woff2?{query}); }}</style>
+<script src="http://localhost:{port}/tag.js?{query}"></script>
+</head><body><article><h1>Article {n}</h1>
+{paragraphs}
+{images}
+<video src="/video.mp4?{query}" preload="auto"></video>
+<img src="http://localhost:{port}/pixel.gif?{query}">
+</article></body></html>"""
+PARAGRAPH = "<p>Paragraph {i} of the article, with enough words to be kept as text.</p>"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    sent = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parsed.query
+        run = parse_qs(query).get("run", ["?"])[0]
+        if parsed.path.startswith("/page/"):
+            n = parsed.path.rsplit("/", 1)[-1]
+            port = self.server.server_address[1]
+            body = PAGE.format(
+                n=n,
+                port=port,
+                query=query,
+                paragraphs="\n".join(PARAGRAPH.format(i=i) for i in range(30)),
+                images="\n".join(
+                    f'<img src="/image.jpg?{query}&i={i}">' for i in range(N_IMAGES)
+                ),
+            ).encode()
+            content_type = "text/html; charset=utf-8"
+        elif parsed.path in ASSETS:
+            content_type, body = ASSETS[parsed.path]
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        time.sleep(len(body) / BANDWIDTH)
+        self.wfile.write(body)
+        with self.lock:
+            self.sent[run] = self.sent.get(run, 0) + len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_profile(port: int, profile: str):
+    scraper = Crawl4AIScraper(
+        browser_config=BrowserConfig(headless=True, verbose=False),
+        max_concurrent=WINDOW,
+        monitor=False,
+        use_page_store=False,
+        use_http_fast_path=False,  # Measure the browser, not the plain GET
+        host_scheduler=HostScheduler(max_per_host=WINDOW, min_interval=0),
+        render_profiles=RenderProfiles(
+            default=profile, tracker_hosts=TRACKER_HOSTS | {"localhost"}
+        ),
+    )
+    urls = [f"http://127.0.0.1:{port}/page/{n}?run={profile}" for n in range(N_PAGES)]
+    async with scraper:
+        await scraper.scrape(f"http://127.0.0.1:{port}/page/warmup?run=warmup")
+        start = time.perf_counter()
+        results = await scraper.scrape_many(urls)
+        elapsed = time.perf_counter() - start
+    ok = sum(r["metadata"]["success"] for r in results)
+    words = sum(len((r["content"]["markdown"]["raw"] or "").split()) for r in results)
+    return elapsed, ok, words
+
+
+async def main():
+    server = start_server()
+    port = server.server_address[1]
+    print(
+        f"{N_PAGES} pages, {WINDOW} in flight, "
+        f"{BANDWIDTH / 2**20:.0f} MB/s per response"
+    )
+    print(
+        f"{'profile':>8} {'MB sent':>8} {'time (s)':>9} {'s/page':>7} "
+        f"{'ok':>4} {'words':>6}"
+    )
+    for profile in PROFILES:
+        elapsed, ok, words = await run_profile(port, profile)
+        sent = FixtureHandler.sent.get(profile, 0)
+        print(
+            f"{profile:>8} {sent / 2**20:>8.2f} {elapsed:>9.2f} "
+            f"{elapsed / N_PAGES * WINDOW:>7.2f} {ok:>4} {words:>6}"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
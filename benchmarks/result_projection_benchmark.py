@@ -0,0 +1,128 @@
+"""
+Peak memory of a 30-page scrape with full results vs `fields=` projection.
+
+Each page is a real crawl4ai CrawlResult with HTML, cleaned HTML, markdown,
+media and links of typical news-article size. Results are formatted and
+projected as the scraper does when a page finishes, and kept until the end
+like main.py and app.py keep scraped_data. Each mode runs in a fresh
+subprocess so peak RSS is not shared between them.
+
+Run from the repository root:
+    python benchmarks/result_projection_benchmark.py
+"""
+
+from pathlib import Path
+import random
+import resource
+import string
+import subprocess
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+N_PAGES = 30
+HTML_BYTES = 1_500_000  # Rendered article page with inline scripts and styles
+CLEANED_HTML_BYTES = 300_000
+MARKDOWN_BYTES = 40_000
+N_LINKS = 400
+N_IMAGES = 60
+
+FIELDS = ("metadata.url", "content.markdown.raw")
+
+
+class Corpus:
+    """Random words; slices at different offsets are distinct string objects."""
+
+    def __init__(self, rng: random.Random):
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+            for _ in range(512)
+        ]
+        self.words = " ".join(rng.choices(words, k=HTML_BYTES // 3))
+        self.rng = rng
+
+    def __call__(self, size: int) -> str:
+        start = self.rng.randrange(len(self.words) - size)
+        return self.words[start : start + size]
+
+
+def make_page(text: Corpus, n: int):
+    from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+
+    url = f"https://news.example.com/article/{n}"
+    markdown = text(MARKDOWN_BYTES)
+    return CrawlResult(
+        url=url,
+        html=f"<html><body>{text(HTML_BYTES)}</body></html>",
+        cleaned_html=f"<div>{text(CLEANED_HTML_BYTES)}</div>",
+        success=True,
+        status_code=200,
+        response_headers={},
+        markdown=MarkdownGenerationResult(
+            raw_markdown=markdown,
+            markdown_with_citations="",
+            references_markdown="",
+            fit_markdown=markdown[: MARKDOWN_BYTES // 2],
+        ),
+        media={
+            "images": [
+                {"src": f"{url}/img/{i}.jpg", "alt": text(80)}
+                for i in range(N_IMAGES)
+            ]
+        },
+        links={
+            "internal": [
+                {"href": f"{url}/related/{i}", "text": text(60)}
+                for i in range(N_LINKS)
+            ]
+        },
+    )
+
+
+def run(mode: str):
+    import psutil
+
+    from core.scrape import Crawl4AIScraper
+
+    scraper = Crawl4AIScraper(monitor=False, use_page_store=False)
+    fields = scraper._check_fields(FIELDS if mode == "projected" else None)
+    text = Corpus(random.Random(7))
+
+    baseline = psutil.Process().memory_info().rss
+    tracemalloc.start()
+    scraped_data = []
+    for n in range(N_PAGES):
+        page = make_page(text, n)
+        scraped_data.append(scraper._project(scraper._format_result(page), fields))
+        del page
+    _, peak_heap = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    assert all(r["content"]["markdown"]["raw"] for r in scraped_data)
+    print(f"{(peak_rss - baseline) / 2**20:.1f} {peak_heap / 2**20:.1f}")
+
+
+def main():
+    print(f"{N_PAGES} pages, ~{HTML_BYTES / 1e6:.1f} MB HTML each")
+    print(f"{'results':>10} {'peak RSS growth (MB)':>21} {'peak heap (MB)':>15}")
+    rows = {}
+    for mode in ("full", "projected"):
+        output = subprocess.run(
+            [sys.executable, __file__, mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        rss, heap = (float(value) for value in output[-2:])
+        rows[mode] = rss
+        print(f"{mode:>10} {rss:>21.1f} {heap:>15.1f}")
+    print(f"peak RSS reduction: {1 - rows['projected'] / rows['full']:.0%}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        main()
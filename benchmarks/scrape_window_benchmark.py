@@ -0,0 +1,138 @@
+"""
+Benchmark: batch-barrier scheduling vs the sliding-window scheduler in
+Crawl4AIScraper.scrape_many(batch_size=...).
+
+A local HTTP server serves a mix of fast pages and pages that respond after
+SLOW_DELAY seconds. With batches, every slow page holds up the rest of its
+batch; the sliding window starts the next page as soon as any slot frees up.
+
+Needs a Playwright browser (`playwright install chromium`). Run from the
+repository root:
+    python benchmarks/scrape_window_benchmark.py
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import asyncio
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig  # noqa: E402
+from crawl4ai.async_configs import CacheMode  # noqa: E402
+from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher  # noqa: E402
+
+from core.scrape import Crawl4AIScraper  # noqa: E402
+
+N_PAGES = 40
+SLOW_EVERY = 5  # Every 5th page is slow
+SLOW_DELAY = 2.0
+WINDOW = 5
+
+PAGE = (
+    "<html><head><title>Page {n}</title></head><body><article>"
+    + "<p>Paragraph {n} with enough words to pass the threshold.</p>" * 20
+    + "</article></body></html>"
+)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/slow/"):
+            time.sleep(SLOW_DELAY)
+        body = PAGE.format(n=self.path.rsplit("/", 1)[-1]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_urls(port: int, run: str):
+    # A distinct query string per run keeps any cache out of the measurement
+    return [
+        f"http://127.0.0.1:{port}/{'slow' if i % SLOW_EVERY == 0 else 'fast'}/{i}"
+        f"?run={run}"
+        for i in range(N_PAGES)
+    ]
+
+
+def make_dispatcher() -> MemoryAdaptiveDispatcher:
+    return MemoryAdaptiveDispatcher(max_session_permit=WINDOW, check_interval=0.1)
+
+
+def report(name: str, elapsed: float, ok: int):
+    print(f"{name:>15} {elapsed:>9.2f} {N_PAGES / elapsed:>8.1f} {ok:>4}")
+
+
+async def batched(crawler: AsyncWebCrawler, urls, config: CrawlerRunConfig):
+    """The previous _process_in_batches: one arun_many per batch, then wait."""
+    results = []
+    for i in range(0, len(urls), WINDOW):
+        results.extend(
+            await crawler.arun_many(
+                urls=urls[i : i + WINDOW], config=config, dispatcher=make_dispatcher()
+            )
+        )
+    return results
+
+
+async def main():
+    server = start_server()
+    port = server.server_address[1]
+    browser_config = BrowserConfig(headless=True, verbose=False)
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, verbose=False)
+
+    n_slow = len(range(0, N_PAGES, SLOW_EVERY))
+    print(
+        f"{N_PAGES} pages ({n_slow} slow, {SLOW_DELAY:.1f}s each), "
+        f"{WINDOW} pages in flight"
+    )
+    print(f"{'scheduler':>15} {'time (s)':>9} {'pages/s':>8} {'ok':>4}")
+
+    async with AsyncWebCrawler(config=browser_config) as crawler:
+        await crawler.arun(url=f"http://127.0.0.1:{port}/fast/warmup", config=config)
+        start = time.perf_counter()
+        results = await batched(crawler, make_urls(port, "batched"), config)
+        elapsed = time.perf_counter() - start
+        ok = sum(r.success for r in results)
+        report("batch barrier", elapsed, ok)
+
+    async with Crawl4AIScraper(
+        browser_config=browser_config,
+        cache_mode=CacheMode.BYPASS,
+        max_concurrent=WINDOW,
+        monitor=False,
+        # Compare scheduling only: every page is on 127.0.0.1, so per-host
+        # politeness would serialize them, and the plain-HTTP fast path, the
+        # page store and resource blocking would skip work the batch side does
+        use_host_scheduler=False,
+        use_http_fast_path=False,
+        use_page_store=False,
+        use_render_profiles=False,
+    ) as scraper:
+        await scraper.scrape(f"http://127.0.0.1:{port}/fast/warmup")
+        start = time.perf_counter()
+        results = await scraper.scrape_many(
+            make_urls(port, "window"), dispatcher=make_dispatcher(), batch_size=WINDOW
+        )
+        elapsed = time.perf_counter() - start
+        ok = sum(r["metadata"]["success"] for r in results)
+        report("sliding window", elapsed, ok)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
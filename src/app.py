@@ -1,16 +1,86 @@
 import streamlit as st
 import asyncio
+import atexit
+import contextvars
+import functools
 import json
+import queue
+import threading
 
 from core.search import Search
-from core.llm import LLM
+from core.llm import AsyncLLM
 from core.scrape import Crawl4AIScraper
+from core.context import ContextBuilder
+from core.page_buffer import PageBuffer
 from core.query_generator import Persona, QueryGenerator
 import re
-import asyncio
 
 
-async def web_search(query: str, custom_sources=None, persona=None, ui_containers=None):
+# UI updates of the query being run, applied on its session's script thread
+_ui_updates = contextvars.ContextVar("ui_updates", default=None)
+
+
+def ui(fn, *args, **kwargs) -> asyncio.Future:
+    """
+    Call a Streamlit function from async code.
+
+    Streamlit elements can only be used from the session's script thread, so
+    inside AppRuntime.run() the call is queued for it. Await the returned
+    future to get the call's result (e.g. a container).
+    """
+    future = asyncio.get_running_loop().create_future()
+    updates = _ui_updates.get()
+    if updates is None:
+        future.set_result(fn(*args, **kwargs))
+    else:
+        updates.put((functools.partial(fn, *args, **kwargs), future))
+    return future
+
+
+def show_sources(placeholder, domains):
+    with placeholder.container():
+        st.subheader("🔎 Sources:")
+        cols = st.columns(3)
+        for i, domain in enumerate(domains):
+            with cols[i % 3]:
+                st.markdown(f"{i+1}. <code>{domain}</code>", unsafe_allow_html=True)
+
+
+def add_call_containers(steps, tool_call):
+    """Placeholders of one tool call, in a section of its own under `steps`."""
+    try:
+        label = json.loads(tool_call.function.arguments)["query"]
+    except (ValueError, KeyError, TypeError):
+        label = tool_call.function.name
+    with steps:
+        section = st.container(border=True)
+    section.caption(f"Searching: {label}")
+    return {
+        "generated_queries": section.empty(),
+        "search_links": section.empty(),
+        "scraped_data": section.empty(),
+    }
+
+
+def show_link(container, rank, result):
+    title = result.get("title", "No Title")
+    snippet = result.get("snippet", "")
+    link = result.get("link", "#")
+
+    container.markdown(f"**{rank}. [{title}]({link})**")
+    if snippet:
+        container.markdown(f"> {snippet}")
+    container.markdown("---")
+
+
+async def web_search(
+    query: str,
+    custom_sources=None,
+    persona=None,
+    ui_containers=None,
+    scraper=None,
+    buffer=None,
+):
     """Perform web search and return scraped data and intermediate steps"""
     query_generator = QueryGenerator(persona)
     generated_queries = query_generator.get_queries(
@@ -20,125 +90,205 @@ async def web_search(query: str, custom_sources=None, persona=None, ui_container
     print("Generated Queries:", generated_queries)
 
     if ui_containers and "generated_queries" in ui_containers:
-        with ui_containers["generated_queries"].container():
-            st.subheader("🔎 Sources:")
-            domains = []
-            for q in generated_queries:
-                match = re.search(r"site:([^\s]+)", q)
-                if match:
-                    domains.append(match.group(1))
-            print("Domains found:", domains)
-            cols = st.columns(3)
-            for i, domain in enumerate(domains):
-                with cols[i % 3]:
-                    st.markdown(f"{i+1}. <code>{domain}</code>", unsafe_allow_html=True)
+        domains = []
+        for q in generated_queries:
+            match = re.search(r"site:([^\s]+)", q)
+            if match:
+                domains.append(match.group(1))
+        print("Domains found:", domains)
+        ui(show_sources, ui_containers["generated_queries"], domains)
 
     search = Search(query_generator.main_query_exclusions)
-    search_results = search.run_all_searches(
-        query, generated_queries, min_relevance=0.1
-    )
-    links = [r["link"] for r in search_results]
-
+    links_container = None
     if ui_containers and "search_links" in ui_containers:
-        with ui_containers["search_links"].container():
-            st.subheader("🌐 Search Results")
-            for i, result in enumerate(search_results):
-                title = result.get("title", "No Title")
-                snippet = result.get("snippet", "")
-                link = result.get("link", "#")
-
-                st.markdown(f"**{i + 1}. [{title}]({link})**")
-                if snippet:
-                    st.markdown(f"> {snippet}")
-                st.markdown("---")
-            st.subheader("📄 Gathering info")
-
-    scraper = Crawl4AIScraper()
-    scraped_data = await scraper.scrape_many(links)
+        links_container = await ui(ui_containers["search_links"].container)
+        ui(links_container.subheader, "🌐 Search Results")
+
+    search_results = []
+
+    async def links():
+        # Results are shown and handed to the scraper as each search returns
+        async for result in search.astream_searches(
+            query, generated_queries, min_relevance=0.1
+        ):
+            search_results.append(result)
+            if links_container is not None:
+                ui(show_link, links_container, len(search_results), result)
+            yield result["link"]
 
     if ui_containers and "scraped_data" in ui_containers:
-        with ui_containers["scraped_data"]:
-            st.subheader("Analysing Results..")
+        ui(ui_containers["scraped_data"].subheader, "📄 Gathering info")
+
+    scraper = scraper or Crawl4AIScraper()
+    # Only keep what the LLM prompt uses; HTML and resources are dropped per page
+    pages = scraper.scrape_stream(
+        links(),
+        check_robots_txt=True,
+        fields=("metadata.url", "content.markdown.raw"),
+        # A hanging page must not hold up the answer
+        deadline=15.0,
+        buffer=buffer,
+    )
+    # Pages robots.txt disallows (or that failed) come back without markdown
+    scraped_data = [page async for page in pages if page["content"]["markdown"]["raw"]]
+
+    if ui_containers and "scraped_data" in ui_containers:
+        ui(ui_containers["scraped_data"].subheader, "Analysing Results..")
 
     return scraped_data
 
 
 async def process_tool_call(
-    query, tool_call, sources=None, persona=None, ui_containers=None
+    tool_call, sources=None, persona=None, ui_containers=None, scraper=None
 ):
-    """Handle web search tool call and return all intermediate data"""
+    """Handle a tool call and return its result for the LLM"""
     if tool_call.function.name == "web_search":
-        return await web_search(query, sources, persona, ui_containers)
+        query = json.loads(tool_call.function.arguments)["query"]
+        # Large pages live in a memory-mapped file until the context is built
+        with PageBuffer() as buffer:
+            scraped_data = await web_search(
+                query, sources, persona, ui_containers, scraper, buffer
+            )
+            # Only the passages most relevant to the query go into the prompt
+            context = ContextBuilder.shared().build(query, scraped_data)
+        if not context:
+            return "No relevant results found for this query."
+        return f"Search Results for '{query}':\n\n" + context
     else:
-        return []
+        return f"Unknown tool called: {tool_call.function.name}"
+
+
+def get_session_llm(persona_name):
+    """The session's conversation, restarted when the persona changes."""
+    if "llm" not in st.session_state or st.session_state.persona_name != persona_name:
+        persona = Persona(persona_name)
+        st.session_state.llm = AsyncLLM(enable_tools=True, system_prompt=persona.prompt)
+        st.session_state.persona_name = persona_name
+    return st.session_state.llm
 
 
 async def handle_query(
-    user_input, persona_name="finance_expert", sources=None, ui_containers=None
+    user_input,
+    llm,
+    persona_name="finance_expert",
+    sources=None,
+    ui_containers=None,
+    scraper=None,
 ):
     if not user_input:
         return "Please enter a query."
 
-    if "llm" not in st.session_state or st.session_state.persona_name != persona_name:
-        persona = Persona(persona_name)
-        st.session_state.llm = LLM(enable_tools=True, system_prompt=persona.prompt)
-        st.session_state.persona_name = persona_name
+    answer_placeholder = ui_containers["answer"]
 
-    llm = st.session_state.llm
-
-    stream = llm.run(user_input, stream=True)
-    collected_response = ""
-    final_tool_calls = {}
-
-    answer_placeholder = ui_containers.get("answer", st.empty())
-    with answer_placeholder:
-        for chunk in stream:
-            delta = chunk.choices[0].delta
-
-            if delta.tool_calls:
-                for tool_call in delta.tool_calls:
-                    index = tool_call.index
-                    if index not in final_tool_calls:
-                        final_tool_calls[index] = tool_call
-                    else:
-                        final_tool_calls[
-                            index
-                        ].function.arguments += tool_call.function.arguments
-
-            elif delta.content:
-                collected_response += delta.content
-                answer_placeholder.markdown(collected_response)
-
-    if final_tool_calls:
-        first_call = list(final_tool_calls.values())[0]
-        scraped_data = await process_tool_call(
-            user_input, first_call, sources, Persona(persona_name), ui_containers
-        )
+    def show_answer(text):
+        ui(answer_placeholder.markdown, text)
 
-        combined_prompt = (
-            f"Original Query: {user_input}\n\n"
-            + "\n\n".join(
-                f"Source: {r['metadata']['url']}\nContent: {r['content']['markdown']['raw']}"
-                for r in scraped_data
+    response = await llm.collect_stream(
+        await llm.run(user_input, stream=True), on_content=show_answer
+    )
+
+    if response.tool_calls:
+        persona = Persona(persona_name)
+        # Searches run at once, so each one reports into its own section
+        call_containers = {}
+        for tool_call in response.tool_calls:
+            call_containers[tool_call.id] = await ui(
+                add_call_containers, ui_containers["steps"], tool_call
             )
-            + "\n\nPlease analyze these results and answer the query."
+        # Results go back as tool messages
+        await llm.run_tool_calls(
+            response,
+            lambda tool_call: process_tool_call(
+                tool_call, sources, persona, call_containers[tool_call.id], scraper
+            ),
+        )
+        response = await llm.collect_stream(
+            await llm.run(stream=True, tool_choice="none"),
+            on_content=show_answer,
+        )
+
+    final_response = response.content or ""
+    llm.add_message("assistant", final_response)
+    return final_response
+
+
+class AppRuntime:
+    """
+    Event loop and warm scraper shared by every Streamlit session.
+
+    The loop runs in a daemon thread and the browser pool is started on it
+    once per process, so a new browser tab reuses the same Chromium instead of
+    launching its own. Both are shut down when the resource is released or
+    the process exits.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="app-runtime", daemon=True
         )
-        llm.add_message("system", combined_prompt)
+        self._thread.start()
+        self.scraper = asyncio.run_coroutine_threadsafe(
+            Crawl4AIScraper().start(), self.loop
+        ).result()
+        self._closed = False
+        atexit.register(self.close)
+
+    async def _with_updates(self, coro, updates):
+        _ui_updates.set(updates)
+        return await coro
+
+    def run(self, coro):
+        """
+        Run a coroutine on the shared loop from a session's script thread.
+
+        Streamlit calls the coroutine makes through ui() are applied here, on
+        the calling thread, while it waits.
+        """
+        updates = queue.SimpleQueue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._with_updates(coro, updates), self.loop
+        )
+        future.add_done_callback(lambda _: updates.put(None))
+        try:
+            while (update := updates.get()) is not None:
+                call, done = update
+                try:
+                    result, error = call(), None
+                except Exception as e:
+                    result, error = None, e
+                self.loop.call_soon_threadsafe(_settle, done, result, error)
+        except BaseException:
+            # Streamlit stops a script (rerun, closed tab) by raising in it
+            future.cancel()
+            raise
+        return future.result()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            asyncio.run_coroutine_threadsafe(self.scraper.close(), self.loop).result(
+                timeout=30
+            )
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
 
-        stream2 = llm.run(stream=True)
-        final_response = ""
-        with answer_placeholder:
-            for chunk in stream2:
-                delta = chunk.choices[0].delta
-                content = delta.content
-                final_response += content if content else ""
-                answer_placeholder.markdown(final_response)
 
-        llm.add_message("assistant", final_response)
-        return final_response
+def _settle(future: asyncio.Future, result, error):
+    if future.cancelled():
+        return
+    if error is not None:
+        print(f"UI update failed: {error}")
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
 
-    llm.add_message("assistant", collected_response)
-    return collected_response
+@st.cache_resource(on_release=AppRuntime.close)
+def get_runtime() -> AppRuntime:
+    return AppRuntime()
 
 
 def app():
@@ -167,22 +317,21 @@ def app():
     # 🚀 Ask button
     if st.button("Ask"):
         if query:
-            # Create UI containers for displaying steps
-            generated_queries_container = st.empty()
-            search_links_container = st.empty()
-            scraped_data_container = st.empty()
-            answer_container = st.empty()
-
-            ui_containers = {
-                "generated_queries": generated_queries_container,
-                "search_links": search_links_container,
-                "scraped_data": scraped_data_container,
-                "answer": answer_container,
-            }
+            # Each tool call adds its own section of steps above the answer
+            ui_containers = {"steps": st.container(), "answer": st.empty()}
 
+            runtime = get_runtime()
+            llm = get_session_llm(persona_name)
             with st.spinner("Thinking..."):
-                asyncio.run(
-                    handle_query(query, persona_name, custom_sources, ui_containers)
+                runtime.run(
+                    handle_query(
+                        query,
+                        llm,
+                        persona_name,
+                        custom_sources,
+                        ui_containers,
+                        runtime.scraper,
+                    )
                 )
         else:
             st.warning("Please enter a question.")
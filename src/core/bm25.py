@@ -0,0 +1,340 @@
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+
+
+class TermDocMatrix:
+    """
+    Sparse term-document matrix in compressed-column (postings) layout.
+
+    For term id `t`, the documents containing it are
+    `doc_ids[indptr[t]:indptr[t + 1]]` with matching term frequencies in `tfs`.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        doc_len: np.ndarray,
+    ):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.doc_len)
+
+    @classmethod
+    def from_tokenized(
+        cls, tokenized_corpus: Sequence[List[str]]
+    ) -> "TermDocMatrix":
+        """Build the matrix from already tokenized documents."""
+        vocabulary: Dict[str, int] = {}
+        term_ids, doc_ids = [], []
+        doc_len = np.zeros(len(tokenized_corpus), dtype=np.float64)
+
+        for doc_id, tokens in enumerate(tokenized_corpus):
+            doc_len[doc_id] = len(tokens)
+            for token in tokens:
+                term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                doc_ids.append(doc_id)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+
+        # Collapse (term, doc) occurrences into postings sorted by term
+        n_docs = max(len(tokenized_corpus), 1)
+        pairs, tfs = np.unique(term_ids * n_docs + doc_ids, return_counts=True)
+        posting_terms = pairs // n_docs
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        counts = np.bincount(posting_terms, minlength=len(vocabulary))
+        np.cumsum(counts, out=indptr[1:])
+
+        return cls(
+            vocabulary=vocabulary,
+            indptr=indptr,
+            doc_ids=pairs % n_docs,
+            tfs=tfs.astype(np.float64),
+            doc_len=doc_len,
+        )
+
+    def document_frequencies(self) -> np.ndarray:
+        """Number of documents containing each term, indexed by term id."""
+        return np.diff(self.indptr)
+
+
+def okapi_idf(
+    document_frequencies: np.ndarray, n_docs: int, epsilon: float = 0.25
+) -> np.ndarray:
+    """
+    IDF exactly as rank_bm25.BM25Okapi computes it: log((N - df + 0.5) / (df + 0.5)),
+    with negative values floored to epsilon * mean(idf).
+    """
+    df = np.asarray(document_frequencies, dtype=np.float64)
+    idf = np.log(n_docs - df + 0.5) - np.log(df + 0.5)
+    if len(idf):
+        idf[idf < 0] = epsilon * idf.mean()
+    return idf
+
+
+class BM25Scorer:
+    """
+    Vectorized Okapi BM25 over a TermDocMatrix and a precomputed IDF vector.
+
+    Scores match rank_bm25.BM25Okapi for the same corpus and parameters, but
+    the index is built once and every query in a batch is scored with a few
+    array operations instead of a Python loop per document.
+    """
+
+    def __init__(
+        self,
+        matrix: TermDocMatrix,
+        idf: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+        avgdl: Optional[float] = None,
+    ):
+        self.matrix = matrix
+        self.idf = idf
+        self.k1 = k1
+        self.b = b
+        if avgdl is None:
+            avgdl = matrix.doc_len.mean() if matrix.n_docs else 0.0
+        self.avgdl = avgdl
+
+        # Per-posting term weight without the IDF factor, computed once
+        norm = k1 * (1 - b + b * matrix.doc_len / avgdl) if avgdl else k1 * (1 - b)
+        tfs = matrix.tfs
+        self._weights = tfs * (k1 + 1) / (tfs + np.take(norm, matrix.doc_ids))
+
+    @classmethod
+    def from_tokenized(
+        cls,
+        tokenized_corpus: Sequence[List[str]],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ) -> "BM25Scorer":
+        """Drop-in replacement for BM25Okapi(tokenized_corpus)."""
+        matrix = TermDocMatrix.from_tokenized(tokenized_corpus)
+        idf = okapi_idf(matrix.document_frequencies(), matrix.n_docs, epsilon)
+        return cls(matrix, idf, k1=k1, b=b)
+
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        """Score every document against one tokenized query."""
+        return self.get_batch_scores([query])[0]
+
+    def get_batch_scores(self, queries: Sequence[List[str]]) -> np.ndarray:
+        """
+        Score every document against several tokenized queries at once.
+
+        Returns:
+            Array of shape (len(queries), n_docs).
+        """
+        n_docs = self.matrix.n_docs
+        vocabulary = self.matrix.vocabulary
+
+        # Every (query, term) occurrence; repeated query terms count repeatedly
+        query_ids, term_ids = [], []
+        for query_id, query in enumerate(queries):
+            for token in query:
+                term_id = vocabulary.get(token)
+                if term_id is not None:
+                    query_ids.append(query_id)
+                    term_ids.append(term_id)
+
+        if not term_ids or not n_docs:
+            return np.zeros((len(queries), n_docs))
+
+        query_ids = np.asarray(query_ids, dtype=np.int64)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+
+        # Gather the postings of every term occurrence in one shot
+        starts = self.matrix.indptr[term_ids]
+        lengths = self.matrix.indptr[term_ids + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        postings = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+        rows = np.repeat(query_ids, lengths)
+        idf = np.repeat(self.idf[term_ids], lengths)
+        contributions = idf * self._weights[postings]
+        scores = np.bincount(
+            rows * n_docs + self.matrix.doc_ids[postings],
+            weights=contributions,
+            minlength=len(queries) * n_docs,
+        )
+        return scores.reshape(len(queries), n_docs)
+
+
+class IncrementalBM25Index:
+    """
+    BM25 corpus statistics that accumulate across queries.
+
+    Features:
+    - Document frequencies and lengths kept for every snippet seen in the process
+    - Add/remove single documents without rebuilding anything
+    - Candidates are scored against the accumulated IDF and average length
+    - Tokens of already-seen texts are reused instead of re-tokenized
+    - Optional SQLite persistence so statistics survive restarts
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_docs: int = 50_000,
+        db_path: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            max_docs: Oldest documents are evicted beyond this many
+            db_path: SQLite file for persistence (None keeps it in memory)
+            k1, b, epsilon: Okapi BM25 parameters
+        """
+        self.max_docs = max_docs
+        self.db_path = db_path
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+
+        self._docs: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._df: Counter = Counter()
+        self._total_len = 0
+        self._mean_idf: Optional[float] = None  # Invalidated on every change
+        self._lock = threading.RLock()
+
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS bm25_docs ("
+                "key TEXT PRIMARY KEY, tokens TEXT)"
+            )
+            rows = self._conn.execute("SELECT key, tokens FROM bm25_docs")
+            for key, tokens in rows:
+                self._add(key, json.loads(tokens))
+
+    @classmethod
+    def shared(cls) -> "IncrementalBM25Index":
+        """Return the process-wide index, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(db_path=os.getenv("BM25_INDEX_DB") or None)
+            return cls._shared
+
+    @property
+    def n_docs(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._docs
+
+    def add(self, key: str, tokens: List[str]):
+        """Add one document; re-adding a known key only refreshes its recency."""
+        with self._lock:
+            if key in self._docs:
+                self._docs.move_to_end(key)
+                return
+            self._add(key, tokens)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO bm25_docs VALUES (?, ?)",
+                    (key, json.dumps(tokens)),
+                )
+            while len(self._docs) > self.max_docs:
+                self.remove(next(iter(self._docs)))
+            if self._conn is not None:
+                self._conn.commit()
+
+    def _add(self, key: str, tokens: List[str]):
+        self._docs[key] = tokens
+        self._df.update(set(tokens))
+        self._total_len += len(tokens)
+        self._mean_idf = None
+
+    def remove(self, key: str):
+        """Remove one document and subtract it from the statistics."""
+        with self._lock:
+            tokens = self._docs.pop(key, None)
+            if tokens is None:
+                return
+            self._df.subtract(set(tokens))
+            for token in set(tokens):
+                if self._df[token] <= 0:
+                    del self._df[token]
+            self._total_len -= len(tokens)
+            self._mean_idf = None
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM bm25_docs WHERE key = ?", (key,))
+                self._conn.commit()
+
+    def add_texts(
+        self, texts: Sequence[str], tokenizer: Callable[[str], List[str]]
+    ) -> List[List[str]]:
+        """
+        Add texts keyed by their content and return their tokens.
+
+        Texts already in the index are not tokenized again.
+        """
+        tokenized = []
+        with self._lock:
+            for text in texts:
+                tokens = self._docs.get(text)
+                if tokens is None:
+                    tokens = tokenizer(text)
+                self.add(text, tokens)
+                tokenized.append(tokens)
+        return tokenized
+
+    def idf(self, terms: Sequence[str]) -> np.ndarray:
+        """Okapi IDF of the given terms under the accumulated statistics."""
+        with self._lock:
+            n_docs = self.n_docs
+            if self._mean_idf is None:
+                all_df = np.fromiter(self._df.values(), dtype=np.float64)
+                all_idf = np.log(n_docs - all_df + 0.5) - np.log(all_df + 0.5)
+                self._mean_idf = float(all_idf.mean()) if len(all_idf) else 0.0
+            mean_idf = self._mean_idf
+            df = np.array([self._df.get(term, 0) for term in terms], dtype=np.float64)
+
+        idf = np.log(n_docs - df + 0.5) - np.log(df + 0.5)
+        idf[idf < 0] = self.epsilon * mean_idf
+        return idf
+
+    def scorer(self, tokenized_candidates: Sequence[List[str]]) -> BM25Scorer:
+        """
+        Build a scorer over the candidates that uses the accumulated IDF and
+        average document length instead of the candidates' own statistics.
+        """
+        matrix = TermDocMatrix.from_tokenized(tokenized_candidates)
+        terms = sorted(matrix.vocabulary, key=matrix.vocabulary.get)
+        with self._lock:
+            avgdl = self._total_len / self.n_docs if self.n_docs else None
+            idf = self.idf(terms)
+        return BM25Scorer(matrix, idf, k1=self.k1, b=self.b, avgdl=avgdl)
+
+
+def min_max_normalize(scores: np.ndarray) -> np.ndarray:
+    """Scale scores to 0-1; a constant score vector maps to all zeros."""
+    scores = np.asarray(scores, dtype=np.float64)
+    if not len(scores):
+        return scores
+    score_range = scores.max() - scores.min()
+    if score_range <= 0:
+        return np.zeros_like(scores)
+    return (scores - scores.min()) / score_range
@@ -0,0 +1,221 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+import asyncio
+import time
+
+import psutil
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from core.render_profiles import RenderProfiles
+
+
+class PooledBrowser:
+    """A warm AsyncWebCrawler plus the bookkeeping used to recycle it."""
+
+    def __init__(self, crawler: AsyncWebCrawler):
+        self.crawler = crawler
+        self.started_at = time.monotonic()
+        self.pages = 0  # Pages served since launch
+        self.active = 0  # Pages currently in flight
+        self.retiring = False
+
+    def is_healthy(self) -> bool:
+        """The crawler is started and its browser process is still connected."""
+        if not self.crawler.ready:
+            return False
+        manager = getattr(self.crawler.crawler_strategy, "browser_manager", None)
+        browser = getattr(manager, "browser", None)
+        # Persistent contexts have no separate Browser object to probe
+        return browser is None or browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Long-lived pool of headless browsers shared by every scrape.
+
+    Features:
+    - Browsers are launched once in start() and reused by every page
+    - Up to `contexts_per_browser` pages in flight per browser, least-loaded first
+    - Browsers are recycled after `max_pages_per_browser` pages, or when the
+      process tree (Python plus browser processes) exceeds `memory_limit_mb`
+    - A background health check replaces disconnected browsers
+
+    The pool belongs to the event loop that called start().
+    """
+
+    def __init__(
+        self,
+        browser_config: Optional[BrowserConfig] = None,
+        num_browsers: int = 2,
+        contexts_per_browser: int = 5,
+        max_pages_per_browser: int = 200,
+        memory_limit_mb: Optional[float] = None,
+        health_check_interval: float = 30.0,
+        render_profiles: Optional[RenderProfiles] = None,
+    ):
+        """
+        Initialize the pool (no browser is launched until start()).
+
+        Args:
+            browser_config: Configuration shared by every browser
+            num_browsers: Number of browsers kept warm
+            contexts_per_browser: Concurrent pages allowed per browser
+            max_pages_per_browser: Pages served before a browser is recycled
+            memory_limit_mb: Process tree RSS that triggers recycling
+            health_check_interval: Seconds between health checks
+            render_profiles: Resource blocking applied to every browser
+        """
+        self.browser_config = browser_config or BrowserConfig()
+        self.num_browsers = num_browsers
+        self.contexts_per_browser = contexts_per_browser
+        self.max_pages_per_browser = max_pages_per_browser
+        self.memory_limit_mb = memory_limit_mb
+        self.health_check_interval = health_check_interval
+        self.render_profiles = render_profiles
+
+        self._browsers: List[PooledBrowser] = []
+        self._condition: Optional[asyncio.Condition] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self.started = False
+
+        self.launches = 0
+        self.recycled = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.num_browsers * self.contexts_per_browser
+
+    async def start(self) -> "BrowserPool":
+        """Launch the browsers and the health check."""
+        if self.started:
+            return self
+        self._condition = asyncio.Condition()
+        self._browsers = list(
+            await asyncio.gather(*(self._launch() for _ in range(self.num_browsers)))
+        )
+        self._health_task = asyncio.create_task(self._health_loop())
+        self.started = True
+        return self
+
+    async def close(self):
+        """Stop the health check and close every browser."""
+        if not self.started:
+            return
+        self.started = False
+        if self._health_task is not None:
+            self._health_task.cancel()
+        browsers, self._browsers = self._browsers, []
+        await asyncio.gather(
+            *(self._shutdown(browser) for browser in browsers), return_exceptions=True
+        )
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _launch(self) -> PooledBrowser:
+        crawler = AsyncWebCrawler(config=self.browser_config)
+        if self.render_profiles is not None:
+            self.render_profiles.attach(crawler)
+        await crawler.start()
+        self.launches += 1
+        return PooledBrowser(crawler)
+
+    @staticmethod
+    async def _shutdown(browser: PooledBrowser):
+        try:
+            await browser.crawler.close()
+        except Exception as e:
+            print(f"Error closing pooled browser: {e}")
+
+    @asynccontextmanager
+    async def acquire(self, pages: int = 1) -> AsyncIterator[AsyncWebCrawler]:
+        """
+        Borrow a warm crawler for one unit of work.
+
+        Args:
+            pages: Number of pages the caller will load (counts toward recycling)
+        """
+        if not self.started:
+            raise RuntimeError("BrowserPool.start() must be awaited first")
+
+        async with self._condition:
+            browser = None
+            while browser is None:
+                candidates = [
+                    b
+                    for b in self._browsers
+                    if not b.retiring and b.active < self.contexts_per_browser
+                ]
+                if candidates:
+                    browser = min(candidates, key=lambda b: b.active)
+                else:
+                    await self._condition.wait()
+            browser.active += 1
+            browser.pages += pages
+
+        try:
+            yield browser.crawler
+        finally:
+            browser.active -= 1
+            if browser.pages >= self.max_pages_per_browser or self._over_memory():
+                browser.retiring = True
+            if browser.retiring and browser.active == 0:
+                await self._replace(browser)
+            async with self._condition:
+                self._condition.notify_all()
+
+    def _over_memory(self) -> bool:
+        if self.memory_limit_mb is None:
+            return False
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss / (1024 * 1024) > self.memory_limit_mb
+
+    async def _replace(self, browser: PooledBrowser):
+        """Swap a retiring or broken browser for a fresh one."""
+        if browser not in self._browsers or not self.started:
+            return
+        self._browsers.remove(browser)
+        self.recycled += 1
+        await self._shutdown(browser)
+        try:
+            self._browsers.append(await self._launch())
+        except Exception as e:
+            print(f"Error launching replacement browser: {e}")
+        async with self._condition:
+            self._condition.notify_all()
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for browser in list(self._browsers):
+                if not browser.is_healthy():
+                    browser.retiring = True
+                    if browser.active == 0:
+                        await self._replace(browser)
+            # Make sure the pool never shrinks permanently after failed launches
+            while self.started and len(self._browsers) < self.num_browsers:
+                try:
+                    self._browsers.append(await self._launch())
+                except Exception as e:
+                    print(f"Error launching browser: {e}")
+                    break
+            async with self._condition:
+                self._condition.notify_all()
+
+    def stats(self):
+        return {
+            "browsers": len(self._browsers),
+            "active_pages": sum(b.active for b in self._browsers),
+            "pages_served": sum(b.pages for b in self._browsers),
+            "launches": self.launches,
+            "recycled": self.recycled,
+        }
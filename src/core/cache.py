@@ -0,0 +1,189 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SearchCache:
+    """
+    Two-tier TTL cache for Serper responses.
+
+    Features:
+    - In-memory LRU tier shared by every Search instance in the process
+    - Optional SQLite tier that survives restarts and is shared between workers
+    - Per query-class TTLs (short-lived `after:` news, `site:` and main queries)
+    - Hit/miss counters to measure how many Serper calls were saved
+    """
+
+    DEFAULT_TTLS = {
+        "news": 15 * 60,  # "site:... after:<date>" queries go stale quickly
+        "site": 6 * 60 * 60,  # Persona "site:" queries
+        "main": 60 * 60,  # The user's own query
+    }
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses kept in the memory tier
+            ttls: Overrides for DEFAULT_TTLS, keyed by query class
+            db_path: SQLite file for the on-disk tier (None disables it)
+        """
+        self.max_entries = max_entries
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.db_path = db_path
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS serper_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL, payload TEXT)"
+            )
+            self._conn.commit()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> "SearchCache":
+        """Return the process-wide cache, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    max_entries=int(os.getenv("SEARCH_CACHE_SIZE", "1024")),
+                    db_path=os.getenv("SEARCH_CACHE_DB") or None,
+                )
+            return cls._shared
+
+    @staticmethod
+    def classify(query: str) -> str:
+        """Return the TTL class of a query generated by QueryGenerator."""
+        if " after:" in query:
+            return "news"
+        if query.startswith("site:"):
+            return "site"
+        return "main"
+
+    @staticmethod
+    def make_key(
+        query: str, num_results: int, exclusions: Optional[Iterable[str]]
+    ) -> str:
+        # Results filtered for one persona's exclusions must not serve another's
+        excluded = sorted(set(exclusions)) if exclusions is not None else None
+        return json.dumps([query, num_results, excluded])
+
+    def get(
+        self,
+        query: str,
+        num_results: int,
+        exclusions: Optional[Iterable[str]],
+        allow_stale: bool = False,
+    ) -> Optional[List[Dict]]:
+        """
+        Return a fresh copy of the cached results, or None on a miss.
+
+        `exclusions` are the domains filtered out of the results, or None if
+        no filtering was applied.
+
+        With allow_stale=True, expired entries that have not been evicted yet
+        are returned too (used while Serper is unavailable).
+        """
+        key = self.make_key(query, num_results, exclusions)
+        now = 0.0 if allow_stale else time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count_hit("memory", allow_stale)
+                    return json.loads(payload)
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT expires_at, payload FROM serper_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    self._remember(key, row[0], row[1])
+                    self._count_hit("disk", allow_stale)
+                    return json.loads(row[1])
+
+            if not allow_stale:
+                self.misses += 1
+            return None
+
+    def _count_hit(self, tier: str, stale: bool):
+        if stale:
+            self.stale_hits += 1
+        elif tier == "memory":
+            self.memory_hits += 1
+        else:
+            self.disk_hits += 1
+
+    def set(
+        self,
+        query: str,
+        num_results: int,
+        exclusions: Optional[Iterable[str]],
+        results: List[Dict],
+    ):
+        """Store results under the TTL of the query's class."""
+        key = self.make_key(query, num_results, exclusions)
+        expires_at = time.time() + self.ttls[self.classify(query)]
+        payload = json.dumps(results)
+
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO serper_cache VALUES (?, ?, ?)",
+                    (key, expires_at, payload),
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, expires_at: float, payload: str):
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM serper_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the overall hit rate."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+        }
@@ -0,0 +1,298 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import codecs
+import os
+import re
+import threading
+
+import numpy as np
+
+from core.bm25 import BM25Scorer, TermDocMatrix, okapi_idf
+from core.page_buffer import PageHandle
+from core.tokenizer import Tokenizer
+
+
+class ContextBuilder:
+    """
+    Query-aware LLM context built from scraped pages.
+
+    Features:
+    - Page markdown is split into passages of about `passage_tokens` tokens at
+      headings and paragraph breaks; link targets, images and navigation
+      blocks are stripped
+    - Passages are scored against the query with BM25 (the shared Tokenizer
+      and core/bm25 scorer, with statistics over this query's passages);
+      passages bypass the tokenizer's memo, which only the query uses
+    - The best passages are packed into `token_budget`, at most
+      `max_passages_per_source` per page and no passage twice
+    - Selected passages are printed under their source URL, in page order,
+      so the model can cite them
+    - Pages are split one at a time (spilled ones read in slices) and only
+      the texts of top-scoring candidates are kept
+    """
+
+    # Rough tokens-per-character ratio of English text for GPT tokenizers
+    CHARS_PER_TOKEN = 4
+
+    HEADING_PATTERN = re.compile(r"^#{1,6}\s")
+    IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+    LINK_PATTERN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+    BARE_URL_PATTERN = re.compile(r"<?https?://\S+>?")
+    SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+    PARAGRAPH_PATTERN = re.compile(r"\n\s*\n")
+
+    # Spilled pages are decoded this many bytes at a time
+    READ_BYTES = 64 * 1024
+    # Passage texts read back per round, per passage that fits the budget
+    CANDIDATE_FACTOR = 4
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        token_budget: int = 4000,
+        passage_tokens: int = 150,
+        max_passages_per_source: int = 8,
+        min_passage_words: int = 8,
+        tokenizer: Optional[Tokenizer] = None,
+    ):
+        """
+        Args:
+            token_budget: Approximate tokens of page text in the context
+            passage_tokens: Target passage size
+            max_passages_per_source: Passages kept from any one page
+            min_passage_words: Shorter passages (menus, captions) are dropped
+            tokenizer: BM25 tokenizer (default: the process-wide one)
+        """
+        self.token_budget = token_budget
+        self.passage_tokens = passage_tokens
+        self.max_passages_per_source = max_passages_per_source
+        self.min_passage_words = min_passage_words
+        self.tokenizer = tokenizer or Tokenizer.shared()
+
+    @classmethod
+    def shared(cls) -> "ContextBuilder":
+        """Return the process-wide builder, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    token_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", "4000"))
+                )
+            return cls._shared
+
+    def estimate_tokens(self, text: str) -> int:
+        return len(text) // self.CHARS_PER_TOKEN + 1
+
+    def build(self, query: str, pages: Iterable[Dict[str, Any]]) -> str:
+        """
+        Format the passages of `pages` most relevant to `query`.
+
+        Args:
+            query: The user's question or search query
+            pages: Scrape results with metadata.url and content.markdown.raw
+                (a string or PageHandle), in search-rank order
+
+        Returns:
+            "Source: <url>\\nContent: <passages>" blocks separated by blank
+            lines, or "" if no page had usable text
+        """
+        return self.format(self.select(query, pages))
+
+    def select(
+        self, query: str, pages: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the chosen passages as dicts (url, text, page, position, score).
+
+        Pages are split one at a time and only their BM25 statistics are
+        kept; the texts of the best-scoring candidates are then re-read from
+        their pages, so memory does not grow with the size of the scrape.
+        """
+        pages = list(pages)
+        tokenized_query = self.tokenizer(query)
+        query_terms = set(tokenized_query)
+
+        # Pass 1: corpus statistics, and the query terms of every passage
+        located, matched, lengths, df = [], [], [], Counter()
+        for page_index, page in enumerate(pages):
+            markdown = page["content"]["markdown"]["raw"]
+            if not markdown:
+                continue
+            texts = self.split(markdown)
+            # Passages are seen once; memoizing them would evict queries and snippets
+            for position, tokens in enumerate(
+                self.tokenizer.tokenize_many(texts, memo=False)
+            ):
+                df.update(set(tokens))
+                located.append((page_index, position))
+                matched.append([token for token in tokens if token in query_terms])
+                lengths.append(len(tokens))
+            del texts
+        if not located:
+            return []
+
+        scores = self._score(tokenized_query, matched, lengths, df)
+        del matched, df
+        # Best score first; ties (e.g. no query term matched) keep page order
+        order = sorted(range(len(located)), key=lambda i: (-scores[i], located[i]))
+
+        # Pass 2: texts are read back for a few times more candidates than
+        # the budget holds; dedup and the per-source cap may need another round
+        size = (self.token_budget // self.passage_tokens + 1) * self.CANDIDATE_FACTOR
+        selected, seen, per_source = [], set(), {}
+        budget = self.token_budget
+        for round_start in range(0, len(order), size):
+            candidates = order[round_start : round_start + size]
+            texts = self._read_passages(pages, [located[i] for i in candidates])
+            for i, text in zip(candidates, texts):
+                page_index, position = located[i]
+                url = pages[page_index]["metadata"]["url"]
+                tokens = self.estimate_tokens(text)
+                key = " ".join(text.lower().split())
+                if (
+                    tokens > budget
+                    or key in seen
+                    or per_source.get(url, 0) >= self.max_passages_per_source
+                ):
+                    continue
+                selected.append(
+                    {
+                        "url": url,
+                        "text": text,
+                        "page": page_index,
+                        "position": position,
+                        "score": float(scores[i]),
+                    }
+                )
+                seen.add(key)
+                per_source[url] = per_source.get(url, 0) + 1
+                budget -= tokens
+                if budget < self.passage_tokens // 4:
+                    break
+            if budget < self.passage_tokens // 4:
+                break
+
+        selected.sort(key=lambda p: (p["page"], p["position"]))
+        return selected
+
+    def _read_passages(
+        self, pages: List[Dict[str, Any]], locations: List[Tuple[int, int]]
+    ) -> List[str]:
+        """Texts of the (page, position) passages, splitting each page once."""
+        wanted: Dict[int, Dict[int, int]] = {}
+        for n, (page_index, position) in enumerate(locations):
+            wanted.setdefault(page_index, {})[position] = n
+        texts = [""] * len(locations)
+        for page_index, positions in wanted.items():
+            markdown = pages[page_index]["content"]["markdown"]["raw"]
+            for position, text in enumerate(self.split(markdown)):
+                if position in positions:
+                    texts[positions[position]] = text
+        return texts
+
+    @staticmethod
+    def format(passages: List[Dict[str, Any]]) -> str:
+        """Group passages under their source URL, eliding gaps with '...'."""
+        blocks: List[str] = []
+        url, previous, parts = None, None, []
+        for passage in passages:
+            if passage["url"] != url:
+                if parts:
+                    blocks.append(f"Source: {url}\nContent: " + "".join(parts))
+                url, parts = passage["url"], [passage["text"]]
+            else:
+                gap = passage["position"] != previous + 1
+                parts.append(("\n...\n" if gap else "\n\n") + passage["text"])
+            previous = passage["position"]
+        if parts:
+            blocks.append(f"Source: {url}\nContent: " + "".join(parts))
+        return "\n\n".join(blocks)
+
+    def split(self, markdown: Union[str, PageHandle]) -> List[str]:
+        """Split page markdown into cleaned passages of about passage_tokens."""
+        max_chars = self.passage_tokens * self.CHARS_PER_TOKEN
+        passages, current = [], ""
+
+        def flush():
+            nonlocal current
+            if len(current.split()) >= self.min_passage_words:
+                passages.append(current)
+            current = ""
+
+        for block in self._blocks(markdown):
+            block = self._clean(block)
+            if not block:
+                continue
+            if self.HEADING_PATTERN.match(block):
+                # A heading opens a passage and stays with the text below it
+                flush()
+            for piece in self._pieces(block, max_chars):
+                if current and len(current) + len(piece) > max_chars:
+                    flush()
+                current = f"{current}\n\n{piece}" if current else piece
+        flush()
+        return passages
+
+    def _blocks(self, markdown: Union[str, PageHandle]) -> Iterator[str]:
+        """Paragraphs of the markdown; a PageHandle is decoded in slices."""
+        if not isinstance(markdown, PageHandle):
+            yield from self.PARAGRAPH_PATTERN.split(markdown)
+            return
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        tail = ""
+        for start in range(0, len(markdown), self.READ_BYTES):
+            with markdown.memoryview(start, start + self.READ_BYTES) as view:
+                blocks = self.PARAGRAPH_PATTERN.split(tail + decoder.decode(view))
+            # The last paragraph may continue in the next slice
+            tail = blocks.pop()
+            yield from blocks
+        yield tail + decoder.decode(b"", final=True)
+
+    def _clean(self, block: str) -> str:
+        """Strip images and link targets; drop blocks that are mostly links."""
+        block = self.IMAGE_PATTERN.sub("", block)
+        links = self.LINK_PATTERN.findall(block)
+        text = self.BARE_URL_PATTERN.sub("", self.LINK_PATTERN.sub(r"\1", block))
+        text = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+        if len(links) >= 3:
+            # Menus, tag clouds and "related articles" lists
+            link_chars = sum(len(link) for link in links)
+            if link_chars > 0.5 * len(text):
+                return ""
+        return text
+
+    def _pieces(self, block: str, max_chars: int) -> List[str]:
+        """Cut a block longer than max_chars at sentence boundaries."""
+        if len(block) <= max_chars:
+            return [block]
+        pieces, current = [], ""
+        for sentence in self.SENTENCE_PATTERN.split(block):
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                pieces.append(current)
+                current = ""
+            current = f"{current} {sentence}" if current else sentence
+        if current:
+            pieces.append(current)
+        return pieces
+
+    @staticmethod
+    def _score(
+        tokenized_query: List[str],
+        matched: List[List[str]],
+        lengths: List[int],
+        df: Counter,
+    ) -> np.ndarray:
+        """
+        BM25 scores of passages from their query terms, lengths and the
+        document frequencies of every term, equal to scoring the full texts.
+        """
+        if not tokenized_query:
+            return np.zeros(len(matched))
+        matrix = TermDocMatrix.from_tokenized(matched)
+        matrix.doc_len = np.asarray(lengths, dtype=np.float64)
+        # IDF over the whole vocabulary (its mean floors negative values)
+        all_idf = okapi_idf(np.fromiter(df.values(), dtype=np.float64), len(lengths))
+        idf_of = dict(zip(df, all_idf))
+        idf = np.array([idf_of[term] for term in matrix.vocabulary])
+        return BM25Scorer(matrix, idf).get_scores(tokenized_query)
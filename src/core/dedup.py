@@ -0,0 +1,169 @@
+from typing import Callable, Dict, Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import hashlib
+import re
+
+# Query parameters that only track the visit and never change the page
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "_gl",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "cmpid",
+    "ocid",
+    "spm",
+    "amp",
+    "outputtype",
+    "guccounter",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+
+AMP_CACHE_PATTERN = re.compile(r"^/[cvi]/(?:s/)?([^/]+)(/.*)?$")
+
+# Second-level labels of country-code suffixes like co.uk or com.au, which
+# are not registrable domains on their own
+SECOND_LEVEL_SUFFIXES = {"ac", "co", "com", "edu", "gov", "net", "or", "org"}
+
+
+def _is_registrable(host: str) -> bool:
+    """Rough check that a host is a domain someone can own, not a suffix."""
+    labels = host.split(".")
+    if len(labels) < 2:
+        return False
+    if len(labels) == 2 and labels[0] in SECOND_LEVEL_SUFFIXES:
+        return len(labels[1]) != 2
+    return True
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so that variants of the same page compare equal.
+
+    Lowercases scheme and host, drops 'www.', default ports, fragments,
+    tracking parameters, AMP variants (amp. subdomains, trailing /amp
+    segments and Google AMP cache URLs) and trailing slashes, and sorts the
+    remaining query parameters.
+    """
+    parsed = urlparse(url.strip())
+    scheme = (parsed.scheme or "https").lower()
+    if scheme == "http":
+        scheme = "https"
+    host = (parsed.hostname or "").lower()
+    path = parsed.path or "/"
+
+    # https://www-example-com.cdn.ampproject.org/c/s/www.example.com/page
+    if host.endswith(".cdn.ampproject.org"):
+        match = AMP_CACHE_PATTERN.match(path)
+        if match:
+            host, path = match.group(1).lower(), match.group(2) or "/"
+
+    if host.startswith("www."):
+        host = host[4:]
+    # amp.example.com is an AMP mirror, but amp.dev is a site of its own
+    if host.startswith("amp.") and _is_registrable(host[4:]):
+        host = host[4:]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = re.sub(r"/+", "/", path)
+    path = re.sub(r"(?:/amp|\.amp)(?:\.html)?/?$", "", path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def simhash(tokens: Iterable[str], bits: int = 64) -> int:
+    """
+    Charikar SimHash of a token sequence over unigrams and bigrams.
+
+    Near-identical texts produce fingerprints a few bits apart.
+    """
+    tokens = list(tokens)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    weights = [0] * bits
+    for feature in features:
+        value = _feature_hash(feature)
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class Deduplicator:
+    """
+    Stateful duplicate detector for search results arriving over time.
+
+    A result is a duplicate if its canonical URL was already seen, or its
+    title + snippet SimHash is within `max_distance` bits of an earlier one.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Callable[[str], List[str]],
+        max_distance: int = 3,
+        min_tokens: int = 4,
+    ):
+        """
+        Args:
+            tokenizer: Turns title + snippet into tokens for fingerprinting
+            max_distance: Max SimHash Hamming distance for near-duplicates
+            min_tokens: Texts shorter than this are only deduplicated by URL
+        """
+        self.tokenizer = tokenizer
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.seen_urls = set()
+        self.fingerprints: List[int] = []
+        self.duplicates = 0
+
+    def is_duplicate(self, result: Dict) -> bool:
+        """Check a result and remember it if it is new."""
+        url_key = canonicalize_url(result.get("link", ""))
+        if url_key in self.seen_urls:
+            self.duplicates += 1
+            return True
+
+        text = f"{result.get('title', '')} {result.get('snippet', '')}"
+        tokens = self.tokenizer(text)
+        if len(tokens) >= self.min_tokens:
+            fingerprint = simhash(tokens)
+            if any(
+                hamming_distance(fingerprint, other) <= self.max_distance
+                for other in self.fingerprints
+            ):
+                self.duplicates += 1
+                return True
+            self.fingerprints.append(fingerprint)
+
+        self.seen_urls.add(url_key)
+        return False
+
+    def filter(self, results: Iterable[Dict]) -> List[Dict]:
+        """Return the results that are not duplicates, in order."""
+        return [result for result in results if not self.is_duplicate(result)]
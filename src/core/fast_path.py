@@ -0,0 +1,230 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import os
+import re
+import threading
+import time
+import weakref
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy
+
+from core.html_processing import HTMLProcessPool
+
+
+class HTTPFastPath:
+    """
+    Browserless first tier for server-rendered pages.
+
+    Features:
+    - Plain HTTP GET over a pooled keep-alive connection (Crawl4AI's
+      AsyncHTTPCrawlerStrategy), one crawler per event loop
+    - Same HTML-to-markdown pipeline as a browser render
+    - Heuristics that reject blocked responses, JS-only shells and pages
+      with too little text, so the caller can fall back to the browser
+    - Per-domain "needs browser" verdicts: a domain where the browser
+      recovered a page the plain GET could not is skipped for `verdict_ttl`
+    """
+
+    BLOCKED_STATUS_CODES = {401, 403, 406, 429, 451, 503}
+    # Anti-bot interstitials and JS-only app shells
+    BLOCK_PAGE_PATTERN = re.compile(
+        r"cf-browser-verification|challenge-platform|captcha|just a moment\.\.\."
+        r"|access denied|enable javascript and cookies",
+        re.IGNORECASE,
+    )
+    JS_SHELL_PATTERN = re.compile(
+        r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt)[\"'][^>]*>\s*</div>"
+        r"|you need to enable javascript|please enable javascript",
+        re.IGNORECASE,
+    )
+    # A page needs at least this many blocks' worth of text to be accepted
+    MIN_TEXT_BLOCKS = 5
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        verdict_ttl: float = 24 * 60 * 60,
+        max_verdicts: int = 10_000,
+    ):
+        """
+        Args:
+            timeout: Seconds before a plain GET gives up and the browser takes over
+            verdict_ttl: Seconds a domain keeps going straight to the browser
+            max_verdicts: Domains remembered before the oldest are forgotten
+        """
+        self.timeout = timeout
+        self.verdict_ttl = verdict_ttl
+        self.max_verdicts = max_verdicts
+
+        self._verdicts: "OrderedDict[str, float]" = OrderedDict()
+        self._rejected: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._crawlers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+        self.fetched = 0
+        self.rejected = 0
+        self.skipped = 0  # URLs sent straight to the browser by a verdict
+        self.reasons: Dict[str, int] = {}
+
+    @classmethod
+    def shared(cls) -> "HTTPFastPath":
+        """Return the process-wide fast path, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    verdict_ttl=float(os.getenv("BROWSER_VERDICT_TTL", "86400"))
+                )
+            return cls._shared
+
+    @staticmethod
+    def domain(url: str) -> str:
+        host = (urlparse(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def needs_browser(self, url: str) -> bool:
+        """Whether the URL's domain is known to need a browser render."""
+        domain = self.domain(url)
+        with self._lock:
+            expires_at = self._verdicts.get(domain)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._verdicts[domain]
+                return False
+            self.skipped += 1
+            return True
+
+    async def _get_crawler(self) -> AsyncWebCrawler:
+        """Return the started HTTP-only crawler bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            starting = self._crawlers.get(loop)
+            if starting is None:
+                crawler = AsyncWebCrawler(
+                    crawler_strategy=AsyncHTTPCrawlerStrategy(),
+                    config=BrowserConfig(verbose=False),
+                )
+                starting = loop.create_task(self._start(crawler))
+                self._crawlers[loop] = starting
+        return await asyncio.shield(starting)
+
+    @staticmethod
+    async def _start(crawler: AsyncWebCrawler) -> AsyncWebCrawler:
+        await crawler.start()
+        return crawler
+
+    async def close(self):
+        """Close the crawler of the running event loop (reopened on next use)."""
+        with self._lock:
+            starting = self._crawlers.pop(asyncio.get_running_loop(), None)
+        if starting is not None:
+            await (await starting).close()
+
+    async def fetch(
+        self,
+        url: str,
+        run_config: CrawlerRunConfig,
+        word_count_threshold: int,
+        html_pool: Optional[HTMLProcessPool] = None,
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Fetch and convert a page without a browser.
+
+        Args:
+            url: Page to fetch
+            run_config: Run configuration for the conversion
+            word_count_threshold: Words per block (see check())
+            html_pool: Convert the page in worker processes instead of on the
+                event loop
+
+        Returns:
+            (crawl result, None) if the page is usable, or (result or None,
+            reason) if the caller should render it in a browser instead
+        """
+        self.fetched += 1
+        try:
+            crawler = await self._get_crawler()
+            if html_pool is None:
+                result = await asyncio.wait_for(
+                    crawler.arun(url=url, config=run_config), self.timeout
+                )
+            else:
+                response = await asyncio.wait_for(
+                    crawler.crawler_strategy.crawl(url, config=run_config),
+                    self.timeout,
+                )
+                result = await html_pool.process(url, response, run_config)
+        except Exception as e:
+            print(f"Error fetching {url} over HTTP: {e}")
+            return None, self._reject(url, "error", 0)
+
+        reason = self.check(result, word_count_threshold)
+        if reason is not None:
+            return result, self._reject(url, reason, self._word_count(result))
+        return result, None
+
+    def check(self, result, word_count_threshold: int) -> Optional[str]:
+        """Return why a plain-HTTP result is not good enough, or None."""
+        if result.status_code in self.BLOCKED_STATUS_CODES:
+            return "blocked"
+        if not result.success:
+            return "error"
+        if self._word_count(result) >= word_count_threshold * self.MIN_TEXT_BLOCKS:
+            return None
+        # Server-rendered pages often carry the same phrases in <noscript>, so
+        # the patterns only explain why a page came back without enough text
+        html = result.html or ""
+        if self.BLOCK_PAGE_PATTERN.search(html):
+            return "blocked"
+        if self.JS_SHELL_PATTERN.search(html):
+            return "js_shell"
+        return "thin"
+
+    @staticmethod
+    def _word_count(result) -> int:
+        markdown = getattr(result, "markdown", None)
+        return len(markdown.raw_markdown.split()) if markdown else 0
+
+    def _reject(self, url: str, reason: str, words: int) -> str:
+        with self._lock:
+            self.rejected += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+            self._rejected[url] = words
+            while len(self._rejected) > self.max_verdicts:
+                self._rejected.popitem(last=False)
+        return reason
+
+    def record_browser_result(self, url: str, formatted: Dict[str, Any]):
+        """
+        Compare a browser render with the rejected plain-HTTP attempt.
+
+        If the browser got a successful page with at least twice the text,
+        the domain goes straight to the browser from now on.
+        """
+        with self._lock:
+            http_words = self._rejected.pop(url, None)
+        if http_words is None or not formatted["metadata"]["success"]:
+            return
+        words = len((formatted["content"]["markdown"]["raw"] or "").split())
+        if words > http_words and words >= 2 * http_words:
+            with self._lock:
+                self._verdicts[self.domain(url)] = time.time() + self.verdict_ttl
+                self._verdicts.move_to_end(self.domain(url))
+                while len(self._verdicts) > self.max_verdicts:
+                    self._verdicts.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fetched": self.fetched,
+            "accepted": self.fetched - self.rejected,
+            "rejected": self.rejected,
+            "reasons": dict(self.reasons),
+            "skipped": self.skipped,
+            "browser_domains": len(self._verdicts),
+        }
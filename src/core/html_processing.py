@@ -0,0 +1,173 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+import asyncio
+import multiprocessing
+import os
+import threading
+import weakref
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai.models import AsyncCrawlResponse, CrawlResult
+from crawl4ai.utils import sanitize_input_encode
+
+
+class HTMLProcessPool:
+    """
+    Crawl4AI's HTML post-processing in worker processes.
+
+    Features:
+    - Cleaning, link/media extraction and markdown / fit-markdown generation
+      (Crawl4AI's own aprocess_html) run in a ProcessPoolExecutor, so large
+      pages use other cores instead of stalling the event loop
+    - Bounded: at most `max_pending` pages per event loop are queued or being
+      processed; further pages wait (and so hold back new fetches)
+    - Workers are spawned lazily and reused; each keeps one idle crawler and
+      event loop for processing
+    - Only the processed fields are sent back; the raw HTML stays in the parent
+
+    Workers are spawned, not forked, so scripts that enable this need an
+    `if __name__ == "__main__":` guard.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self, workers: Optional[int] = None, max_pending: Optional[int] = None
+    ):
+        """
+        Args:
+            workers: Worker processes (default: one per CPU, leaving one free)
+            max_pending: Pages queued or in progress per event loop
+                (default: twice the workers)
+        """
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending or 2 * self.workers
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+        self.processed = 0
+        self.failed = 0
+        self.waited = 0  # Pages that found the queue full
+
+    @classmethod
+    def shared(cls) -> "HTMLProcessPool":
+        """Return the process-wide pool, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                workers = os.getenv("HTML_WORKERS")
+                cls._shared = cls(workers=int(workers) if workers else None)
+            return cls._shared
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a process that runs browsers and threads can deadlock
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Return the queue bound of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = asyncio.Semaphore(self.max_pending)
+                self._slots[loop] = slots
+            return slots
+
+    async def process(
+        self, url: str, response: AsyncCrawlResponse, run_config: CrawlerRunConfig
+    ) -> CrawlResult:
+        """
+        Turn a raw fetch into a CrawlResult like AsyncWebCrawler.arun() would.
+
+        Args:
+            url: Requested URL
+            response: Raw response from a crawler strategy's crawl()
+            run_config: Run configuration used for the fetch
+        """
+        slots = self._get_slots()
+        if slots.locked():
+            self.waited += 1
+        try:
+            async with slots:
+                fields = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(),
+                    _process_html,
+                    url,
+                    response.html,
+                    run_config,
+                    response.redirected_url,
+                )
+            result = CrawlResult(**fields, html=response.html)
+        except Exception as e:
+            self.failed += 1
+            print(f"Error processing {url}: {e}")
+            result = CrawlResult(
+                url=url, html=response.html, success=False, error_message=str(e)
+            )
+        else:
+            self.processed += 1
+            result.success = bool(response.html) or bool(response.downloaded_files)
+
+        result.status_code = response.status_code
+        result.redirected_url = response.redirected_url or url
+        result.redirected_status_code = response.redirected_status_code
+        result.response_headers = response.response_headers
+        result.downloaded_files = response.downloaded_files
+        result.ssl_certificate = response.ssl_certificate
+        return result
+
+    def close(self):
+        """Stop the workers (they are spawned again on next use)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "waited": self.waited,
+        }
+
+
+# Per worker process: an idle crawler (never started, so no browser) whose
+# aprocess_html does the work, and the loop it runs on
+_worker_crawler: Optional[AsyncWebCrawler] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _process_html(
+    url: str, html: str, run_config: CrawlerRunConfig, redirected_url: Optional[str]
+) -> Dict[str, Any]:
+    global _worker_crawler, _worker_loop
+    if _worker_crawler is None:
+        _worker_crawler = AsyncWebCrawler(config=BrowserConfig(verbose=False))
+        _worker_loop = asyncio.new_event_loop()
+
+    result = _worker_loop.run_until_complete(
+        _worker_crawler.aprocess_html(
+            url=url,
+            html=sanitize_input_encode(html),
+            extracted_content=None,
+            config=run_config,
+            screenshot_data=None,
+            pdf_data=None,
+            verbose=False,
+            is_raw_html=url.startswith("raw:"),
+            redirected_url=redirected_url,
+            original_scheme=urlparse(url).scheme,
+        )
+    )
+    # The parent already has the raw HTML; fit_html is not used downstream
+    return result.model_dump(exclude={"html", "fit_html"})
@@ -1,7 +1,13 @@
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
 import os
 import json
+import threading
+import weakref
 
 
 class LLM:
@@ -34,13 +40,16 @@ class LLM:
                 "API key must be provided either as an argument or through environment variables."
             )
         self.conversation_history = []
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = self._create_client()
         self.model = model
         self.enable_tools = enable_tools
         self.tools = [self.WEB_SEARCH_TOOL] if enable_tools else []
         self.system_prompt = system_prompt
         self.add_message("system", self.system_prompt)
 
+    def _create_client(self):
+        return OpenAI(api_key=self.api_key)
+
     def add_message(self, role, content, name=None):
         """Add a message to the conversation history."""
         message = {"role": role, "content": content}
@@ -48,21 +57,26 @@ class LLM:
             message["name"] = name
         self.conversation_history.append(message)
 
-    def run_with_streaming(self, message=None, tool_choice="auto"):
-        """Stream a response from the LLM"""
+    def _request(self, message=None, tool_choice="auto", stream=False):
+        """Add the user message, if any, and build the completion arguments."""
         if message:
             self.add_message("user", message)
 
         kwargs = {
             "model": self.model,
             "messages": self.conversation_history,
-            "stream": True,
         }
+        if stream:
+            kwargs["stream"] = True
 
         if self.enable_tools:
             kwargs["tools"] = self.tools
             kwargs["tool_choice"] = tool_choice
+        return kwargs
 
+    def run_with_streaming(self, message=None, tool_choice="auto"):
+        """Stream a response from the LLM"""
+        kwargs = self._request(message, tool_choice, stream=True)
         try:
             stream = self.client.chat.completions.create(**kwargs)
             return stream  # returns generator
@@ -73,18 +87,7 @@ class LLM:
     def run_without_streaming(self, message=None, tool_choice="auto"):
         """Get a response from the LLM with optional tool usage.
         Returns the raw assistant message without modifying history."""
-        if message:
-            self.add_message("user", message)
-
-        kwargs = {
-            "model": self.model,
-            "messages": self.conversation_history,
-        }
-
-        if self.enable_tools:
-            kwargs["tools"] = self.tools
-            kwargs["tool_choice"] = tool_choice
-
+        kwargs = self._request(message, tool_choice)
         try:
             response = self.client.chat.completions.create(**kwargs)
             assistant_message = response.choices[0].message
@@ -108,6 +111,162 @@ class LLM:
         self.add_message("system", self.system_prompt)
 
 
+class AsyncLLM(LLM):
+    """
+    LLM on the async OpenAI client, for use from event loops.
+
+    Features:
+    - Completions are awaited, so scraping and rendering keep running on the
+      loop while the model answers
+    - One AsyncOpenAI client (and its keep-alive connection pool) per event
+      loop and API key, shared by every AsyncLLM in the process
+    - All tool calls of a response run concurrently and are answered with
+      `tool` messages, so a multi-part question needs one round of searches
+    """
+
+    _clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    _clients_lock = threading.Lock()
+
+    def _create_client(self):
+        # Clients are bound to an event loop; see _get_client()
+        return None
+
+    def _get_client(self) -> AsyncOpenAI:
+        """Return the shared client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(self.api_key)
+            if client is None or client.is_closed():
+                client = AsyncOpenAI(api_key=self.api_key)
+                clients[self.api_key] = client
+            return client
+
+    async def run_with_streaming(self, message=None, tool_choice="auto"):
+        """Stream a response from the LLM (an async iterator of chunks)."""
+        kwargs = self._request(message, tool_choice, stream=True)
+        try:
+            return await self._get_client().chat.completions.create(**kwargs)
+        except Exception as e:
+            print(f"Streaming error: {e}")
+            raise
+
+    async def run_without_streaming(self, message=None, tool_choice="auto"):
+        """Get the assistant message without modifying history."""
+        kwargs = self._request(message, tool_choice)
+        try:
+            response = await self._get_client().chat.completions.create(**kwargs)
+            return response.choices[0].message
+        except Exception as e:
+            print(f"Error during API call: {e}")
+            raise
+
+    async def run(self, message=None, stream=False, tool_choice="auto"):
+        """Get a response from the LLM with optional tool usage.
+        Returns the raw assistant message (or stream) without modifying history."""
+        if stream:
+            return await self.run_with_streaming(message, tool_choice)
+        return await self.run_without_streaming(message, tool_choice)
+
+    @staticmethod
+    async def collect_stream(
+        stream, on_content: Optional[Callable[[str], Any]] = None
+    ) -> ChatCompletionMessage:
+        """
+        Assemble a streamed response into an assistant message.
+
+        Args:
+            stream: Stream returned by run(stream=True)
+            on_content: Called with the text so far whenever more arrives
+
+        Returns:
+            The message, with tool calls merged from their streamed fragments
+        """
+        content = ""
+        calls: Dict[int, Dict[str, str]] = {}
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            for fragment in delta.tool_calls or []:
+                call = calls.setdefault(
+                    fragment.index, {"id": "", "name": "", "arguments": ""}
+                )
+                call["id"] = fragment.id or call["id"]
+                if fragment.function:
+                    call["name"] = fragment.function.name or call["name"]
+                    call["arguments"] += fragment.function.arguments or ""
+            if delta.content:
+                content += delta.content
+                if on_content:
+                    on_content(content)
+
+        tool_calls = [
+            ChatCompletionMessageToolCall(
+                id=call["id"],
+                type="function",
+                function=Function(name=call["name"], arguments=call["arguments"]),
+            )
+            for _, call in sorted(calls.items())
+        ]
+        return ChatCompletionMessage(
+            role="assistant", content=content or None, tool_calls=tool_calls or None
+        )
+
+    def add_assistant_message(self, message: ChatCompletionMessage):
+        """Add an assistant message, including the tool calls it made."""
+        entry: Dict[str, Any] = {"role": "assistant", "content": message.content}
+        if message.tool_calls:
+            entry["tool_calls"] = [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {
+                        "name": call.function.name,
+                        "arguments": call.function.arguments,
+                    },
+                }
+                for call in message.tool_calls
+            ]
+        self.conversation_history.append(entry)
+
+    async def run_tool_calls(
+        self,
+        message: ChatCompletionMessage,
+        execute: Callable[[ChatCompletionMessageToolCall], Awaitable[str]],
+    ) -> List[str]:
+        """
+        Run every tool call of `message` concurrently and record the results.
+
+        The assistant message and one `tool` message per call are added to
+        the history, in call order; a call that raised is answered with its
+        error so the model can still use the others.
+
+        Args:
+            message: Assistant message with tool_calls
+            execute: Coroutine function returning a call's result text
+
+        Returns:
+            The result text of each call
+        """
+        self.add_assistant_message(message)
+        outcomes = await asyncio.gather(
+            *(execute(call) for call in message.tool_calls), return_exceptions=True
+        )
+        results = []
+        for call, outcome in zip(message.tool_calls, outcomes):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome  # Cancellation, KeyboardInterrupt
+                print(f"Tool call {call.function.name} failed: {outcome}")
+                outcome = f"Error running {call.function.name}: {outcome}"
+            results.append(outcome)
+            self.conversation_history.append(
+                {"role": "tool", "tool_call_id": call.id, "content": outcome}
+            )
+        return results
+
+
 if __name__ == "__main__":
     from query_generator import Persona
 
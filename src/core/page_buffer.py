@@ -0,0 +1,161 @@
+from typing import Any, Dict, List, Optional, Union
+import mmap
+import tempfile
+import threading
+
+
+class PageHandle:
+    """
+    Reference to a page body spilled into a PageBuffer.
+
+    Truthy when the body is non-empty, like the string it replaces; str()
+    or read() decodes it, memoryview() exposes the bytes without copying.
+    """
+
+    __slots__ = ("buffer", "offset", "length")
+
+    def __init__(self, buffer: "PageBuffer", offset: int, length: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length  # UTF-8 bytes
+
+    def __len__(self) -> int:
+        return self.length
+
+    def memoryview(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """Zero-copy view of bytes [start, end) of the body."""
+        end = self.length if end is None else min(end, self.length)
+        return self.buffer.view(self.offset + start, max(0, end - start))
+
+    def read(self, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        Decode bytes [start, end) of the body.
+
+        Offsets are in bytes; a character cut by them is dropped.
+        """
+        view = self.memoryview(start, end)
+        try:
+            return str(view, "utf-8", errors="ignore")
+        finally:
+            view.release()
+
+    def __str__(self) -> str:
+        return self.read()
+
+    def __repr__(self) -> str:
+        return f"PageHandle(offset={self.offset}, length={self.length})"
+
+
+class PageBuffer:
+    """
+    Per-request spill file for large page bodies.
+
+    Features:
+    - Strings over `threshold` bytes are UTF-8 encoded into an anonymous
+      temporary file and replaced by PageHandles (offset + length)
+    - Bodies are read back through a memory map, so consumers can slice
+      them without copying, and untouched pages stay out of RSS
+    - Append-only; close() (or leaving the `with` block) deletes the file,
+      after which handles must not be used
+    """
+
+    # Leaves of a formatted result that can be spilled
+    SPILL_FIELDS = (
+        ("content", "markdown", "raw"),
+        ("content", "markdown", "fitted"),
+        ("content", "html", "raw"),
+        ("content", "html", "cleaned"),
+        ("content", "text"),
+    )
+
+    def __init__(self, threshold: int = 16 * 1024, dir: Optional[str] = None):
+        """
+        Args:
+            threshold: Bodies up to this many bytes stay in memory as strings
+            dir: Directory for the spill file (default: the system temp dir)
+        """
+        self.threshold = threshold
+        self._file = tempfile.TemporaryFile(dir=dir)
+        self._size = 0
+        self._map: Optional[mmap.mmap] = None
+        # Earlier, smaller maps; still referenced by views handed out
+        self._old_maps: List[mmap.mmap] = []
+        self._lock = threading.Lock()
+
+        self.spilled = 0
+
+    def __enter__(self) -> "PageBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Bytes written to the spill file."""
+        return self._size
+
+    def spill(self, text: Optional[str]) -> Union[str, PageHandle, None]:
+        """Return a handle for a large string, or the string itself."""
+        # Each character is at least one byte, so short strings skip encoding
+        if not isinstance(text, str) or len(text) <= self.threshold // 4:
+            return text
+        data = text.encode("utf-8")
+        if len(data) <= self.threshold:
+            return text
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(data)
+            self._size += len(data)
+            self.spilled += 1
+        return PageHandle(self, offset, len(data))
+
+    def spill_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy of a formatted result with large bodies replaced by handles.
+
+        The input is not modified (it may be shared with other callers).
+        """
+        result = dict(result)
+        for path in self.SPILL_FIELDS:
+            parent, copied = result, result
+            for key in path[:-1]:
+                child = parent.get(key)
+                if not isinstance(child, dict):
+                    break
+                copied[key] = dict(child)
+                parent = copied = copied[key]
+            else:
+                if path[-1] in copied:
+                    copied[path[-1]] = self.spill(copied[path[-1]])
+        return result
+
+    def view(self, offset: int, length: int) -> memoryview:
+        """Zero-copy view of `length` bytes of the spill file at `offset`."""
+        with self._lock:
+            if self._map is None or offset + length > len(self._map):
+                self._file.flush()
+                if self._map is not None:
+                    self._old_maps.append(self._map)
+                if self._size == 0:
+                    return memoryview(b"")
+                self._map = mmap.mmap(
+                    self._file.fileno(), self._size, access=mmap.ACCESS_READ
+                )
+            return memoryview(self._map)[offset : offset + length]
+
+    def close(self):
+        """Delete the spill file."""
+        with self._lock:
+            for old in self._old_maps + ([self._map] if self._map else []):
+                try:
+                    old.close()
+                except BufferError:
+                    pass  # A view is still alive; the map goes with it
+            self._map = None
+            self._old_maps = []
+            self._file.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {"spilled": self.spilled, "bytes": self._size}
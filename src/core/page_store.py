@@ -0,0 +1,283 @@
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from core.dedup import canonicalize_url
+
+
+class PageStore:
+    """
+    Content-addressed store for scraped pages.
+
+    Features:
+    - Keyed by canonical URL (plus a run-config variant), so URL variants of a
+      page share one entry
+    - Markdown bodies are zlib-compressed and stored once per content digest
+    - Per-domain TTLs (matched on the host and its parent domains)
+    - Size-bounded: least recently used pages are evicted past `max_bytes`
+    - ETag / Last-Modified kept with each page for conditional revalidation
+    - SQLite file (db_path) can be shared between worker processes; the
+      default ":memory:" database is private to the process
+    """
+
+    # Parts of a scrape result that are kept; get() returns only these
+    STORED_FIELDS = ("content.markdown", "metadata")
+
+    DEFAULT_TTL = 6 * 60 * 60
+    DEFAULT_DOMAIN_TTLS = {
+        # Reference pages rarely change
+        "wikipedia.org": 7 * 24 * 60 * 60,
+        "investopedia.com": 7 * 24 * 60 * 60,
+        # News and market pages change through the day
+        "reuters.com": 30 * 60,
+        "bloomberg.com": 30 * 60,
+        "cnbc.com": 30 * 60,
+        "marketwatch.com": 30 * 60,
+        "finance.yahoo.com": 15 * 60,
+    }
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = DEFAULT_TTL,
+        domain_ttls: Optional[Dict[str, float]] = None,
+        db_path: str = ":memory:",
+        compression_level: int = 6,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_bytes: Compressed bytes kept before LRU eviction
+            default_ttl: Seconds a page stays fresh unless its domain overrides it
+            domain_ttls: Overrides for DEFAULT_DOMAIN_TTLS, keyed by domain
+            db_path: SQLite file shared between processes (":memory:" keeps the
+                store private to this process)
+            compression_level: zlib level for page bodies
+        """
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.domain_ttls = {**self.DEFAULT_DOMAIN_TTLS, **(domain_ttls or {})}
+        self.db_path = db_path
+        self.compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, digest TEXT, etag TEXT, last_modified TEXT, "
+            "expires_at REAL, accessed_at REAL, metadata TEXT);"
+            "CREATE INDEX IF NOT EXISTS pages_lru ON pages (accessed_at);"
+            "CREATE TABLE IF NOT EXISTS bodies ("
+            "digest TEXT PRIMARY KEY, data BLOB, size INTEGER);"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls) -> "PageStore":
+        """Return the process-wide store, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                max_mb = float(os.getenv("PAGE_STORE_MAX_MB", "256"))
+                cls._shared = cls(
+                    max_bytes=int(max_mb * 1024 * 1024),
+                    db_path=os.getenv("PAGE_STORE_DB") or ":memory:",
+                )
+            return cls._shared
+
+    @staticmethod
+    def make_key(url: str, variant: str = "") -> str:
+        key = canonicalize_url(url)
+        return f"{key}#{variant}" if variant else key
+
+    @classmethod
+    def covers(cls, fields: Optional[Iterable[str]]) -> bool:
+        """Whether stored pages hold every one of `fields` (None means all)."""
+        if fields is None:
+            return False
+        for field in fields:
+            if not any(
+                field == kept or field.startswith(kept + ".")
+                for kept in cls.STORED_FIELDS
+            ):
+                return False
+        return True
+
+    def ttl_for(self, url: str) -> float:
+        """TTL of the most specific configured domain the URL's host belongs to."""
+        host = (urlparse(url).hostname or "").lower()
+        labels = host.split(".")
+        for i in range(len(labels) - 1):
+            ttl = self.domain_ttls.get(".".join(labels[i:]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    def get(
+        self, url: str, variant: str = "", allow_stale: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored page, or None on a miss.
+
+        Returns {"result": ..., "etag": ..., "last_modified": ..., "fresh": bool},
+        where result has the scraper's result shape with only the markdown and
+        metadata filled in. Stale pages are only returned with allow_stale=True.
+        """
+        key = self.make_key(url, variant)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT p.etag, p.last_modified, p.expires_at, p.metadata, b.data "
+                "FROM pages p JOIN bodies b ON b.digest = p.digest WHERE p.key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            etag, last_modified, expires_at, metadata, data = row
+            fresh = expires_at > now
+            if not fresh and not allow_stale:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+
+        markdown = json.loads(zlib.decompress(data))
+        return {
+            "result": {
+                "content": {
+                    "markdown": markdown,
+                    "html": {"raw": None, "cleaned": None},
+                    "text": None,
+                },
+                "metadata": {**json.loads(metadata), "url": url, "from_store": True},
+                "resources": {"media": {}, "links": {}},
+            },
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": fresh,
+        }
+
+    def put(
+        self,
+        url: str,
+        result: Dict[str, Any],
+        variant: str = "",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Store a formatted scrape result under the TTL of its domain."""
+        markdown = json.dumps(result["content"]["markdown"]).encode("utf-8")
+        digest = hashlib.sha256(markdown).hexdigest()
+        metadata = json.dumps(
+            {k: v for k, v in result["metadata"].items() if k != "from_store"},
+            default=str,
+        )
+        now = time.time()
+        key = self.make_key(url, variant)
+
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT 1 FROM bodies WHERE digest = ?", (digest,)
+            ).fetchone()
+            if known is None:
+                data = zlib.compress(markdown, self.compression_level)
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO bodies VALUES (?, ?, ?)",
+                    (digest, data, len(data)),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    digest,
+                    etag,
+                    last_modified,
+                    now + self.ttl_for(url),
+                    now,
+                    metadata,
+                ),
+            )
+            self.stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, variant: str = ""):
+        """Mark a stale page fresh again after the origin reported no change."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + self.ttl_for(url), now, self.make_key(url, variant)),
+            )
+            self._conn.commit()
+            self.refreshes += 1
+
+    def _evict(self):
+        """Drop least recently used pages (and orphaned bodies) past max_bytes."""
+        self._conn.execute(
+            "DELETE FROM bodies WHERE digest NOT IN (SELECT digest FROM pages)"
+        )
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies")
+        total = total.fetchone()[0]
+        while total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key FROM pages ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM pages WHERE key = ?", row)
+            self.evictions += 1
+            freed = self._conn.execute(
+                "DELETE FROM bodies WHERE digest NOT IN (SELECT digest FROM pages) "
+                "RETURNING size"
+            ).fetchall()
+            total -= sum(size for (size,) in freed)
+
+    def clear(self):
+        """Drop every stored page."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM bodies")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            pages, size = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM pages), "
+                "(SELECT COALESCE(SUM(size), 0) FROM bodies)"
+            ).fetchone()
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "pages": pages,
+            "bytes": size,
+        }
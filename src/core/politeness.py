@@ -0,0 +1,238 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+import asyncio
+import os
+import threading
+import time
+
+
+class _Waiter:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future: asyncio.Future = loop.create_future()
+        self.granted = False
+
+
+class _Host:
+    def __init__(self):
+        self.active = 0
+        self.next_at = 0.0  # Earliest start of the next request
+        self.strikes = 0  # Consecutive rate-limited responses
+        self.waiters: Deque[_Waiter] = deque()
+
+
+class HostScheduler:
+    """
+    Process-wide politeness scheduler for page fetches.
+
+    Features:
+    - At most `max_per_host` pages in flight per host, `max_total` overall
+    - At least `min_interval` seconds between request starts to one host
+    - 429/503 responses push the host back by Retry-After (seconds or
+      HTTP date), or by an exponential backoff when the header is missing
+    - Free slots are handed out round-robin across hosts, FIFO within a host,
+      so one popular domain cannot starve the others
+    - Shared by every scraper and event loop in the process (e.g. every
+      Streamlit session)
+    """
+
+    RATE_LIMIT_STATUS_CODES = {429, 503}
+    # Waiters re-check at least this often, so spacing that elapses after the
+    # last release is noticed without a timer
+    POLL_INTERVAL = 0.5
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_per_host: int = 2,
+        max_total: int = 32,
+        min_interval: float = 1.0,
+        backoff_base: float = 5.0,
+        backoff_max: float = 120.0,
+    ):
+        """
+        Args:
+            max_per_host: Concurrent pages per host
+            max_total: Concurrent pages across all hosts
+            min_interval: Seconds between request starts to the same host
+            backoff_base: First delay after a rate-limited response without
+                Retry-After
+            backoff_max: Longest delay applied to a host
+        """
+        self.max_per_host = max_per_host
+        self.max_total = max_total
+        self.min_interval = min_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._hosts: Dict[str, _Host] = {}
+        self._ring: Deque[str] = deque()  # Hosts with waiters, in turn order
+        self._active = 0
+        self._lock = threading.Lock()
+
+        self.granted = 0
+        self.waited = 0  # Requests that could not start immediately
+        self.rate_limited = 0
+
+    @classmethod
+    def shared(cls) -> "HostScheduler":
+        """Return the process-wide scheduler, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    max_per_host=int(os.getenv("SCRAPE_MAX_PER_HOST", "2")),
+                    max_total=int(os.getenv("SCRAPE_MAX_TOTAL", "32")),
+                    min_interval=float(os.getenv("SCRAPE_HOST_INTERVAL", "1.0")),
+                )
+            return cls._shared
+
+    @staticmethod
+    def host(url: str) -> str:
+        host = (urlparse(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold a politeness slot for the URL's host while fetching it."""
+        host = self.host(url)
+        await self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    async def acquire(self, host: str):
+        """Wait for this host's turn."""
+        waiter = _Waiter(asyncio.get_running_loop())
+        with self._lock:
+            state = self._hosts.setdefault(host, _Host())
+            state.waiters.append(waiter)
+            if host not in self._ring:
+                self._ring.append(host)
+            delay = self._dispatch()
+        if not waiter.granted:
+            self.waited += 1
+
+        try:
+            while not waiter.future.done():
+                # Whoever wakes up first re-runs dispatch once spacing or a
+                # Retry-After delay has passed
+                timeout = self.POLL_INTERVAL if delay is None else delay
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+                except asyncio.TimeoutError:
+                    with self._lock:
+                        delay = self._dispatch()
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release(host)
+                else:
+                    state.waiters.remove(waiter)
+                    if not state.waiters and host in self._ring:
+                        self._ring.remove(host)
+            raise
+
+    def release(self, host: str):
+        with self._lock:
+            self._release(host)
+
+    def _release(self, host: str):
+        self._hosts[host].active -= 1
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> Optional[float]:
+        """
+        Grant free slots round-robin (lock held).
+
+        Returns the seconds until a spacing- or Retry-After-blocked host
+        becomes eligible, or None if no host is blocked that way.
+        """
+        now = time.monotonic()
+        earliest: Optional[float] = None
+        grants: List[_Waiter] = []
+        granted_this_round = True
+        while granted_this_round and self._active < self.max_total:
+            granted_this_round = False
+            for _ in range(len(self._ring)):
+                if self._active >= self.max_total:
+                    break
+                host = self._ring[0]
+                self._ring.rotate(-1)
+                state = self._hosts[host]
+                if not state.waiters:
+                    self._ring.remove(host)
+                    continue
+                if state.active >= self.max_per_host:
+                    continue
+                if state.next_at > now:
+                    wait = state.next_at - now
+                    earliest = wait if earliest is None else min(earliest, wait)
+                    continue
+                waiter = state.waiters.popleft()
+                waiter.granted = True
+                state.active += 1
+                state.next_at = now + self.min_interval
+                self._active += 1
+                self.granted += 1
+                grants.append(waiter)
+                granted_this_round = True
+                if not state.waiters:
+                    self._ring.remove(host)
+
+        for waiter in grants:
+            if not waiter.loop.is_closed():
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+        return earliest
+
+    def report(self, url: str, status_code: Optional[int], retry_after=None):
+        """Push the host back after a rate-limited response."""
+        host = self.host(url)
+        with self._lock:
+            state = self._hosts.setdefault(host, _Host())
+            if status_code not in self.RATE_LIMIT_STATUS_CODES:
+                state.strikes = 0
+                return
+            self.rate_limited += 1
+            delay = self._retry_after_seconds(retry_after)
+            if delay is None:
+                delay = self.backoff_base * 2**state.strikes
+            state.strikes += 1
+            delay = min(delay, self.backoff_max)
+            state.next_at = max(state.next_at, time.monotonic() + delay)
+
+    @staticmethod
+    def _retry_after_seconds(value) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            waiting = sum(len(state.waiters) for state in self._hosts.values())
+        return {
+            "granted": self.granted,
+            "waited": self.waited,
+            "rate_limited": self.rate_limited,
+            "active": self._active,
+            "waiting": waiting,
+            "hosts": len(self._hosts),
+        }
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
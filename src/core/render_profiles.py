@@ -0,0 +1,201 @@
+from typing import Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlparse
+import os
+import threading
+
+from crawl4ai import AsyncWebCrawler
+
+
+# Ad, analytics and tag-manager hosts (matched on the host and its parents)
+TRACKER_HOSTS = frozenset(
+    {
+        "google-analytics.com",
+        "googletagmanager.com",
+        "googlesyndication.com",
+        "googleadservices.com",
+        "doubleclick.net",
+        "adservice.google.com",
+        "amazon-adsystem.com",
+        "adnxs.com",
+        "criteo.com",
+        "taboola.com",
+        "outbrain.com",
+        "scorecardresearch.com",
+        "quantserve.com",
+        "chartbeat.com",
+        "hotjar.com",
+        "clarity.ms",
+        "segment.com",
+        "mixpanel.com",
+        "facebook.net",
+        "connect.facebook.net",
+        "ads-twitter.com",
+        "analytics.twitter.com",
+        "ads.linkedin.com",
+        "pixel.wp.com",
+        "newrelic.com",
+        "nr-data.net",
+    }
+)
+
+
+class RenderProfile:
+    """Network requests a browser render is allowed to make."""
+
+    def __init__(
+        self,
+        name: str,
+        blocked_types: Iterable[str] = (),
+        block_trackers: bool = False,
+    ):
+        """
+        Args:
+            name: Profile name used in configuration
+            blocked_types: Playwright resource types to abort ("image",
+                "media", "font", "stylesheet", ...); the page itself is never blocked
+            block_trackers: Abort requests to TRACKER_HOSTS
+        """
+        self.name = name
+        self.blocked_types: FrozenSet[str] = frozenset(blocked_types) - {"document"}
+        self.block_trackers = block_trackers
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.blocked_types) or self.block_trackers
+
+
+PROFILES = {
+    # Everything a normal browser would load
+    "full": RenderProfile("full"),
+    # Text needs scripts and layout, not pixels or third-party tags
+    "lite": RenderProfile(
+        "lite", blocked_types=("image", "media", "font"), block_trackers=True
+    ),
+    # Also drops stylesheets; fastest, but lazy-loading layouts may break
+    "text": RenderProfile(
+        "text",
+        blocked_types=("image", "media", "font", "stylesheet", "manifest"),
+        block_trackers=True,
+    ),
+}
+
+
+class RenderProfiles:
+    """
+    Network-level resource blocking for browser renders.
+
+    Features:
+    - Named profiles (PROFILES) that abort resource types and tracker hosts
+      before they are downloaded
+    - Per-domain overrides (matched on the host and its parent domains) for
+      sites that break under the default profile
+    - Installed through Crawl4AI's before_goto hook, so it applies to pooled
+      and one-off browsers alike; the "full" profile adds no routing at all
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        default: str = "lite",
+        domain_profiles: Optional[Dict[str, str]] = None,
+        tracker_hosts: Iterable[str] = TRACKER_HOSTS,
+    ):
+        """
+        Args:
+            default: Profile for domains without an override
+            domain_profiles: Profile name per domain, e.g. {"bloomberg.com": "full"}
+            tracker_hosts: Hosts blocked by profiles with block_trackers
+        """
+        self.default = PROFILES[default]
+        self.domain_profiles = {
+            domain.lower(): PROFILES[name]
+            for domain, name in (domain_profiles or {}).items()
+        }
+        self.tracker_hosts = frozenset(tracker_hosts)
+
+        self._lock = threading.Lock()
+        self.blocked: Dict[str, int] = {}  # Aborted requests by resource type
+        self.pages: Dict[str, int] = {}  # Renders by profile name
+
+    @classmethod
+    def shared(cls) -> "RenderProfiles":
+        """
+        Return the process-wide profiles, configured from the environment:
+        RENDER_PROFILE (default "lite") and RENDER_PROFILE_OVERRIDES
+        ("domain=profile,domain=profile").
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                overrides = os.getenv("RENDER_PROFILE_OVERRIDES", "")
+                cls._shared = cls(
+                    default=os.getenv("RENDER_PROFILE", "lite"),
+                    domain_profiles=dict(
+                        (part.strip() for part in item.split("=", 1))
+                        for item in overrides.split(",")
+                        if "=" in item
+                    ),
+                )
+            return cls._shared
+
+    @staticmethod
+    def _parent_domains(host: str) -> Iterable[str]:
+        labels = host.split(".")
+        return (".".join(labels[i:]) for i in range(len(labels) - 1))
+
+    def profile_for(self, url: str) -> RenderProfile:
+        """Profile of the most specific overridden domain the URL belongs to."""
+        host = (urlparse(url).hostname or "").lower()
+        for domain in self._parent_domains(host):
+            profile = self.domain_profiles.get(domain)
+            if profile is not None:
+                return profile
+        return self.default
+
+    def is_tracker(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return host in self.tracker_hosts or any(
+            domain in self.tracker_hosts for domain in self._parent_domains(host)
+        )
+
+    def attach(self, crawler: AsyncWebCrawler) -> AsyncWebCrawler:
+        """Apply the profiles to every page the crawler renders."""
+        crawler.crawler_strategy.set_hook("before_goto", self._before_goto)
+        return crawler
+
+    async def _before_goto(self, page, context=None, url=None, config=None, **kwargs):
+        profile = self.profile_for(url or "")
+        self._count(self.pages, profile.name)
+        if not profile.blocks_anything or getattr(page, "_render_profile", None):
+            return page
+        page._render_profile = profile.name
+
+        async def route(route):
+            request = route.request
+            resource_type = request.resource_type
+            # Ad iframes are documents too; only the page itself is exempt
+            main_document = (
+                resource_type == "document" and request.frame.parent_frame is None
+            )
+            if resource_type in profile.blocked_types or (
+                profile.block_trackers
+                and not main_document
+                and self.is_tracker(request.url)
+            ):
+                self._count(self.blocked, resource_type)
+                await route.abort()
+            else:
+                # Leave the request to context-level routes, if any
+                await route.fallback()
+
+        await page.route("**/*", route)
+        return page
+
+    def _count(self, counter: Dict[str, int], key: str):
+        with self._lock:
+            counter[key] = counter.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"pages": dict(self.pages), "blocked": dict(self.blocked)}
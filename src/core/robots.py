@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import os
+import threading
+import time
+
+import httpx
+
+from core.singleflight import SingleFlight
+
+# Parsed rules (None allows everything) and when they expire
+_Entry = Tuple[Optional[RobotFileParser], float]
+
+
+class RobotsCache:
+    """
+    Process-wide robots.txt cache.
+
+    Features:
+    - One robots.txt fetch per origin per `ttl`, shared by every scraper and
+      event loop in the process; concurrent lookups for an origin share the
+      fetch
+    - Negative caching: a missing robots.txt (4xx) allows everything and is
+      remembered for `missing_ttl`; unreachable ones (5xx, timeouts) allow
+      everything for the shorter `error_ttl`, like Crawl4AI's own check
+    - Rules are evaluated in memory, so disallowed URLs can be dropped before
+      they are dispatched
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        ttl: float = 24 * 60 * 60,
+        missing_ttl: float = 24 * 60 * 60,
+        error_ttl: float = 10 * 60,
+        max_origins: int = 10_000,
+    ):
+        """
+        Args:
+            ttl: Seconds a fetched robots.txt is trusted
+            missing_ttl: Seconds an origin without robots.txt stays allow-all
+            error_ttl: Seconds before an unreachable robots.txt is retried
+            max_origins: Origins remembered before the least recently used
+                are forgotten
+        """
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.error_ttl = error_ttl
+        self.max_origins = max_origins
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+        self.hits = 0
+        self.fetches = 0
+        self.disallowed = 0
+
+    @classmethod
+    def shared(cls) -> "RobotsCache":
+        """Return the process-wide cache, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(ttl=float(os.getenv("ROBOTS_TTL", "86400")))
+            return cls._shared
+
+    @staticmethod
+    def origin(url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            return None
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    async def allowed(
+        self, url: str, client: httpx.AsyncClient, user_agent: str = "*"
+    ) -> bool:
+        """
+        Whether robots.txt lets `user_agent` fetch the URL.
+
+        Args:
+            url: Page to check
+            client: HTTP client for the running event loop, used on a miss
+            user_agent: User agent the rules are matched against
+        """
+        origin = self.origin(url)
+        if origin is None:
+            return True
+
+        parser = self._cached(origin)
+        if parser is False:
+            parser = await self._flights.do(origin, lambda: self._fetch(origin, client))
+        if parser is None or parser.can_fetch(user_agent or "*", url):
+            return True
+        self.disallowed += 1
+        return False
+
+    def _cached(self, origin: str):
+        """Return the cached parser (None = allow all), or False on a miss."""
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry is None or entry[1] <= time.time():
+                return False
+            self._entries.move_to_end(origin)
+            self.hits += 1
+            return entry[0]
+
+    async def _fetch(
+        self, origin: str, client: httpx.AsyncClient
+    ) -> Optional[RobotFileParser]:
+        self.fetches += 1
+        parser, ttl = None, self.error_ttl
+        try:
+            response = await client.get(f"{origin}/robots.txt")
+        except httpx.HTTPError as e:
+            print(f"Error fetching robots.txt for {origin}: {e}")
+        else:
+            if response.status_code == 200:
+                parser = RobotFileParser()
+                parser.parse(response.text.splitlines())
+                ttl = self.ttl
+            elif 400 <= response.status_code < 500:
+                ttl = self.missing_ttl
+
+        with self._lock:
+            self._entries[origin] = (parser, time.time() + ttl)
+            self._entries.move_to_end(origin)
+            while len(self._entries) > self.max_origins:
+                self._entries.popitem(last=False)
+        return parser
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "disallowed": self.disallowed,
+            "origins": len(self._entries),
+        }
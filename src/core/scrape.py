@@ -2,9 +2,55 @@ from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.async_configs import CacheMode
 from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher, SemaphoreDispatcher
 from crawl4ai import RateLimiter, CrawlerMonitor, DisplayMode
-from typing import Dict, List, Optional, Any, Union, Tuple
+from crawl4ai.models import CrawlResult
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from collections import deque
+from contextlib import asynccontextmanager
 import asyncio
+import hashlib
+import json
 import pprint
+import threading
+import weakref
+
+import httpx
+import psutil
+
+from core.browser_pool import BrowserPool
+from core.fast_path import HTTPFastPath
+from core.html_processing import HTMLProcessPool
+from core.page_buffer import PageBuffer
+from core.page_store import PageStore
+from core.politeness import HostScheduler
+from core.render_profiles import RenderProfiles
+from core.robots import RobotsCache
+from core.singleflight import Abandoned, SingleFlight
+
+
+# Leaves of a formatted result, selectable with `fields=` ("metadata" accepts
+# any key, since some are only present for some results)
+RESULT_FIELDS = (
+    "content.markdown.raw",
+    "content.markdown.fitted",
+    "content.html.raw",
+    "content.html.cleaned",
+    "content.text",
+    "metadata",
+    "resources.media",
+    "resources.links",
+    "dispatch_info",
+)
 
 
 class Crawl4AIScraper:
@@ -17,8 +63,23 @@ class Crawl4AIScraper:
     - Streaming mode for real-time results
     - Memory management and rate limiting
     - Real-time monitoring
+    - Identical in-flight scrapes are shared across callers in the process
+    - Optional warm browser pool (see start()/close())
+    - Scraped pages kept in a PageStore and revalidated with a conditional HEAD;
+      served to calls whose `fields=` only ask for markdown and metadata
+    - Plain-HTTP fast path; the browser is only used when a page needs it
+    - `fields=` projection so callers only keep the parts of a page they use
+    - Process-wide per-host politeness (caps, spacing, Retry-After, fairness)
+    - Cached robots.txt rules, checked before a URL is dispatched
+    - End-to-end deadlines and "first K good pages" mode with partial results
+    - Render profiles that block images, fonts, media and trackers per domain
+    - Optional HTML-to-markdown post-processing in worker processes
+    - Large bodies can be spilled to a per-request memory-mapped PageBuffer
     """
 
+    # Process-wide registry of pages being scraped
+    _flights = SingleFlight()
+
     def __init__(
         self,
         # Basic crawling config
@@ -27,7 +88,8 @@ class Crawl4AIScraper:
         exclude_external_links: bool = True,
         process_iframes: bool = True,
         remove_overlay_elements: bool = True,
-        cache_mode: CacheMode = CacheMode.ENABLED,
+        # Pages are cached by our own PageStore, not Crawl4AI's cache
+        cache_mode: CacheMode = CacheMode.BYPASS,
         # Browser config
         browser_config: Optional[BrowserConfig] = None,
         # Dispatcher defaults
@@ -42,6 +104,28 @@ class Crawl4AIScraper:
         rate_limit_codes: List[int] = [429, 503],
         # Monitoring defaults
         monitor: bool = True,
+        # Browser pool defaults
+        num_browsers: int = 1,
+        contexts_per_browser: Optional[int] = None,
+        max_pages_per_browser: int = 200,
+        browser_memory_limit_mb: Optional[float] = None,
+        # Page store defaults
+        use_page_store: bool = True,
+        page_store: Optional[PageStore] = None,
+        revalidate_timeout: float = 5.0,
+        # Plain-HTTP fast path defaults
+        use_http_fast_path: bool = True,
+        fast_path: Optional[HTTPFastPath] = None,
+        # Politeness defaults
+        use_host_scheduler: bool = True,
+        host_scheduler: Optional[HostScheduler] = None,
+        robots_cache: Optional[RobotsCache] = None,
+        # Resource blocking defaults
+        use_render_profiles: bool = True,
+        render_profiles: Optional[RenderProfiles] = None,
+        # Post-processing defaults
+        offload_processing: bool = False,
+        html_pool: Optional[HTMLProcessPool] = None,
     ):
         """
         Initialize the crawler with comprehensive configuration options.
@@ -73,16 +157,248 @@ class Crawl4AIScraper:
         self.max_concurrent = max_concurrent
         self.memory_threshold = memory_threshold
         self.check_interval = check_interval
+        # Same hysteresis as MemoryAdaptiveDispatcher: stop admitting pages at
+        # memory_threshold, resume once usage drops 5 points below it
+        self.memory_recovery_threshold = memory_threshold - 5.0
+        self.memory_pressure = False
+
+        # Browsers only download what the page text needs (RENDER_PROFILE)
+        self.render_profiles = None
+        if use_render_profiles:
+            self.render_profiles = render_profiles or RenderProfiles.shared()
+
+        # Warm browsers, launched by start(); without it every call launches
+        # and tears down its own browser
+        self.pool = BrowserPool(
+            browser_config=self.browser_config,
+            num_browsers=num_browsers,
+            contexts_per_browser=contexts_per_browser or max_concurrent,
+            max_pages_per_browser=max_pages_per_browser,
+            memory_limit_mb=browser_memory_limit_mb,
+            render_profiles=self.render_profiles,
+        )
+
+        self.page_store = (page_store or PageStore.shared()) if use_page_store else None
+        self.revalidate_timeout = revalidate_timeout
+        self._http_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._http_clients_lock = threading.Lock()
+
+        # Server-rendered pages skip the browser; word_count_threshold also
+        # decides when a plain-HTTP page has too little text
+        self.fast_path = (
+            (fast_path or HTTPFastPath.shared()) if use_http_fast_path else None
+        )
+
+        # Shared by every scraper in the process, so concurrent users hitting
+        # the same site are spaced out together
+        self.host_scheduler = (
+            (host_scheduler or HostScheduler.shared()) if use_host_scheduler else None
+        )
+
+        # Used when a scrape is called with check_robots_txt=True
+        self.robots = robots_cache or RobotsCache.shared()
+
+        # Browsers and the HTTP fast path only fetch; cleaning and markdown
+        # generation run in worker processes (HTML_WORKERS)
+        self.html_pool = None
+        if offload_processing:
+            self.html_pool = html_pool or HTMLProcessPool.shared()
+
+    async def start(self) -> "Crawl4AIScraper":
+        """Launch the browser pool so every scrape reuses a warm browser."""
+        await self.pool.start()
+        return self
+
+    async def close(self):
+        """Close the browser pool and this event loop's HTTP connections."""
+        await self.pool.close()
+        if self.fast_path is not None:
+            await self.fast_path.close()
+        with self._http_clients_lock:
+            client = self._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self) -> "Crawl4AIScraper":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @asynccontextmanager
+    async def _crawler(self, pages: int = 1) -> AsyncIterator[AsyncWebCrawler]:
+        """Borrow a pooled browser, or launch a one-off one if not started."""
+        if self.pool.started:
+            async with self.pool.acquire(pages) as crawler:
+                yield crawler
+        else:
+            async with self._new_crawler() as crawler:
+                yield crawler
+
+    @asynccontextmanager
+    async def _window_crawler(self) -> AsyncIterator[Optional["_OnDemandCrawler"]]:
+        """
+        Crawler for a window of pages: None when pooled (each page borrows a
+        slot), else a one-off browser launched only if a page needs it.
+        """
+        if self.pool.started:
+            yield None
+            return
+        crawler = _OnDemandCrawler(self._new_crawler)
+        try:
+            yield crawler
+        finally:
+            await crawler.close()
+
+    def _new_crawler(self) -> AsyncWebCrawler:
+        crawler = AsyncWebCrawler(config=self.browser_config)
+        if self.render_profiles is not None:
+            self.render_profiles.attach(crawler)
+        return crawler
 
     async def scrape(
-        self, url: str, config: Optional[Union[CrawlerRunConfig, Dict]] = None
+        self,
+        url: str,
+        config: Optional[Union[CrawlerRunConfig, Dict]] = None,
+        fields: Optional[Iterable[str]] = None,
+        buffer: Optional[PageBuffer] = None,
     ) -> Dict[str, Any]:
-        """Scrape a single URL with optional configuration override."""
+        """
+        Scrape a single URL with optional configuration override.
+
+        Args:
+            url: URL to scrape
+            config: Optional configuration override
+            fields: Dotted paths to keep, e.g. ("metadata.url",
+                "content.markdown.raw"); None keeps the full result
+            buffer: Spill large bodies into this PageBuffer; they are returned
+                as PageHandles, valid until the buffer is closed
+        """
+        fields = self._check_fields(fields)
         run_config = self._resolve_config(config)
+        from_store = self._serves_from_store(fields)
 
-        async with AsyncWebCrawler(config=self.browser_config) as crawler:
-            result = await crawler.arun(url=url, config=run_config)
-            return self._format_result(result)
+        result = await self._flights.do(
+            self._flight_key(url, run_config, from_store),
+            lambda: self._scrape_uncoalesced(url, run_config, from_store),
+        )
+        return self._project(result, fields, buffer)
+
+    async def _scrape_uncoalesced(
+        self, url: str, run_config: CrawlerRunConfig, from_store: bool = False
+    ) -> Dict[str, Any]:
+        if from_store:
+            stored = await self._load_stored(url, run_config)
+            if stored is not None:
+                return stored
+        result = await self._render(None, url, run_config)
+        self._save_stored(url, run_config, result)
+        return result
+
+    async def _render(
+        self,
+        crawler: Optional[Union[AsyncWebCrawler, "_OnDemandCrawler"]],
+        url: str,
+        run_config: CrawlerRunConfig,
+    ) -> Dict[str, Any]:
+        """Fetch a page while holding its host's politeness slot."""
+        if self.host_scheduler is None:
+            return await self._render_unscheduled(crawler, url, run_config)
+        async with self.host_scheduler.slot(url):
+            result = await self._render_unscheduled(crawler, url, run_config)
+            metadata = result["metadata"]
+            self.host_scheduler.report(
+                url, metadata["status_code"], metadata["retry_after"]
+            )
+        return result
+
+    async def _render_unscheduled(
+        self,
+        crawler: Optional[Union[AsyncWebCrawler, "_OnDemandCrawler"]],
+        url: str,
+        run_config: CrawlerRunConfig,
+    ) -> Dict[str, Any]:
+        """Try a plain HTTP GET first, then render in a browser if needed."""
+        result = await self._fetch_fast(url, run_config)
+        if result is not None:
+            return result
+        if isinstance(crawler, _OnDemandCrawler):
+            crawler = await crawler.get()
+        if crawler is None:
+            async with self._crawler() as crawler:
+                return self._browser_result(
+                    url, await self._arun(crawler, url, run_config)
+                )
+        return self._browser_result(url, await self._arun(crawler, url, run_config))
+
+    async def _arun(
+        self, crawler: AsyncWebCrawler, url: str, run_config: CrawlerRunConfig
+    ):
+        """Render a page, post-processing it in the HTML pool when enabled."""
+        if self.html_pool is None:
+            return await crawler.arun(url=url, config=run_config)
+        try:
+            response = await crawler.crawler_strategy.crawl(url, config=run_config)
+        except Exception as e:
+            return CrawlResult(url=url, html="", success=False, error_message=str(e))
+        return await self.html_pool.process(url, response, run_config)
+
+    async def _fetch_fast(
+        self, url: str, run_config: CrawlerRunConfig
+    ) -> Optional[Dict[str, Any]]:
+        """Formatted plain-HTTP result, or None if the page needs a browser."""
+        if self.fast_path is None or self.fast_path.needs_browser(url):
+            return None
+        result, reason = await self.fast_path.fetch(
+            url, run_config, run_config.word_count_threshold, self.html_pool
+        )
+        if reason is not None:
+            return None
+        formatted = self._format_result(result)
+        formatted["metadata"]["renderer"] = "http"
+        return formatted
+
+    async def _fetch_fast_many(
+        self, urls: List[str], run_config: CrawlerRunConfig
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Yield (url, plain-HTTP result or None) as the fetches finish."""
+        if self.fast_path is None:
+            for url in urls:
+                yield url, None
+            return
+
+        async def fetch(url: str):
+            return url, await self._fetch_fast(url, run_config)
+
+        tasks = [asyncio.create_task(fetch(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _browser_result(self, url: str, result) -> Dict[str, Any]:
+        formatted = self._format_result(result)
+        formatted["metadata"]["renderer"] = "browser"
+        if self.fast_path is not None:
+            self.fast_path.record_browser_result(url, formatted)
+        return formatted
+
+    @staticmethod
+    def _flight_key(
+        url: str, run_config: CrawlerRunConfig, from_store: bool = False
+    ) -> Tuple[str, str, bool]:
+        """
+        Scrapes of the same URL with the same run config are interchangeable,
+        as long as they agree on whether a (partial) stored page will do.
+        """
+        config = json.dumps(run_config.dump(), sort_keys=True, default=str)
+        return url, config, from_store
+
+    def _serves_from_store(self, fields: Optional[Tuple[str, ...]]) -> bool:
+        """Stored pages only hold some fields; full results are always scraped."""
+        return self.page_store is not None and PageStore.covers(fields)
 
     async def scrape_many(
         self,
@@ -91,39 +407,557 @@ class Crawl4AIScraper:
         dispatcher: Optional[
             Union[MemoryAdaptiveDispatcher, SemaphoreDispatcher]
         ] = None,
+        stream: bool = False,
         batch_size: int = None,
         check_robots_txt: bool = False,
-    ) -> Union[List[Dict[str, Any]], Any]:
+        fields: Optional[Iterable[str]] = None,
+        deadline: Optional[float] = None,
+        first_k: Optional[int] = None,
+        buffer: Optional[PageBuffer] = None,
+    ) -> Union[List[Dict[str, Any]], AsyncIterator[Dict[str, Any]]]:
         """
         Scrape multiple URLs with advanced dispatching options.
 
         Args:
             urls: List of URLs to scrape
             config: Optional configuration override
-            dispatcher: Custom dispatcher instance
+            dispatcher: Custom dispatcher instance (by default pages go through
+                the process-wide HostScheduler, or a dispatcher built from the
+                init settings when use_host_scheduler=False)
             stream: Whether to stream results as they arrive
-            batch_size: Process URLs in batches of this size
-            check_robots_txt: Respect robots.txt rules
+            batch_size: Schedule pages ourselves through a sliding window of
+                min(batch_size, max_concurrent) pages instead of handing the
+                list to the dispatcher (no barrier between batches)
+            check_robots_txt: Respect robots.txt rules (cached per origin and
+                checked before a URL is dispatched; disallowed URLs get a 403
+                result with metadata["robots_blocked"])
+            fields: Dotted paths to keep in each result (see scrape()); the
+                rest of a page is dropped as soon as it finishes
+            deadline: Seconds the whole call may take (counted from the call,
+                or from the first iteration when streaming). Pages still
+                loading then are cancelled and marked metadata["timed_out"]
+            first_k: Stop once this many successful pages with at least
+                word_count_threshold words have arrived; pages not finished
+                by then are cancelled and marked metadata["skipped"]
+            buffer: Spill large bodies into this PageBuffer (see scrape())
 
         Returns:
-            List of results if stream=False, async generator if stream=True
+            List of results in URL order if stream=False, async generator if
+            stream=True. Streamed results arrive in completion order and carry
+            the position of their URL in `urls` as metadata["index"]:
+
+                async for result in await scraper.scrape_many(urls, stream=True):
+                    ...
+
+            A page whose scrape raised comes back failed, with the exception
+            in metadata["error"]; the other pages are unaffected.
         """
+        fields = self._check_fields(fields)
+        # robots.txt is evaluated here, before dispatch, instead of by Crawl4AI
         run_config = self._resolve_config(config)
-        run_config.check_robots_txt = check_robots_txt
 
-        if dispatcher is None:
+        if dispatcher is None and self.host_scheduler is None:
             dispatcher = self._create_default_dispatcher()
 
-        async with AsyncWebCrawler(config=self.browser_config) as crawler:
-            if batch_size:
+        if stream:
+            return self._stream_many(
+                urls,
+                run_config,
+                dispatcher,
+                batch_size,
+                check_robots_txt,
+                fields,
+                deadline,
+                first_k,
+                buffer,
+            )
+
+        budget = _Budget(deadline, first_k, run_config.word_count_threshold)
+        results = [None] * len(urls)
+        async for index, result in budget.run(
+            self._scrape_indexed(
+                urls,
+                run_config,
+                dispatcher,
+                batch_size,
+                check_robots_txt,
+                self._serves_from_store(fields),
+            ),
+            result=lambda item: item[1],
+        ):
+            results[index] = self._project(result, fields, buffer)
+        for index, url in enumerate(urls):
+            if results[index] is None:
+                unfinished = self._empty_result(url, **budget.stop_flags())
+                results[index] = self._project(unfinished, fields)
+        return results
 
-                return await self._process_in_batches(
-                    crawler, urls, run_config, dispatcher, batch_size
+    async def _stream_many(
+        self,
+        urls: List[str],
+        run_config: CrawlerRunConfig,
+        dispatcher: Optional[Union[MemoryAdaptiveDispatcher, SemaphoreDispatcher]],
+        batch_size: Optional[int],
+        check_robots_txt: bool,
+        fields: Optional[Tuple[str, ...]],
+        deadline: Optional[float],
+        first_k: Optional[int],
+        buffer: Optional[PageBuffer],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        budget = _Budget(deadline, first_k, run_config.word_count_threshold)
+        finished = set()
+        async for index, result in budget.run(
+            self._scrape_indexed(
+                urls,
+                run_config,
+                dispatcher,
+                batch_size,
+                check_robots_txt,
+                self._serves_from_store(fields),
+            ),
+            result=lambda item: item[1],
+        ):
+            finished.add(index)
+            yield self._tag_index(self._project(result, fields, buffer), index)
+        for index, url in enumerate(urls):
+            if index not in finished:
+                unfinished = self._empty_result(url, **budget.stop_flags())
+                yield self._tag_index(self._project(unfinished, fields), index)
+
+    @staticmethod
+    def _tag_index(result: Dict[str, Any], index: int) -> Dict[str, Any]:
+        # Results may be shared with other callers, so tag a copy
+        metadata = {**result.get("metadata", {}), "index": index}
+        return {**result, "metadata": metadata}
+
+    async def _scrape_indexed(
+        self,
+        urls: List[str],
+        run_config: CrawlerRunConfig,
+        dispatcher: Optional[Union[MemoryAdaptiveDispatcher, SemaphoreDispatcher]],
+        batch_size: Optional[int],
+        check_robots_txt: bool = False,
+        from_store: bool = False,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (index in urls, result) pairs as pages finish. Stored pages are
+        only used with from_store (the caller wants stored fields only).
+        """
+        positions: Dict[str, List[int]] = {}
+        for index, url in enumerate(urls):
+            positions.setdefault(url, []).append(index)
+
+        # Disallowed URLs never reach the store, a flight or a browser slot
+        if check_robots_txt:
+            allowed = await asyncio.gather(
+                *(self._robots_allowed(url) for url in positions)
+            )
+            for url, ok in zip(list(positions), allowed):
+                if not ok:
+                    result = self._empty_result(url, 403, robots_blocked=True)
+                    for index in positions.pop(url):
+                        yield index, result
+
+        # Pages in the store (fresh, or unchanged since they were stored) are
+        # served without a browser
+        if from_store:
+            stored = await asyncio.gather(
+                *(self._load_stored(url, run_config) for url in positions)
+            )
+            for url, result in zip(list(positions), stored):
+                if result is not None:
+                    for index in positions.pop(url):
+                        yield index, result
+
+        # URLs already being scraped by another caller are awaited, not re-crawled
+        keys = {
+            url: self._flight_key(url, run_config, from_store) for url in positions
+        }
+        claims = {url: self._flights.claim(key) for url, key in keys.items()}
+        leading = [url for url, (_, leader) in claims.items() if leader]
+
+        async def lead():
+            pending = set(leading)
+            try:
+                async for result in self._crawl_many(
+                    leading, run_config, dispatcher, batch_size
+                ):
+                    url = result["metadata"]["url"]
+                    if url in pending:
+                        pending.discard(url)
+                        self._save_stored(url, run_config, result)
+                        self._flights.resolve(keys[url], claims[url][0], result)
+                for url in pending:
+                    error = RuntimeError(f"No result: {url}")
+                    self._flights.resolve(keys[url], claims[url][0], exception=error)
+            except Exception as e:
+                for url in pending:
+                    self._flights.resolve(keys[url], claims[url][0], exception=e)
+            finally:
+                # Let other callers retry if we were cancelled before publishing
+                for url in pending:
+                    if not claims[url][0].future.done():
+                        self._flights.abandon(keys[url], claims[url][0])
+
+        async def wait(url: str) -> Dict[str, Any]:
+            try:
+                return await self._flights.wait(keys[url], claims[url][0])
+            except Abandoned:
+                return await self.scrape(url, run_config)
+            except Exception as e:
+                # One dead page must not take the rest of the call down with it
+                return self._empty_result(url, error=str(e))
+
+        leader = asyncio.create_task(lead()) if leading else None
+        waiting = {asyncio.create_task(wait(url)): url for url in positions}
+        try:
+            while waiting:
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
                 )
-            results = await crawler.arun_many(
-                urls=urls, config=run_config, dispatcher=dispatcher
+                for task in done:
+                    url = waiting.pop(task)
+                    result = task.result()
+                    for index in positions[url]:
+                        yield index, result
+        finally:
+            for task in waiting:
+                task.cancel()
+            if leader is not None:
+                leader.cancel()
+
+    async def _crawl_many(
+        self,
+        urls: List[str],
+        run_config: CrawlerRunConfig,
+        dispatcher: Optional[Union[MemoryAdaptiveDispatcher, SemaphoreDispatcher]],
+        batch_size: Optional[int],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Crawl URLs and yield formatted results as pages finish."""
+        if batch_size or dispatcher is None:
+            # The window schedules each page through the host scheduler and
+            # tries plain HTTP before using the browser
+            async with self._window_crawler() as crawler:
+                async for result in self._stream_crawl(
+                    crawler,
+                    urls,
+                    run_config,
+                    window=min(batch_size or self.max_concurrent, self.max_concurrent),
+                    rate_limiter=dispatcher.rate_limiter if dispatcher else None,
+                    coalesce=False,
+                ):
+                    yield result
+            return
+
+        needs_browser = []
+        async for url, result in self._fetch_fast_many(urls, run_config):
+            if result is None:
+                needs_browser.append(url)
+            else:
+                yield result
+        if not needs_browser:
+            return
+
+        async with self._crawler(pages=len(needs_browser)) as crawler:
+            async for result in await crawler.arun_many(
+                urls=needs_browser,
+                config=run_config.clone(stream=True),
+                dispatcher=dispatcher,
+            ):
+                yield self._browser_result(result.url, result)
+
+    async def scrape_stream(
+        self,
+        urls: AsyncIterable[str],
+        config: Optional[Union[CrawlerRunConfig, Dict]] = None,
+        check_robots_txt: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        deadline: Optional[float] = None,
+        first_k: Optional[int] = None,
+        buffer: Optional[PageBuffer] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scrape URLs while they are still being produced.
+
+        Pages start loading as soon as their URL arrives (up to max_concurrent
+        at a time) and each result is yielded as soon as its page finishes,
+        e.g. `scraper.scrape_stream(links_from_search())`.
+
+        Args:
+            urls: Async iterable of URLs, consumed lazily
+            config: Optional configuration override
+            check_robots_txt: Respect robots.txt rules (cached per origin and
+                checked before a URL is dispatched; disallowed URLs get a 403
+                result with metadata["robots_blocked"])
+            fields: Dotted paths to keep in each result (see scrape())
+            deadline: Seconds from the first iteration until the stream ends;
+                pages still loading (and URLs not yet produced) are dropped
+            first_k: End the stream after this many successful pages with at
+                least word_count_threshold words
+            buffer: Spill large bodies into this PageBuffer (see scrape())
+
+        Yields:
+            Formatted results in completion order. A page whose scrape raised
+            comes back failed, with the exception in metadata["error"]
+        """
+        fields = self._check_fields(fields)
+        run_config = self._resolve_config(config)
+        budget = _Budget(deadline, first_k, run_config.word_count_threshold)
+        async with self._window_crawler() as crawler:
+            async for result in budget.run(
+                self._stream_crawl(
+                    crawler,
+                    urls,
+                    run_config,
+                    check_robots_txt=check_robots_txt,
+                    from_store=self._serves_from_store(fields),
+                )
+            ):
+                yield self._project(result, fields, buffer)
+
+    async def _stream_crawl(
+        self,
+        crawler: Optional[Union[AsyncWebCrawler, "_OnDemandCrawler"]],
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        run_config: CrawlerRunConfig,
+        window: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce: bool = True,
+        check_robots_txt: bool = False,
+        from_store: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Sliding-window scheduler: keep `window` pages in flight while URLs
+        keep arriving, starting the next page as soon as any page finishes.
+
+        New pages are held back while system memory is above
+        memory_threshold (one page is always allowed so the crawl progresses).
+
+        Args:
+            crawler: Crawler to use (see _window_crawler()), or None to borrow
+                a pooled browser per page
+            urls: URLs to crawl, consumed lazily
+            run_config: Run configuration for every page
+            window: Pages in flight (default: max_concurrent)
+            rate_limiter: Optional per-domain crawl4ai RateLimiter
+            coalesce: Share pages with identical in-flight scrapes and go
+                through the page store (callers that already did both pass False)
+            check_robots_txt: Drop URLs robots.txt disallows before they take
+                a window slot (lookups run alongside the crawl, up to `window`
+                URLs ahead of it)
+            from_store: Serve stored pages (markdown and metadata only) when
+                coalescing
+        """
+        window = window or self.max_concurrent
+
+        async def crawl(url: str) -> Dict[str, Any]:
+            async def run():
+                if coalesce and from_store:
+                    stored = await self._load_stored(url, run_config)
+                    if stored is not None:
+                        return stored
+                if rate_limiter is not None:
+                    await rate_limiter.wait_if_needed(url)
+                result = await self._render(crawler, url, run_config)
+                status_code = result["metadata"]["status_code"]
+                if rate_limiter is not None and status_code:
+                    rate_limiter.update_delay(url, status_code)
+                if coalesce:
+                    self._save_stored(url, run_config, result)
+                return result
+
+            if not coalesce:
+                return await run()
+            return await self._flights.do(
+                self._flight_key(url, run_config, from_store), run
             )
-            return [self._format_result(r) for r in results]
+
+        url_iterator = _as_async_iterable(urls).__aiter__()
+        next_url = asyncio.ensure_future(url_iterator.__anext__())
+        checks = {}  # robots.txt lookups; they take no window slot
+        ready = deque()  # URLs cleared to crawl, waiting for a slot
+        in_flight = {}
+        try:
+            while next_url is not None or checks or ready or in_flight:
+                timeout = None
+                while ready and len(in_flight) < window:
+                    if in_flight and self._under_memory_pressure():
+                        timeout = self.check_interval  # Re-check memory soon
+                        break
+                    url = ready.popleft()
+                    in_flight[asyncio.create_task(crawl(url))] = url
+
+                # URLs are taken up to a window ahead of the crawl, so robots.txt
+                # verdicts are known before a slot frees up
+                waitables = set(in_flight) | set(checks)
+                if next_url is not None and len(ready) + len(checks) < window:
+                    waitables.add(next_url)
+                done, _ = await asyncio.wait(
+                    waitables, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if next_url in done:
+                    try:
+                        url = next_url.result()
+                    except StopAsyncIteration:
+                        next_url = None
+                    else:
+                        if check_robots_txt:
+                            task = asyncio.create_task(self._robots_allowed(url))
+                            checks[task] = url
+                        else:
+                            ready.append(url)
+                        next_url = asyncio.ensure_future(url_iterator.__anext__())
+
+                for task in done:
+                    if task in checks:
+                        url = checks.pop(task)
+                        try:
+                            if task.result():
+                                ready.append(url)
+                                continue
+                            result = self._empty_result(url, 403, robots_blocked=True)
+                        except Exception as e:
+                            print(f"Error checking robots.txt for {url}: {e}")
+                            result = self._empty_result(url, error=str(e))
+                        yield result
+                        continue
+                    url = in_flight.pop(task, None)
+                    if url is None:
+                        continue
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"Error scraping {url}: {e}")
+                        result = self._empty_result(url, error=str(e))
+                    yield result
+        finally:
+            for task in (*in_flight, *checks):
+                task.cancel()
+            if next_url is not None:
+                next_url.cancel()
+
+    def _under_memory_pressure(self) -> bool:
+        """Whether system memory is too high to admit another page."""
+        percent = psutil.virtual_memory().percent
+        if percent >= self.memory_threshold:
+            self.memory_pressure = True
+        elif percent <= self.memory_recovery_threshold:
+            self.memory_pressure = False
+        return self.memory_pressure
+
+    @staticmethod
+    def _store_variant(run_config: CrawlerRunConfig) -> str:
+        """Pages scraped with different run configs are stored separately."""
+        config = json.dumps(run_config.dump(), sort_keys=True, default=str)
+        return hashlib.sha1(config.encode("utf-8")).hexdigest()[:16]
+
+    async def _load_stored(
+        self, url: str, run_config: CrawlerRunConfig
+    ) -> Optional[Dict[str, Any]]:
+        """Return the stored page if it is fresh or the origin says it is unchanged."""
+        if self.page_store is None:
+            return None
+        variant = self._store_variant(run_config)
+        entry = self.page_store.get(url, variant, allow_stale=True)
+        if entry is None:
+            return None
+        if entry["fresh"]:
+            return entry["result"]
+        if await self._revalidate(url, entry["etag"], entry["last_modified"]):
+            self.page_store.refresh(url, variant)
+            return entry["result"]
+        return None
+
+    def _save_stored(self, url: str, run_config: CrawlerRunConfig, result: Dict):
+        """Store successful renders along with their validators."""
+        metadata = result["metadata"]
+        if (
+            self.page_store is None
+            or metadata.get("from_store")
+            or not metadata["success"]
+            or metadata["status_code"] not in (200, None)
+            or not result["content"]["markdown"]["raw"]
+        ):
+            return
+        self.page_store.put(
+            url,
+            result,
+            self._store_variant(run_config),
+            etag=metadata.get("etag"),
+            last_modified=metadata.get("last_modified"),
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._http_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    follow_redirects=True, timeout=self.revalidate_timeout
+                )
+                self._http_clients[loop] = client
+            return client
+
+    async def _revalidate(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> bool:
+        """Conditional HEAD: True if the page has not changed since it was stored."""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if not headers:
+            return False
+
+        try:
+            response = await self._get_http_client().head(url, headers=headers)
+        except httpx.HTTPError as e:
+            print(f"Error revalidating {url}: {e}")
+            return False
+
+        if response.status_code == 304:
+            return True
+        if response.status_code != 200:
+            return False
+        # Servers that ignore conditional HEADs still report current validators
+        if etag:
+            return response.headers.get("etag") == etag
+        return response.headers.get("last-modified") == last_modified
+
+    async def _robots_allowed(self, url: str) -> bool:
+        return await self.robots.allowed(
+            url, self._get_http_client(), self.browser_config.user_agent
+        )
+
+    @staticmethod
+    def _empty_result(
+        url: str, status_code: Optional[int] = None, **flags
+    ) -> Dict[str, Any]:
+        """
+        Result for a page that was never fetched (or whose fetch raised),
+        shaped like _format_result.
+        """
+        return {
+            "content": {
+                "markdown": {"raw": None, "fitted": None},
+                "html": {"raw": "", "cleaned": None},
+                "text": None,
+            },
+            "metadata": {
+                "success": False,
+                "status_code": status_code,
+                "url": url,
+                "timestamp": None,
+                "etag": None,
+                "last_modified": None,
+                "retry_after": None,
+                **flags,
+            },
+            "resources": {"media": {}, "links": {}},
+        }
 
     def _create_default_dispatcher(self):
         """Create a dispatcher based on initialization settings."""
@@ -142,24 +976,6 @@ class Crawl4AIScraper:
             monitor=self.monitor,
         )
 
-    async def _process_in_batches(
-        self,
-        crawler: AsyncWebCrawler,
-        urls: List[str],
-        config: CrawlerRunConfig,
-        dispatcher: Union[MemoryAdaptiveDispatcher, SemaphoreDispatcher],
-        batch_size: int,
-    ) -> List[Dict[str, Any]]:
-        """Collect results in batches."""
-        all_results = []
-        for i in range(0, len(urls), batch_size):
-            batch = urls[i : i + batch_size]
-            batch_results = await crawler.arun_many(
-                urls=batch, config=config, dispatcher=dispatcher
-            )
-            all_results.extend([self._format_result(r) for r in batch_results])
-        return all_results
-
     def _resolve_config(
         self, config: Optional[Union[CrawlerRunConfig, Dict]]
     ) -> CrawlerRunConfig:
@@ -172,13 +988,66 @@ class Crawl4AIScraper:
 
         return config
 
+    @staticmethod
+    def _check_fields(fields: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+        """Validate `fields=` and drop paths already covered by a shorter one."""
+        if fields is None:
+            return None
+        fields = sorted(set(fields))
+        for field in fields:
+            if not any(
+                leaf == field
+                or leaf.startswith(field + ".")
+                or field.startswith(leaf + ".")
+                for leaf in RESULT_FIELDS
+            ):
+                raise ValueError(f"Unknown result field: {field}")
+        return tuple(
+            field
+            for field in fields
+            if not any(field.startswith(other + ".") for other in fields)
+        )
+
+    @staticmethod
+    def _project(
+        result: Dict[str, Any],
+        fields: Optional[Tuple[str, ...]],
+        buffer: Optional[PageBuffer] = None,
+    ) -> Dict[str, Any]:
+        """
+        Copy only the requested paths of a result; the rest can be freed.
+        With a buffer, large bodies in the copy are replaced by PageHandles.
+        """
+        if fields is None:
+            return buffer.spill_result(result) if buffer is not None else result
+        projected: Dict[str, Any] = {}
+        for field in fields:
+            keys = field.split(".")
+            value = result
+            for key in keys:
+                if not isinstance(value, dict) or key not in value:
+                    break
+                value = value[key]
+            else:
+                target = projected
+                for key in keys[:-1]:
+                    target = target.setdefault(key, {})
+                target[keys[-1]] = value
+        return buffer.spill_result(projected) if buffer is not None else projected
+
     def _format_result(self, result) -> Dict[str, Any]:
         """Standardize the result format with dispatch information."""
+        headers = {
+            key.lower(): value
+            for key, value in (getattr(result, "response_headers", None) or {}).items()
+        }
+        # Failed fetches (dead host, processing error) have no markdown
+        markdown = result.markdown
         formatted = {
             "content": {
                 "markdown": {
-                    "raw": result.markdown.raw_markdown,
-                    "fitted": result.markdown.fit_markdown,
+                    "raw": markdown.raw_markdown if markdown else None,
+                    "fitted": markdown.fit_markdown if markdown else None,
                 },
                 "html": {"raw": result.html, "cleaned": result.cleaned_html},
                 "text": getattr(result, "text", None),
@@ -188,9 +1057,14 @@ class Crawl4AIScraper:
                 "status_code": result.status_code,
                 "url": result.url,
                 "timestamp": getattr(result, "timestamp", None),
+                "etag": headers.get("etag"),
+                "last_modified": headers.get("last-modified"),
+                "retry_after": headers.get("retry-after"),
             },
             "resources": {"media": result.media, "links": result.links},
         }
+        if not result.success and result.error_message:
+            formatted["metadata"]["error"] = result.error_message
 
         if hasattr(result, "dispatch_result"):
             formatted["dispatch_info"] = result.dispatch_result
@@ -198,6 +1072,91 @@ class Crawl4AIScraper:
         return formatted
 
 
+class _OnDemandCrawler:
+    """One-off browser launched the first time a page of a call needs it."""
+
+    def __init__(self, factory: Callable[[], AsyncWebCrawler]):
+        self._factory = factory
+        self._starting: Optional[asyncio.Task] = None
+
+    async def get(self) -> AsyncWebCrawler:
+        if self._starting is None:
+            self._starting = asyncio.ensure_future(self._start())
+        return await asyncio.shield(self._starting)
+
+    async def _start(self) -> AsyncWebCrawler:
+        crawler = self._factory()
+        await crawler.start()
+        return crawler
+
+    async def close(self):
+        if self._starting is None:
+            return
+        try:
+            crawler = await self._starting
+        except Exception:
+            return  # The launch failed, and the pages that needed it saw why
+        await crawler.close()
+
+
+class _Budget:
+    """Deadline and "first K good pages" limits of one scrape call."""
+
+    def __init__(
+        self, deadline: Optional[float], first_k: Optional[int], min_words: int
+    ):
+        self.deadline = deadline
+        self.first_k = first_k
+        self.min_words = min_words
+        self.good = 0
+        self.timed_out = False
+
+    def stop_flags(self) -> Dict[str, bool]:
+        """Metadata flags for pages the call stopped waiting for."""
+        return {"timed_out": True} if self.timed_out else {"skipped": True}
+
+    def is_good(self, result: Dict[str, Any]) -> bool:
+        markdown = result["content"]["markdown"]["raw"] or ""
+        return result["metadata"]["success"] and (
+            len(markdown.split()) >= self.min_words
+        )
+
+    async def run(
+        self, items: AsyncIterator, result: Callable[[Any], Dict] = lambda item: item
+    ) -> AsyncIterator:
+        """
+        Yield items until the deadline passes or first_k good pages arrived.
+
+        Stopping closes `items`, which cancels the pages still in flight.
+        """
+        loop = asyncio.get_running_loop()
+        end = None if self.deadline is None else loop.time() + self.deadline
+        try:
+            while self.first_k is None or self.good < self.first_k:
+                timeout = None if end is None else max(0.0, end - loop.time())
+                try:
+                    item = await asyncio.wait_for(items.__anext__(), timeout)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    self.timed_out = True
+                    return
+                if self.first_k is not None and self.is_good(result(item)):
+                    self.good += 1
+                yield item
+        finally:
+            await items.aclose()
+
+
+async def _as_async_iterable(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
 async def test_scrape_many():
     """Test the scrape_many functionality with and without batching."""
     # Initialize the scraper
@@ -1,26 +1,88 @@
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
-import re
 import numpy as np
-import os
-import requests
-import json
+import asyncio
+import threading
 from urllib.parse import urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from rank_bm25 import BM25Okapi
+
+from core.bm25 import BM25Scorer, IncrementalBM25Index, min_max_normalize
+from core.cache import SearchCache
+from core.dedup import Deduplicator
+from core.serper import CircuitOpenError, SerperClient
+from core.singleflight import Abandoned, SingleFlight
+from core.tokenizer import Tokenizer
 
 load_dotenv()
 
 
 class Search:
 
-    def __init__(self, main_query_exclusions: List[str]):
-        self.serper_endpoint = os.getenv("SERPER_ENDPOINT")
-        self.serper_api_key = os.getenv("SERPER_API_KEY")
+    # Process-wide registry of Serper requests in flight
+    _flights = SingleFlight()
+
+    # Streamed results are passed through unscored until the BM25 index
+    # behind them holds this many snippets
+    min_scoring_docs = 20
+
+    # Background loop that serves the synchronous wrappers
+    _sync_loop: Optional[asyncio.AbstractEventLoop] = None
+    _sync_lock = threading.Lock()
+
+    def __init__(
+        self,
+        main_query_exclusions: List[str],
+        use_cache: bool = True,
+        cache: Optional[SearchCache] = None,
+        max_concurrency: int = 10,
+        request_timeout: float = 10.0,
+        overall_timeout: Optional[float] = 30.0,
+        batch_size: int = 20,
+        use_session_index: bool = True,
+        index: Optional[IncrementalBM25Index] = None,
+        client: Optional[SerperClient] = None,
+    ):
+        # Retries, rate limiting and the circuit breaker are process-wide
+        self.client = client or SerperClient.shared()
+        self.serper_endpoint = self.client.endpoint
+        self.serper_api_key = self.client.api_key
         self.bm25 = None
+        self.tokenizer = Tokenizer.shared()
         self.main_query_exclusions = main_query_exclusions
+        # Responses are shared process-wide unless a dedicated cache is given
+        self.cache = (cache or SearchCache.shared()) if use_cache else None
+        # BM25 statistics accumulated across every query in the process
+        self.index = (
+            (index or IncrementalBM25Index.shared()) if use_session_index else None
+        )
+        # Per-instance statistics for streaming when the session index is off
+        self._stream_index = IncrementalBM25Index(max_docs=1_000)
+
+        # Async engine configuration
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.overall_timeout = overall_timeout
+        # Generated queries are packed into Serper batch requests of this size
+        # (0 disables batching and sends one request per query)
+        self.batch_size = batch_size
+        # Queries that missed the deadline in the last arun_all_searches call
+        self.timed_out_queries: List[str] = []
+        # Duplicates dropped (i.e. scrapes saved) in the last dedup stage
+        self.duplicates_removed = 0
+
+    @classmethod
+    def _run_sync(cls, coro):
+        """Run a coroutine on the shared background loop and wait for it."""
+        with cls._sync_lock:
+            if cls._sync_loop is None:
+                cls._sync_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=cls._sync_loop.run_forever,
+                    name="search-sync-loop",
+                    daemon=True,
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, cls._sync_loop).result()
 
     @staticmethod
     def get_domain_name(url: str) -> str:
@@ -42,54 +104,187 @@ class Search:
         self, query: str, num_results: int = 5, apply_exclusions: bool = False
     ) -> List[Dict]:
         """Execute a single search query and optionally filter results"""
-        payload = json.dumps({"q": query, "num": num_results})
-        headers = {
-            "x-api-key": self.serper_api_key,
-            "Content-Type": "application/json",
-        }
+        return self._run_sync(
+            self._aexecute_search(query, num_results, apply_exclusions)
+        )
+
+    async def _aexecute_search(
+        self, query: str, num_results: int = 5, apply_exclusions: bool = False
+    ) -> List[Dict]:
+        """Async counterpart of _execute_search using the pooled HTTP client"""
+        if self.cache is not None:
+            cached = self.cache.get(
+                query, num_results, self._exclusions(apply_exclusions)
+            )
+            if cached is not None:
+                return cached
+        return await self._afetch_shared(query, num_results, apply_exclusions)
+
+    async def _afetch_shared(
+        self, query: str, num_results: int, apply_exclusions: bool
+    ) -> List[Dict]:
+        """Fetch a query missing from the cache, sharing identical requests"""
+        # Identical searches already in flight anywhere in the process are shared
+        results = await self._flights.do(
+            self._flight_key(query, num_results, apply_exclusions),
+            lambda: self._afetch_search(query, num_results, apply_exclusions),
+        )
+        return self._copy_results(results)
 
+    async def _afetch_search(
+        self, query: str, num_results: int, apply_exclusions: bool
+    ) -> List[Dict]:
+        """Send one query to Serper (no cache lookup, no coalescing)"""
         try:
-            response = requests.post(
-                self.serper_endpoint, headers=headers, data=payload
+            response_json = await self.client.post(
+                {"q": query, "num": num_results}, timeout=self.request_timeout
+            )
+            return self._finalize_results(
+                query, response_json, num_results, apply_exclusions
             )
-            response.raise_for_status()
-            results = response.json().get("organic", [])
-
-            if apply_exclusions:
-                # Filter out results from excluded domains (only for main query)
-                filtered_results = [
-                    result
-                    for result in results
-                    if self.get_domain_name(result.get("link", ""))
-                    not in self.main_query_exclusions
-                ]
-                return filtered_results[:num_results]
-            return results[:num_results]
         except Exception as e:
-            print(f"Error searching for '{query}': {e}")
-            return []
+            return self._fallback_results(query, num_results, apply_exclusions, e)
+
+    def _fallback_results(
+        self, query: str, num_results: int, apply_exclusions: bool, error: Exception
+    ) -> List[Dict]:
+        """Serve expired cached results while Serper is failing, else nothing"""
+        if self.cache is not None:
+            stale = self.cache.get(
+                query,
+                num_results,
+                self._exclusions(apply_exclusions),
+                allow_stale=True,
+            )
+            if stale is not None:
+                print(f"Serving stale results for '{query}': {error}")
+                return stale
+        print(f"Error searching for '{query}': {error}")
+        return []
+
+    def _exclusions(self, apply_exclusions: bool) -> Optional[Tuple[str, ...]]:
+        """Domains filtered out of a query's results (None if not filtered)"""
+        if not apply_exclusions:
+            return None
+        return tuple(sorted(set(self.main_query_exclusions or ())))
+
+    def _flight_key(self, query: str, num_results: int, apply_exclusions: bool):
+        exclusions = self._exclusions(apply_exclusions)
+        return (self.serper_endpoint, query, num_results, exclusions)
+
+    @staticmethod
+    def _copy_results(results: List[Dict]) -> List[Dict]:
+        """Give each caller its own result dicts (filtering annotates them)"""
+        return [dict(result) for result in results]
+
+    async def _aexecute_batch(
+        self, queries: List[Tuple[str, int, bool]]
+    ) -> List[List[Dict]]:
+        """
+        Execute several queries in a single Serper batch request.
+
+        Args:
+            queries: (query, num_results, apply_exclusions) tuples
+
+        Returns:
+            One result list per query, in input order. Cached queries and
+            queries already in flight elsewhere are not sent; if the batch
+            request fails, the remaining queries fall back to individual
+            requests.
+        """
+        results: List[Optional[List[Dict]]] = [None] * len(queries)
+        if self.cache is not None:
+            for i, (query, num_results, apply_exclusions) in enumerate(queries):
+                results[i] = self.cache.get(
+                    query, num_results, self._exclusions(apply_exclusions)
+                )
+
+        missing = [i for i, res in enumerate(results) if res is None]
+        if len(missing) == 1:
+            # Already looked up (and counted) in the cache above
+            results[missing[0]] = await self._afetch_shared(*queries[missing[0]])
+            missing = []
+
+        # Claim every missing query; only those we lead go into the batch
+        keys = {i: self._flight_key(*queries[i]) for i in missing}
+        claims = {i: self._flights.claim(keys[i]) for i in missing}
+        leading = [i for i in missing if claims[i][1]]
+        try:
+            if leading:
+                fetched = await self._afetch_batch(queries, leading)
+                for i, res in zip(leading, fetched):
+                    self._flights.resolve(keys[i], claims[i][0], res)
+
+            for i in missing:
+                try:
+                    shared = await self._flights.wait(keys[i], claims[i][0])
+                    results[i] = self._copy_results(shared)
+                except Abandoned:
+                    results[i] = await self._afetch_shared(*queries[i])
+        finally:
+            # Let followers retry if we were cancelled before publishing
+            for i in leading:
+                if not claims[i][0].future.done():
+                    self._flights.abandon(keys[i], claims[i][0])
+
+        return results
+
+    async def _afetch_batch(
+        self, queries: List[Tuple[str, int, bool]], indices: List[int]
+    ) -> List[List[Dict]]:
+        """Send queries[indices] as one Serper batch request"""
+        payload = [{"q": queries[i][0], "num": queries[i][1]} for i in indices]
+        try:
+            responses = await self.client.post(payload, timeout=self.request_timeout)
+            if not isinstance(responses, list) or len(responses) != len(indices):
+                raise ValueError("batch response does not match the request")
+
+            return [
+                self._finalize_results(queries[i][0], response_json, *queries[i][1:])
+                for i, response_json in zip(indices, responses)
+            ]
+        except CircuitOpenError as e:
+            return [self._fallback_results(*queries[i], e) for i in indices]
+        except Exception as e:
+            print(f"Batch search failed ({e}), falling back to single queries")
+            return await asyncio.gather(
+                *(self._afetch_search(*queries[i]) for i in indices)
+            )
+
+    def _finalize_results(
+        self,
+        query: str,
+        response_json: Dict,
+        num_results: int,
+        apply_exclusions: bool,
+    ) -> List[Dict]:
+        """Apply exclusions and truncation to a Serper response, then cache it"""
+        results = response_json.get("organic", [])
+
+        if apply_exclusions:
+            # Filter out results from excluded domains (only for main query)
+            results = [
+                result
+                for result in results
+                if self.get_domain_name(result.get("link", ""))
+                not in self.main_query_exclusions
+            ]
+        results = results[:num_results]
+
+        if self.cache is not None:
+            self.cache.set(
+                query, num_results, self._exclusions(apply_exclusions), results
+            )
+        return results
 
     def _tokenize(self, text: str) -> List[str]:
         """Improved tokenizer that keeps key phrases like 'Bullet 350'"""
-        # Lowercase and split into words
-        words = re.findall(r"\w+", text.lower())
-
-        # Merge numbers with preceding words (e.g., "Bullet 350" -> "bullet_350")
-        tokens = []
-        i = 0
-        while i < len(words):
-            if i + 1 < len(words) and words[i + 1].isdigit():
-                tokens.append(f"{words[i]}_{words[i+1]}")
-                i += 2
-            else:
-                tokens.append(words[i])
-                i += 1
-        return tokens
+        return self.tokenizer(text)
 
     def _init_bm25(self, corpus: List[str]):
         """Initialize BM25 with given corpus"""
-        tokenized_corpus = [self._tokenize(doc) for doc in corpus]
-        self.bm25 = BM25Okapi(tokenized_corpus)
+        tokenized_corpus = self.tokenizer.tokenize_many(corpus)
+        self.bm25 = BM25Scorer.from_tokenized(tokenized_corpus)
 
     def _calculate_relevance(
         self,
@@ -101,30 +296,21 @@ class Search:
         if not corpus:
             return 0.0
 
-        # Initialize BM25 with the full corpus
-        tokenized_corpus = [self._tokenize(doc) for doc in corpus]
-        self.bm25 = BM25Okapi(tokenized_corpus)
+        return self._calculate_relevances(query, corpus)[corpus.index(text)]
 
-        tokenized_text = self._tokenize(text)
+    def _calculate_relevances(self, query: str, corpus: List[str]) -> List[float]:
+        """Min-max normalized BM25 scores of every document in the corpus"""
         tokenized_query = self._tokenize(query)
+        if not corpus or not tokenized_query:
+            return [0.0] * len(corpus)
 
-        if not tokenized_query:
-            return 0.0
-
-        # Get raw BM25 score
-        doc_index = corpus.index(text)  # Find position in corpus
-        raw_score = self.bm25.get_scores(tokenized_query)[doc_index]
-
-        # Normalize to 0-1 range (min-max scaling)
-        all_scores = self.bm25.get_scores(tokenized_query)
-        if max(all_scores) - min(all_scores) > 0:
-            normalized_score = (raw_score - min(all_scores)) / (
-                max(all_scores) - min(all_scores)
-            )
+        # Build the index once and score every document in a single pass
+        if self.index is not None:
+            tokenized_corpus = self.index.add_texts(corpus, self.tokenizer)
+            self.bm25 = self.index.scorer(tokenized_corpus)
         else:
-            normalized_score = 0.0  # Avoid division by zero
-
-        return float(normalized_score)
+            self._init_bm25(corpus)
+        return min_max_normalize(self.bm25.get_scores(tokenized_query)).tolist()
 
     def _filter_results(
         self,
@@ -136,28 +322,11 @@ class Search:
         # Combine title + snippet for each result (snippet adds context)
         texts = [f"{res.get('title', '')} {res.get('snippet', '')}" for res in results]
 
-        # Initialize BM25 with all titles
-        tokenized_corpus = [self._tokenize(text) for text in texts]
-        self.bm25 = BM25Okapi(tokenized_corpus)
-
-        tokenized_query = self._tokenize(query)
-        all_scores = self.bm25.get_scores(tokenized_query)
-
         # Normalize scores to 0-1 range (min-max scaling)
-        if len(all_scores) > 0:
-            max_score = max(all_scores)
-            min_score_bm25 = min(all_scores)
-            score_range = max_score - min_score_bm25
-        else:
-            score_range = 0
+        all_scores = self._calculate_relevances(query, texts)
 
         scored_results = []
-        for i, res in enumerate(results):
-            if score_range > 0:
-                normalized_score = (all_scores[i] - min_score_bm25) / score_range
-            else:
-                normalized_score = 0.0
-
+        for res, normalized_score in zip(results, all_scores):
             print(f"Title: {res.get('title', '')}\nScore: {normalized_score:.4f}")
             if normalized_score >= min_score:
                 res["relevance_score"] = round(normalized_score, 2)
@@ -166,6 +335,112 @@ class Search:
         # Sort by score (highest first)
         return sorted(scored_results, key=lambda x: x["relevance_score"], reverse=True)
 
+    def deduplicate_results(
+        self, results: List[Dict], max_distance: int = 3, min_tokens: int = 4
+    ) -> List[Dict]:
+        """
+        Drop results that would make the scraper load the same page twice.
+
+        Args:
+            results: Search results in priority order (earlier results win)
+            max_distance: Max SimHash Hamming distance for near-duplicate
+                title + snippet pairs
+            min_tokens: Texts shorter than this are only deduplicated by URL
+
+        Returns:
+            List[Dict]: Results with unique canonical URLs and no near-duplicate
+            title/snippet pairs. The number dropped is kept in
+            self.duplicates_removed.
+        """
+        deduplicator = Deduplicator(self._tokenize, max_distance, min_tokens)
+        unique_results = deduplicator.filter(results)
+
+        self.duplicates_removed = deduplicator.duplicates
+        if self.duplicates_removed:
+            print(f"Dedup saved {self.duplicates_removed} duplicate scrapes")
+        return unique_results
+
+    def _score_incremental(
+        self, results: List[Dict], query: str, min_score: float
+    ) -> List[Dict]:
+        """
+        Score a group of results as soon as it arrives.
+
+        Min-max scaling needs the full result set, so streamed results are
+        instead scored against the session index and divided by the BM25
+        upper bound of the whole query (every query term saturated, under
+        the accumulated IDF), which is the same for every group. Until the
+        index holds min_scoring_docs snippets its IDF is meaningless, so
+        results pass through unscored.
+        """
+        index = self.index if self.index is not None else self._stream_index
+        texts = [f"{res.get('title', '')} {res.get('snippet', '')}" for res in results]
+        tokenized_query = self._tokenize(query)
+        if not texts or not tokenized_query:
+            return []
+
+        scorer = index.scorer(index.add_texts(texts, self.tokenizer))
+        if index.n_docs < self.min_scoring_docs:
+            return results
+        raw_scores = scorer.get_scores(tokenized_query)
+        upper_bound = index.idf(tokenized_query).clip(min=0).sum() * (index.k1 + 1)
+
+        scored_results = []
+        for res, raw_score in zip(results, raw_scores):
+            score = float(raw_score / upper_bound) if upper_bound > 0 else 0.0
+            print(f"Title: {res.get('title', '')}\nScore: {score:.4f}")
+            if score >= min_score:
+                res["relevance_score"] = round(score, 2)
+                scored_results.append(res)
+        return scored_results
+
+    def _start_fanout(
+        self,
+        main_query: str,
+        generated_queries: List[str],
+        max_main_results: int,
+        max_generated_results: int,
+        max_concurrency: Optional[int],
+    ) -> Tuple[List[List[Tuple[str, int, bool]]], List[asyncio.Task]]:
+        """Start every search at once; returns the query batches and their tasks"""
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def limited_batch(batch: List[Tuple[str, int, bool]]):
+            async with semaphore:
+                if len(batch) == 1:
+                    return [await self._aexecute_search(*batch[0])]
+                return await self._aexecute_batch(batch)
+
+        # Main and generated queries go out as a single fan-out, so the main
+        # query no longer adds a full round trip in front of the others
+        generated = [
+            (query, max_generated_results, False) for query in generated_queries
+        ]
+        size = self.batch_size or 1
+        batches = [[(main_query, max_main_results, True)]] + [
+            generated[i : i + size] for i in range(0, len(generated), size)
+        ]
+        tasks = [asyncio.create_task(limited_batch(batch)) for batch in batches]
+        return batches, tasks
+
+    def _record_timeouts(
+        self,
+        batches: List[List[Tuple[str, int, bool]]],
+        tasks: List[asyncio.Task],
+        timeout: Optional[float],
+    ):
+        """Cancel unfinished searches and remember which queries they were"""
+        self.timed_out_queries = []
+        for batch, task in zip(batches, tasks):
+            if not task.done():
+                task.cancel()
+                self.timed_out_queries.extend(query[0] for query in batch)
+        if self.timed_out_queries:
+            print(
+                f"{len(self.timed_out_queries)} queries timed out after {timeout}s: "
+                f"{self.timed_out_queries}"
+            )
+
     def run_all_searches(
         self,
         main_query: str,
@@ -174,48 +449,80 @@ class Search:
         min_relevance: float = 0.1,
         max_main_results: int = 5,
         max_generated_results: int = 2,
-    ) -> List[Dict]:  # Now returns List[Dict] instead of Dict[str, List[Dict]]
+        dedupe: bool = True,
+    ) -> List[Dict]:
+        """
+        Synchronous wrapper around arun_all_searches.
+
+        Safe to call from inside a running event loop: the searches run on a
+        shared background loop, so the pooled connections stay warm.
+        """
+        return self._run_sync(
+            self.arun_all_searches(
+                main_query,
+                generated_queries,
+                filter=filter,
+                min_relevance=min_relevance,
+                max_main_results=max_main_results,
+                max_generated_results=max_generated_results,
+                dedupe=dedupe,
+            )
+        )
+
+    async def arun_all_searches(
+        self,
+        main_query: str,
+        generated_queries: List[str],
+        filter: bool = True,
+        min_relevance: float = 0.1,
+        max_main_results: int = 5,
+        max_generated_results: int = 2,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        dedupe: bool = True,
+    ) -> List[Dict]:
         """
         Execute all searches and return COMBINED results (main + generated queries).
 
         Args:
             main_query: Primary search query
-            trusted_sources: Whether to use predefined sources
-            external_sources: Additional domains to include
+            generated_queries: Queries produced by QueryGenerator.get_queries
             filter: Whether to apply relevance filtering
             min_relevance: Minimum BM25 score threshold (0-1)
             max_main_results: Max results from main query
             max_generated_results: Max results per generated query
+            max_concurrency: Max in-flight Serper requests (default: self.max_concurrency)
+            timeout: Overall time budget in seconds (default: self.overall_timeout)
+            dedupe: Drop duplicate URLs and near-duplicate snippets before scoring
 
         Returns:
             List[Dict]: Combined results from all queries, sorted by relevance.
+            Queries still pending at the deadline are cancelled and recorded
+            in self.timed_out_queries.
         """
-        # Execute main query
-        raw_main_results = self._execute_search(
-            query=main_query,
-            num_results=max_main_results,  # Get extra for filtering
-            apply_exclusions=True,
+        timeout = self.overall_timeout if timeout is None else timeout
+        batches, tasks = self._start_fanout(
+            main_query,
+            generated_queries,
+            max_main_results,
+            max_generated_results,
+            max_concurrency,
         )
-        raw_generated_results = []
+        done, _ = await asyncio.wait(tasks, timeout=timeout)
+        self._record_timeouts(batches, tasks, timeout)
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                executor.submit(
-                    self._execute_search,
-                    query=query,
-                    num_results=max_generated_results,
-                    apply_exclusions=False,
-                ): query
-                for query in generated_queries
-            }
-            for future in as_completed(futures):
-                try:
-                    raw_generated_results.extend(future.result())
-                except Exception as e:
-                    print(f"Error processing query: {str(e)}")
+        # Keep main results first and the generated query order stable
+        raw_main_results = tasks[0].result()[0] if tasks[0] in done else []
+        raw_generated_results = []
+        for task in tasks[1:]:
+            if task in done:
+                for results in task.result():
+                    raw_generated_results.extend(results)
 
         # Combine all results
         all_results = raw_main_results + raw_generated_results
+        if dedupe:
+            all_results = self.deduplicate_results(all_results)
 
         if filter:
             filtered_results = self._filter_results(
@@ -226,10 +533,68 @@ class Search:
             # Return raw results (main queries first)
             return all_results
 
+    async def astream_searches(
+        self,
+        main_query: str,
+        generated_queries: List[str],
+        filter: bool = True,
+        min_relevance: float = 0.1,
+        max_main_results: int = 5,
+        max_generated_results: int = 2,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        dedupe: bool = True,
+    ) -> AsyncIterator[Dict]:
+        """
+        Streaming counterpart of arun_all_searches.
+
+        Results are deduplicated, scored (see _score_incremental) and yielded
+        as soon as the Serper request that produced them returns, so a
+        consumer such as the scraper can start before the slowest query
+        finishes. Arguments match arun_all_searches.
+        """
+        timeout = self.overall_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        deduplicator = Deduplicator(self._tokenize)
+
+        batches, tasks = self._start_fanout(
+            main_query,
+            generated_queries,
+            max_main_results,
+            max_generated_results,
+            max_concurrency,
+        )
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    results = [res for group in task.result() for res in group]
+                    if dedupe:
+                        results = deduplicator.filter(results)
+                    if filter:
+                        results = self._score_incremental(
+                            results, main_query, min_relevance
+                        )
+                    for res in results:
+                        yield res
+        finally:
+            self._record_timeouts(batches, tasks, timeout)
+            self.duplicates_removed = deduplicator.duplicates
+            if self.duplicates_removed:
+                print(f"Dedup saved {self.duplicates_removed} duplicate scrapes")
+
 
 if __name__ == "__main__":
 
-    from query_generator import QueryGenerator, Persona
+    # Run from src/ with: python -m core.search
+    from core.query_generator import QueryGenerator, Persona
 
     persona = Persona("crypto_expert")
     query_gen = QueryGenerator(persona)
@@ -248,3 +613,6 @@ if __name__ == "__main__":
 
     for i, result in enumerate(results):
         print(f"{i}. {result.get('title')} - {result.get('link')}")
+
+    print("Cache stats:", search.cache.stats())
+    print("Serper client stats:", search.client.stats())
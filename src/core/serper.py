@@ -0,0 +1,306 @@
+from typing import Any, Dict, Optional, Union
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+
+import httpx
+
+
+class CircuitOpenError(Exception):
+    """Raised without touching the network while the breaker is open."""
+
+
+class SerperHTTPError(Exception):
+    """Serper answered with a non-retryable error, or retries ran out."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every event loop in the process.
+
+    Callers reserve tokens up front and sleep until the reservation is
+    covered, so waiting requests are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (requests per second of the plan)
+            capacity: Burst size (defaults to one second worth of tokens)
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens now and return how long to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """Wait until tokens are available. Returns the time spent waiting."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed -> open after `failure_threshold` failures in a row; open ->
+    half_open once `reset_timeout` has passed, letting one trial request
+    through; the trial closes the breaker on success or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent right now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def cancel_trial(self):
+        """Release a half-open trial that ended without a verdict."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class SerperClient:
+    """
+    Resilient Serper HTTP client.
+
+    Features:
+    - One pooled keep-alive httpx.AsyncClient per event loop
+    - Retries with full-jitter exponential backoff on 429, 5xx and transport
+      errors, honouring Retry-After
+    - Token-bucket rate limiting sized to the Serper plan
+    - Circuit breaker that fails fast while the endpoint is unhealthy
+    - Counters for requests, retries, throttling and breaker state
+    """
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+        rate_limit: float = 50.0,
+        burst: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_connections: int = 20,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            endpoint: Serper URL (default: SERPER_ENDPOINT)
+            api_key: Serper key (default: SERPER_API_KEY)
+            rate_limit: Queries per second allowed by the plan
+            burst: Token bucket capacity (default: rate_limit)
+            max_retries: Retries after the first attempt
+            backoff_base: First backoff ceiling in seconds
+            backoff_max: Largest backoff ceiling in seconds
+            failure_threshold: Consecutive failed requests that open the breaker
+            reset_timeout: Seconds the breaker stays open before a trial request
+            max_connections: Size of each keep-alive connection pool
+            timeout: Default per-attempt timeout in seconds
+        """
+        self.endpoint = endpoint or os.getenv("SERPER_ENDPOINT")
+        self.api_key = api_key or os.getenv("SERPER_API_KEY")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self.limiter = TokenBucket(rate_limit, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._clients_lock = threading.Lock()
+
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0  # 429 responses from Serper
+        self.throttled = 0  # Requests delayed by the local token bucket
+        self.breaker_rejections = 0
+        self.failures = 0
+
+    @classmethod
+    def shared(cls) -> "SerperClient":
+        """Return the process-wide client, configured from the environment."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    rate_limit=float(os.getenv("SERPER_RATE_LIMIT", "50")),
+                    burst=float(os.getenv("SERPER_BURST", "0")) or None,
+                )
+            return cls._shared
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                    timeout=self.timeout,
+                )
+                self._clients[loop] = client
+            return client
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, or the server's Retry-After."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass  # HTTP-date form; fall back to our own backoff
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    async def post(
+        self, payload: Union[Dict, list], timeout: Optional[float] = None
+    ) -> Any:
+        """
+        POST a query (dict) or batch (list) payload and return the JSON body.
+
+        Raises:
+            CircuitOpenError: The breaker is open; nothing was sent
+            SerperHTTPError: Non-retryable status, or retries exhausted
+            httpx.TransportError: Network failure after the last retry
+        """
+        if not self.breaker.allow():
+            self.breaker_rejections += 1
+            raise CircuitOpenError("Serper circuit breaker is open")
+
+        # Every outcome settles the breaker, so a half-open trial that ends
+        # in an unexpected error cannot leave it half-open forever
+        try:
+            result = await self._post_with_retries(payload, timeout)
+        except asyncio.CancelledError:
+            self.breaker.cancel_trial()
+            raise
+        except SerperHTTPError as e:
+            if e.status_code in self.RETRY_STATUS_CODES:
+                self.breaker.record_failure()
+            else:
+                # Our request is wrong; the endpoint itself is healthy
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _post_with_retries(
+        self, payload: Union[Dict, list], timeout: Optional[float]
+    ) -> Any:
+        tokens = len(payload) if isinstance(payload, list) else 1
+        headers = {"x-api-key": self.api_key, "Content-Type": "application/json"}
+
+        for attempt in range(self.max_retries + 1):
+            if await self.limiter.acquire(tokens):
+                self.throttled += 1
+
+            self.requests += 1
+            error: Optional[Exception] = None
+            retry_after = None
+            try:
+                response = await self._get_async_client().post(
+                    self.endpoint,
+                    headers=headers,
+                    json=payload,
+                    timeout=timeout or self.timeout,
+                )
+            except httpx.TransportError as e:
+                error = e
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                error = SerperHTTPError(response.status_code, response.text[:200])
+                if response.status_code == 429:
+                    self.rate_limited += 1
+                    retry_after = response.headers.get("Retry-After")
+                if response.status_code not in self.RETRY_STATUS_CODES:
+                    raise error
+
+            if attempt == self.max_retries:
+                break
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        self.failures += 1
+        raise error
+
+    def stats(self) -> Dict[str, Union[int, str]]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "throttled": self.throttled,
+            "breaker_rejections": self.breaker_rejections,
+            "failures": self.failures,
+            "breaker_state": self.breaker.state,
+        }
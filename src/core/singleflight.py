@@ -0,0 +1,155 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import concurrent.futures
+import threading
+
+
+class Abandoned(Exception):
+    """The leader of an in-flight call went away before producing a result."""
+
+
+class Call:
+    """One in-flight unit of work shared by every caller with the same key."""
+
+    def __init__(self):
+        # A thread-safe future, so callers on other event loops (e.g. other
+        # Streamlit sessions) can wait on it too
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class SingleFlight:
+    """
+    Registry that coalesces identical in-flight requests.
+
+    The first caller for a key becomes the leader and does the work; callers
+    arriving while it is in flight wait for the same result instead of
+    repeating it. Errors are delivered to every waiter and never cached. A
+    waiter that is cancelled only stops waiting; the work itself is
+    cancelled once nobody is waiting for it any more. If the leader goes away
+    (its event loop shuts down, or it abandons a claimed key), the remaining
+    waiters retry and one of them becomes the new leader.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def claim(self, key: Hashable) -> Tuple[Call, bool]:
+        """Join the in-flight call for key. Returns (call, is_leader)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+            call.waiters += 1
+            return call, leader
+
+    def resolve(
+        self,
+        key: Hashable,
+        call: Call,
+        result: Any = None,
+        exception: Optional[BaseException] = None,
+    ):
+        """Publish the leader's result (or exception) to every waiter."""
+        self._forget(key, call)
+        try:
+            if exception is not None:
+                call.future.set_exception(exception)
+            else:
+                call.future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            pass  # Already abandoned
+
+    def abandon(self, key: Hashable, call: Call):
+        """Give up a claimed call without a result; waiters will retry."""
+        self._forget(key, call)
+        call.future.cancel()
+
+    def _forget(self, key: Hashable, call: Call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    async def wait(self, key: Hashable, call: Call) -> Any:
+        """
+        Wait for a claimed call on the running loop.
+
+        Raises Abandoned if the leader gave up. Cancelling the waiting task
+        does not cancel the shared work unless it was the last waiter.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        def transfer(future: concurrent.futures.Future):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_copy_state, future, waiter)
+
+        call.future.add_done_callback(transfer)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            self._leave(key, call)
+            raise
+        finally:
+            with self._lock:
+                call.waiters -= 1
+
+    def _leave(self, key: Hashable, call: Call):
+        """Cancel the shared work if the cancelled waiter was the last one."""
+        with self._lock:
+            last = call.waiters == 1 and not call.future.done()
+        if last and call.task is not None:
+            self._forget(key, call)
+            if not call.loop.is_closed():
+                call.loop.call_soon_threadsafe(call.task.cancel)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() once per key among concurrent callers and share its result."""
+        while True:
+            call, leader = self.claim(key)
+            if leader:
+                call.loop = asyncio.get_running_loop()
+                call.task = call.loop.create_task(self._lead(key, call, fn))
+            try:
+                return await self.wait(key, call)
+            except Abandoned:
+                continue
+
+    async def _lead(self, key: Hashable, call: Call, fn):
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self.abandon(key, call)
+            raise
+        except Exception as e:
+            self.resolve(key, call, exception=e)
+        else:
+            self.resolve(key, call, result)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+def _copy_state(source: concurrent.futures.Future, waiter: asyncio.Future):
+    if waiter.done():
+        return
+    if source.cancelled():
+        waiter.set_exception(Abandoned())
+    elif source.exception() is not None:
+        waiter.set_exception(source.exception())
+    else:
+        waiter.set_result(source.result())
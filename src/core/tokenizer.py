@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import Iterable, List
+import re
+import threading
+
+# Character-class ranges of what str.isdigit() accepts but the regex \d
+# (decimal digits) does not: superscript, subscript, circled and other
+# digit forms (Unicode 14). Spelled out because scanning every code point
+# for them took ~90 ms at import, in every process that loads the tokenizer.
+_NON_DECIMAL_DIGITS = (
+    "\u00b2\u00b3\u00b9\u1369-\u1371\u19da\u2070\u2074-\u2079\u2080-\u2089"
+    "\u2460-\u2468\u2474-\u247c\u2488-\u2490\u24ea\u24f5-\u24fd\u24ff"
+    "\u2776-\u277e\u2780-\u2788\u278a-\u2792\U00010a40-\U00010a43"
+    "\U00010e60-\U00010e68\U00011052-\U0001105a\U0001f100-\U0001f10a"
+)
+
+
+class Tokenizer:
+    """
+    Memoized BM25 tokenizer that keeps key phrases like 'Bullet 350'.
+
+    Lowercases the text, splits it into words and merges a word with a
+    following all-digit word ("Bullet 350" -> "bullet_350") in a single
+    precompiled regex pass. Results are memoized in a bounded LRU keyed by
+    the text, so repeated titles, snippets and queries are tokenized once.
+    Returned lists are shared between callers and must not be mutated.
+    """
+
+    # A word, optionally followed by a separator and a word made only of
+    # digits in the str.isdigit() sense (superscripts like "²" included)
+    TOKEN_PATTERN = re.compile(
+        r"(\w+)(?:\W+([\d%s]+)(?!\w))?" % _NON_DECIMAL_DIGITS
+    )
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 65_536):
+        self.max_entries = max_entries
+        self._memo = lru_cache(maxsize=max_entries)(self._tokenize)
+
+    @classmethod
+    def shared(cls) -> "Tokenizer":
+        """Return the process-wide tokenizer."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _tokenize(self, text: str) -> List[str]:
+        return [
+            f"{word}_{number}" if number else word
+            for word, number in self.TOKEN_PATTERN.findall(text.lower())
+        ]
+
+    def __call__(self, text: str) -> List[str]:
+        return self._memo(text)
+
+    def tokenize_many(
+        self, texts: Iterable[str], memo: bool = True
+    ) -> List[List[str]]:
+        """
+        Tokenize a batch of texts, reusing memoized results.
+
+        Args:
+            texts: Texts to tokenize
+            memo: False tokenizes without reading or filling the memo, for
+                one-off texts (page passages) that would only evict the
+                titles, snippets and queries it is meant for
+        """
+        tokenize = self._memo if memo else self._tokenize
+        return [tokenize(text) for text in texts]
+
+    def cache_info(self):
+        """Memo hit/miss statistics (functools.lru_cache CacheInfo)."""
+        return self._memo.cache_info()
+
+    def clear(self):
+        self._memo.cache_clear()
@@ -1,6 +1,8 @@
 from core.search import Search
-from core.llm import LLM
+from core.llm import AsyncLLM
 from core.scrape import Crawl4AIScraper
+from core.context import ContextBuilder
+from core.page_buffer import PageBuffer
 import asyncio
 import json
 from core.query_generator import Persona, QueryGenerator
@@ -10,6 +12,8 @@ async def web_search(
     query: str,
     persona: Persona,
     custom_sources: list = None,
+    scraper: Crawl4AIScraper = None,
+    buffer: PageBuffer = None,
 ) -> list:
     """Perform web search and return scraped data"""
     query_generator = QueryGenerator(persona)
@@ -17,34 +21,51 @@ async def web_search(
         query, trusted_sources=True, external_sources=custom_sources
     )
     search = Search(query_generator.main_query_exclusions)
-    search_results = search.run_all_searches(
-        query,
-        generated_queries,
-        min_relevance=0.1,
+    scraper = scraper or Crawl4AIScraper()
+
+    async def links():
+        # Links flow into the scraper as each search returns
+        async for result in search.astream_searches(
+            query,
+            generated_queries,
+            min_relevance=0.1,
+        ):
+            yield result["link"]
+
+    # Only keep what the LLM prompt uses; HTML and resources are dropped per page
+    pages = scraper.scrape_stream(
+        links(),
+        check_robots_txt=True,
+        fields=("metadata.url", "content.markdown.raw"),
+        # A hanging page must not hold up the answer
+        deadline=15.0,
+        buffer=buffer,
     )
-    links = [r["link"] for r in search_results]
-    scraper = Crawl4AIScraper()
-    scraped_data = await scraper.scrape_many(links)
+    # Pages robots.txt disallows (or that failed) come back without markdown
+    scraped_data = [page async for page in pages if page["content"]["markdown"]["raw"]]
     return scraped_data
 
 
-async def process_tool_call(tool_call, sources: list, persona: Persona) -> str:
+async def process_tool_call(
+    tool_call, sources: list, persona: Persona, scraper: Crawl4AIScraper = None
+) -> str:
     """Handle web search tool call and return formatted results"""
     if tool_call.function.name == "web_search":
         args = json.loads(tool_call.function.arguments)
         query = args["query"]
 
         print(f"\n🔍 Performing web search: {query}...")
-        scraped_data = await web_search(query, persona, sources)
-
-        if not scraped_data:
+        # Large pages live in a memory-mapped file until the context is built
+        with PageBuffer() as buffer:
+            scraped_data = await web_search(query, persona, sources, scraper, buffer)
+            if not scraped_data:
+                return "No relevant results found for this query."
+
+            # Only the passages most relevant to the query go into the prompt
+            context = ContextBuilder.shared().build(query, scraped_data)
+        if not context:
             return "No relevant results found for this query."
-
-        # Format the search results into the prompt format
-        results_str = f"Search Results for '{query}':\n\n" + "\n\n".join(
-            f"Source: {r['metadata']['url']}\nContent: {r['content']['markdown']['raw']}"
-            for r in scraped_data
-        )
+        results_str = f"Search Results for '{query}':\n\n" + context
 
         print("results_str:", results_str)
 
@@ -56,7 +77,7 @@ async def process_tool_call(tool_call, sources: list, persona: Persona) -> str:
 async def chat():
 
     persona = Persona("finance_expert")
-    llm = LLM(enable_tools=True, system_prompt=persona.prompt)
+    llm = AsyncLLM(enable_tools=True, system_prompt=persona.prompt)
     sources = [
         # "bikewale.com",
         # "https://www.zigwheels.com/bike-comparison/",
@@ -64,6 +85,9 @@ async def chat():
 
     # Set up system prompt
 
+    # Browsers stay warm for the whole session instead of launching per question
+    scraper = await Crawl4AIScraper().start()
+
     print("Research Assistant ready. I'll perform web searches when needed.")
     print("Type 'quit' to exit.\n")
 
@@ -79,27 +103,21 @@ async def chat():
                 continue
 
             # Get initial response (may include tool calls)
-            response = llm.run(user_input)
+            response = await llm.run(user_input)
 
             # Handle tool calls if present
-            if hasattr(response, "tool_calls") and response.tool_calls:
-                print("executing function call..")
-                search_results_prompt = ""
-                tool_call = response.tool_calls[
-                    0
-                ]  # Assuming single tool call for simplicity
-                # Process each tool call and collect results
-                tool_result = await process_tool_call(tool_call, sources, persona)
-                search_results_prompt += f"\n\n{tool_result}"
-
-                # Create a new prompt combining original query and search results
-                combined_prompt = f"Original Query: {user_input}\n\n{search_results_prompt}\n\nPlease analyze these results and answer the query."
-                llm.add_message("system", combined_prompt)
-
-                print("combined_prompt:", combined_prompt)
-
-                # Get final response using the combined prompt
-                response = llm.run()
+            if response.tool_calls:
+                print(f"executing {len(response.tool_calls)} function call(s)..")
+                # All searches run at once; results go back as tool messages
+                await llm.run_tool_calls(
+                    response,
+                    lambda tool_call: process_tool_call(
+                        tool_call, sources, persona, scraper
+                    ),
+                )
+
+                # Get final response from the search results
+                response = await llm.run(tool_choice="none")
 
             # Add assistant response to history and print it
             llm.add_message("assistant", response.content)
@@ -113,6 +131,8 @@ async def chat():
             print(f"\nAn error occurred: {e}")
             continue
 
+    await scraper.close()
+
 
 if __name__ == "__main__":
     asyncio.run(chat())
@@ -0,0 +1,136 @@
+import random
+
+import numpy as np
+import pytest
+from rank_bm25 import BM25Okapi
+
+from core.bm25 import (
+    BM25Scorer,
+    IncrementalBM25Index,
+    TermDocMatrix,
+    min_max_normalize,
+    okapi_idf,
+)
+
+VOCABULARY = ["bullet_350", "royal", "enfield", "price", "india", "bike", "ride"]
+
+
+def random_corpus(rng, n_docs):
+    return [
+        [rng.choice(VOCABULARY) for _ in range(rng.randint(0, 12))]
+        for _ in range(n_docs)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_scores_match_rank_bm25(seed):
+    rng = random.Random(seed)
+    corpus = random_corpus(rng, rng.randint(1, 40))
+    queries = [random_corpus(rng, 1)[0] + ["unseen"] for _ in range(4)]
+
+    reference = BM25Okapi(corpus)
+    scorer = BM25Scorer.from_tokenized(corpus)
+    for query in queries:
+        np.testing.assert_allclose(
+            scorer.get_scores(query), reference.get_scores(query), atol=1e-9
+        )
+    np.testing.assert_allclose(
+        scorer.get_batch_scores(queries),
+        [reference.get_scores(query) for query in queries],
+        atol=1e-9,
+    )
+
+
+def test_queries_without_known_terms_score_zero():
+    scorer = BM25Scorer.from_tokenized([["royal", "enfield"], ["bike"]])
+
+    assert scorer.get_scores([]).tolist() == [0, 0]
+    assert scorer.get_scores(["unseen"]).tolist() == [0, 0]
+
+
+def test_matrix_postings_per_term():
+    matrix = TermDocMatrix.from_tokenized([["a", "b", "a"], ["b"], []])
+    a, b = matrix.vocabulary["a"], matrix.vocabulary["b"]
+
+    assert matrix.doc_len.tolist() == [3, 1, 0]
+    assert matrix.document_frequencies()[[a, b]].tolist() == [1, 2]
+    postings = matrix.doc_ids[matrix.indptr[a] : matrix.indptr[a + 1]]
+    assert postings.tolist() == [0]
+    assert matrix.tfs[matrix.indptr[a]] == 2
+
+
+def test_min_max_normalize():
+    assert min_max_normalize([2.0, 4.0, 3.0]).tolist() == [0, 1, 0.5]
+    assert min_max_normalize([1.0, 1.0]).tolist() == [0, 0]
+    assert min_max_normalize([]).tolist() == []
+
+
+def test_index_idf_follows_adds_and_removes():
+    index = IncrementalBM25Index()
+    index.add("a", ["royal", "enfield"])
+    index.add("b", ["royal", "bike"])
+    index.add("c", ["price"])
+
+    # Document frequencies of royal, enfield, bike and price
+    expected = okapi_idf(np.array([2, 1, 1, 1]), 3)[[0, 2]]
+    np.testing.assert_allclose(index.idf(["royal", "bike"]), expected)
+
+    index.remove("b")
+    assert "b" not in index and index.n_docs == 2
+    royal = okapi_idf(np.array([1, 1, 1]), 2)[0]
+    bike = np.log(2 + 0.5) - np.log(0.5)  # No longer in any document
+    np.testing.assert_allclose(index.idf(["royal", "bike"]), [royal, bike])
+
+
+def test_index_evicts_least_recently_added():
+    index = IncrementalBM25Index(max_docs=2)
+    index.add("a", ["x"])
+    index.add("b", ["y"])
+    index.add("a", ["x"])  # Refreshes a
+    index.add("c", ["z"])
+
+    assert [key in index for key in "abc"] == [True, False, True]
+
+
+def test_add_texts_tokenizes_each_text_once():
+    calls = []
+
+    def tokenizer(text):
+        calls.append(text)
+        return text.split()
+
+    index = IncrementalBM25Index()
+    assert index.add_texts(["royal enfield", "bike"], tokenizer) == [
+        ["royal", "enfield"],
+        ["bike"],
+    ]
+    index.add_texts(["bike", "price"], tokenizer)
+    assert calls == ["royal enfield", "bike", "price"]
+
+
+def test_scorer_uses_accumulated_statistics():
+    index = IncrementalBM25Index()
+    for n in range(20):
+        index.add(f"doc {n}", ["weather", "report"])
+    candidates = [["royal", "enfield", "bike"], ["weather", "bike"]]
+    index.add_texts(["royal enfield bike", "weather bike"], str.split)
+
+    scores = index.scorer(candidates).get_scores(["royal", "weather"])
+    # "royal" is rare in the index, "weather" in almost every document
+    assert scores[0] > scores[1] > 0
+
+
+def test_index_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "bm25.sqlite")
+    index = IncrementalBM25Index(db_path=db_path)
+    index.add("a", ["royal", "enfield"])
+    index.add("b", ["bike"])
+    index.remove("a")
+    index.add("c", ["bike", "price"])
+
+    reopened = IncrementalBM25Index(db_path=db_path)
+    assert reopened.n_docs == 2 and "b" in reopened and "a" not in reopened
+    np.testing.assert_allclose(
+        reopened.idf(["bike", "price", "royal"]),
+        index.idf(["bike", "price", "royal"]),
+    )
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+import core.browser_pool
+from core.browser_pool import BrowserPool
+
+
+class FakeCrawler:
+    """Stands in for AsyncWebCrawler; no browser is launched."""
+
+    def __init__(self, config=None):
+        self.config = config
+        self.ready = False
+        self.closed = False
+        self.crawler_strategy = None
+
+    async def start(self):
+        self.ready = True
+
+    async def close(self):
+        self.ready = False
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_crawler(monkeypatch):
+    monkeypatch.setattr(core.browser_pool, "AsyncWebCrawler", FakeCrawler)
+
+
+def test_acquire_requires_start():
+    async def run():
+        async with BrowserPool().acquire():
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_pages_go_to_the_least_loaded_browser():
+    async def run():
+        async with BrowserPool(num_browsers=2, contexts_per_browser=2) as pool:
+            async with pool.acquire() as first, pool.acquire() as second:
+                assert first is not second
+                assert pool.stats()["active_pages"] == 2
+            return pool.stats()
+
+    stats = asyncio.run(run())
+    assert stats["launches"] == 2 and stats["pages_served"] == 2
+
+
+def test_acquire_waits_for_a_free_context():
+    order = []
+
+    async def use(pool, name):
+        async with pool.acquire():
+            order.append(f"{name} start")
+            await asyncio.sleep(0.02)
+            order.append(f"{name} end")
+
+    async def run():
+        async with BrowserPool(num_browsers=1, contexts_per_browser=1) as pool:
+            await asyncio.gather(use(pool, "a"), use(pool, "b"))
+
+    asyncio.run(run())
+    assert order == ["a start", "a end", "b start", "b end"]
+
+
+def test_browsers_are_recycled_after_max_pages():
+    async def run():
+        async with BrowserPool(num_browsers=1, max_pages_per_browser=2) as pool:
+            crawlers = []
+            for _ in range(3):
+                async with pool.acquire() as crawler:
+                    crawlers.append(crawler)
+            return pool, crawlers
+
+    pool, crawlers = asyncio.run(run())
+    assert crawlers[0] is crawlers[1] is not crawlers[2]
+    assert crawlers[0].closed
+    assert pool.recycled == 1 and pool.launches == 2
+
+
+def test_health_check_replaces_disconnected_browsers():
+    async def run():
+        pool = BrowserPool(num_browsers=1, health_check_interval=0.01)
+        async with pool:
+            async with pool.acquire() as crawler:
+                pass
+            crawler.ready = False  # The browser process went away
+            await asyncio.sleep(0.05)
+            async with pool.acquire() as replacement:
+                return crawler, replacement, replacement.ready
+
+    crawler, replacement, ready = asyncio.run(run())
+    assert replacement is not crawler and ready
+    assert crawler.closed
+
+
+def test_close_shuts_down_every_browser():
+    async def run():
+        pool = await BrowserPool(num_browsers=3).start()
+        crawlers = [browser.crawler for browser in pool._browsers]
+        await pool.close()
+        return pool, crawlers
+
+    pool, crawlers = asyncio.run(run())
+    assert all(crawler.closed for crawler in crawlers)
+    assert pool.stats()["browsers"] == 0
@@ -0,0 +1,124 @@
+from core.context import ContextBuilder
+from core.tokenizer import Tokenizer
+
+SENTENCE = "Royal Enfield Bullet 350 prices rose again this month in India."
+
+
+def page(url, markdown):
+    return {"metadata": {"url": url}, "content": {"markdown": {"raw": markdown}}}
+
+
+def test_build_does_not_fill_tokenizer_memo():
+    tokenizer = Tokenizer()
+    builder = ContextBuilder(tokenizer=tokenizer)
+    pages = [
+        page(f"https://site{n}.example/", "\n\n".join([SENTENCE * 3] * 20))
+        for n in range(5)
+    ]
+    tokenizer("bullet 350 price")
+    before = tokenizer.cache_info().currsize
+
+    assert builder.build("bullet 350 price", pages)
+    assert tokenizer.cache_info().currsize == before
+
+
+def test_spilled_pages_are_read_in_slices():
+    from core.page_buffer import PageBuffer
+
+    markdown = "\n \n".join(
+        f"# Part {n}\n\nCafé naïve 日本 {SENTENCE} {n}" for n in range(200)
+    )
+    builder = ContextBuilder(token_budget=300)
+    builder.READ_BYTES = 101  # Cuts paragraphs and multi-byte characters
+
+    with PageBuffer(threshold=1024) as buffer:
+        spilled = buffer.spill_result(page("https://a.example/", markdown))
+        handle = spilled["content"]["markdown"]["raw"]
+        assert builder.split(handle) == builder.split(markdown)
+        assert builder.select("part 150", [spilled]) == builder.select(
+            "part 150", [page("https://a.example/", markdown)]
+        )
+
+
+def test_split_cleans_and_groups_markdown():
+    builder = ContextBuilder(passage_tokens=40, min_passage_words=3)
+    markdown = "\n\n".join(
+        [
+            "[Home](/) [News](/news) [Bikes](/bikes) [About](/about)",
+            "# Bullet 350 review",
+            "![photo](https://img.example/bullet.jpg) The engine is smooth.",
+            "Read more at https://bikes.example/bullet and [the spec sheet](/spec).",
+            "ok",
+            "## Price",
+            " ".join(["The price rose again this month."] * 8),
+        ]
+    )
+
+    passages = builder.split(markdown)
+    assert passages[0] == (
+        "# Bullet 350 review\n\nThe engine is smooth.\n\n"
+        "Read more at  and the spec sheet.\n\nok"
+    )
+    assert passages[1].startswith("## Price")
+    assert all(len(p) <= 40 * builder.CHARS_PER_TOKEN for p in passages[2:])
+    assert "Home" not in "".join(passages)
+
+
+def test_select_prefers_relevant_passages_within_the_budget():
+    # Every block below is a passage of its own, and the budget fits two
+    builder = ContextBuilder(token_budget=25, passage_tokens=15, min_passage_words=3)
+    filler = "Weather was mild across the region with light winds today."
+    pages = [
+        page(
+            "https://a.example/",
+            f"{filler}\n\nLight rain is expected later in the evening hours."
+            "\n\nThe Bullet 350 price rose by four percent.",
+        ),
+        page(
+            "https://b.example/",
+            f"Bullet 350 price list for every city in India.\n\n{filler}",
+        ),
+    ]
+
+    selected = builder.select("bullet 350 price", pages)
+    assert [(p["url"], p["position"]) for p in selected] == [
+        ("https://a.example/", 2),
+        ("https://b.example/", 0),
+    ]
+    assert all(p["score"] > 0 for p in selected)
+
+
+def test_select_caps_passages_per_source_and_skips_repeats():
+    builder = ContextBuilder(
+        passage_tokens=8, max_passages_per_source=2, min_passage_words=3
+    )
+    text = "\n\n".join(f"Bullet 350 price note number {n}." for n in range(5))
+    pages = [
+        page("https://a.example/", text),
+        page("https://b.example/", "Bullet 350 price note number 0."),
+    ]
+
+    selected = builder.select("bullet 350 price", pages)
+    assert sum(p["url"] == "https://a.example/" for p in selected) == 2
+    assert all(p["url"] == "https://a.example/" for p in selected)
+
+
+def test_format_groups_by_source_and_marks_gaps():
+    passages = [
+        {"url": "https://a.example/", "text": "First.", "position": 0},
+        {"url": "https://a.example/", "text": "Second.", "position": 1},
+        {"url": "https://a.example/", "text": "Fifth.", "position": 4},
+        {"url": "https://b.example/", "text": "Other.", "position": 2},
+    ]
+
+    assert ContextBuilder.format(passages) == (
+        "Source: https://a.example/\nContent: First.\n\nSecond.\n...\nFifth."
+        "\n\nSource: https://b.example/\nContent: Other."
+    )
+    assert ContextBuilder.format([]) == ""
+
+
+def test_pages_without_markdown_are_skipped():
+    builder = ContextBuilder()
+
+    assert builder.build("anything", [page("https://dead.example/", None)]) == ""
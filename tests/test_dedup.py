@@ -0,0 +1,74 @@
+import pytest
+
+from core.dedup import Deduplicator, canonicalize_url, hamming_distance, simhash
+from core.tokenizer import Tokenizer
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "http://www.example.com/news/story/",
+        "https://EXAMPLE.com:443/news/story#comments",
+        "https://example.com/news/story?utm_source=x&fbclid=y",
+        "https://example.com//news/story/amp",
+        "https://example.com/news/story.amp.html",
+        "https://amp.example.com/news/story",
+        "https://www-example-com.cdn.ampproject.org/c/s/www.example.com/news/story",
+    ],
+)
+def test_variants_share_a_canonical_url(variant):
+    assert canonicalize_url(variant) == "https://example.com/news/story"
+
+
+def test_query_parameters_are_sorted_and_kept():
+    assert (
+        canonicalize_url("https://example.com/s?q=bikes&page=2&utm_medium=mail")
+        == "https://example.com/s?page=2&q=bikes"
+    )
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com/amp/stories/launch",
+        "https://amp.dev/documentation",
+        "https://amp.co.uk/about",
+        "https://example.com:8080/page",
+    ],
+)
+def test_distinct_pages_are_not_collapsed(url):
+    assert canonicalize_url(url) == url
+
+
+def test_amp_subdomain_of_country_code_domain():
+    assert canonicalize_url("https://amp.bbc.co.uk/news") == "https://bbc.co.uk/news"
+
+
+def test_simhash_is_close_for_near_identical_texts():
+    tokenize = Tokenizer()
+    a = simhash(tokenize("Royal Enfield Bullet 350 launched at Rs 1.5 lakh in India"))
+    b = simhash(tokenize("Royal Enfield Bullet 350 launched at Rs 1.5 lakh in India!"))
+    c = simhash(tokenize("Bitcoin price falls after exchange outage in Asia"))
+    assert hamming_distance(a, b) == 0
+    assert hamming_distance(a, c) > 3
+
+
+def test_deduplicator_drops_repeated_urls_and_near_duplicates():
+    title = "Royal Enfield Bullet 350 review: the classic gets a new engine"
+    deduplicator = Deduplicator(Tokenizer())
+    results = [
+        {"link": "https://example.com/a", "title": title, "snippet": ""},
+        {"link": "https://www.example.com/a/", "title": "Other", "snippet": ""},
+        {"link": "https://mirror.example/b", "title": title + "!", "snippet": ""},
+        {"link": "https://example.com/c", "title": "Bitcoin falls", "snippet": ""},
+        {"link": "https://example.com/d", "title": "Bitcoin falls", "snippet": ""},
+    ]
+    # State carries over between groups, as in streamed search results
+    kept = deduplicator.filter(results[:2]) + deduplicator.filter(results[2:])
+
+    assert [r["link"] for r in kept] == [
+        "https://example.com/a",
+        "https://example.com/c",
+        "https://example.com/d",  # Too short to fingerprint
+    ]
+    assert deduplicator.duplicates == 2
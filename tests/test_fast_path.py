@@ -0,0 +1,113 @@
+import asyncio
+
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+
+from core.fast_path import HTTPFastPath
+from core.politeness import HostScheduler
+from core.scrape import Crawl4AIScraper
+
+URL = "https://news.example/story"
+ARTICLE = " ".join(["Server rendered article text."] * 40)
+
+
+def crawl_result(markdown="", html="<html></html>", status_code=200, success=True):
+    return CrawlResult(
+        url=URL,
+        html=html,
+        success=success,
+        status_code=status_code,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=markdown,
+            markdown_with_citations=markdown,
+            references_markdown="",
+        ),
+    )
+
+
+class FakeHTTPCrawler:
+    def __init__(self, result):
+        self.result = result
+
+    async def arun(self, url, config=None):
+        return self.result
+
+
+def fast_path_answering(result):
+    fast_path = HTTPFastPath()
+
+    async def get_crawler():
+        return FakeHTTPCrawler(result)
+
+    fast_path._get_crawler = get_crawler
+    return fast_path
+
+
+def test_check_accepts_pages_with_enough_text():
+    assert HTTPFastPath().check(crawl_result(ARTICLE), 10) is None
+
+
+def test_check_explains_rejections():
+    fast_path = HTTPFastPath()
+
+    assert fast_path.check(crawl_result(ARTICLE, status_code=403), 10) == "blocked"
+    assert fast_path.check(crawl_result(success=False), 10) == "error"
+    assert fast_path.check(crawl_result(html="Just a moment..."), 10) == "blocked"
+    shell = '<div id="root"></div><script src="app.js"></script>'
+    assert fast_path.check(crawl_result(html=shell), 10) == "js_shell"
+    assert fast_path.check(crawl_result("Too short."), 10) == "thin"
+
+
+def test_domain_goes_to_the_browser_after_it_recovers_a_page():
+    fast_path = fast_path_answering(crawl_result("Too short."))
+    result, reason = asyncio.run(fast_path.fetch(URL, None, 10))
+    assert reason == "thin" and result is not None
+
+    browser_page = Crawl4AIScraper._empty_result(URL, 200)
+    browser_page["metadata"]["success"] = True
+    browser_page["content"]["markdown"]["raw"] = ARTICLE
+    fast_path.record_browser_result(URL, browser_page)
+
+    assert fast_path.needs_browser("https://www.news.example/other")
+    assert not fast_path.needs_browser("https://elsewhere.example/")
+    assert fast_path.stats()["browser_domains"] == 1
+
+
+def test_verdicts_expire():
+    fast_path = HTTPFastPath(verdict_ttl=-1)
+    fast_path._rejected[URL] = 0
+    browser_page = Crawl4AIScraper._empty_result(URL, 200)
+    browser_page["metadata"]["success"] = True
+    browser_page["content"]["markdown"]["raw"] = ARTICLE
+    fast_path.record_browser_result(URL, browser_page)
+
+    assert not fast_path.needs_browser(URL)
+
+
+def make_scraper(fast_path):
+    return Crawl4AIScraper(
+        monitor=False,
+        use_page_store=False,
+        fast_path=fast_path,
+        host_scheduler=HostScheduler(min_interval=0),
+    )
+
+
+def test_scraper_serves_accepted_pages_without_a_browser():
+    scraper = make_scraper(fast_path_answering(crawl_result(ARTICLE)))
+
+    result = asyncio.run(
+        scraper._render_unscheduled(None, URL, scraper.default_run_config)
+    )
+    assert result["metadata"]["renderer"] == "http"
+    assert result["content"]["markdown"]["raw"] == ARTICLE
+
+
+def test_scraper_falls_back_to_the_browser():
+    scraper = make_scraper(fast_path_answering(crawl_result("Too short.")))
+    browser = FakeHTTPCrawler(crawl_result(ARTICLE))
+
+    result = asyncio.run(
+        scraper._render_unscheduled(browser, URL, scraper.default_run_config)
+    )
+    assert result["metadata"]["renderer"] == "browser"
+    assert scraper.fast_path.needs_browser(URL)
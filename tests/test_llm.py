@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessage
+
+from core.llm import AsyncLLM
+
+
+def chunk(content=None, tool_calls=None):
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "test",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": content, "tool_calls": tool_calls},
+                    "finish_reason": None,
+                }
+            ],
+        }
+    )
+
+
+def fragment(index, arguments, call_id=None, name=None):
+    function = {"arguments": arguments}
+    if name:
+        function["name"] = name
+    return {"index": index, "id": call_id, "type": "function", "function": function}
+
+
+async def stream_of(chunks):
+    for item in chunks:
+        yield item
+
+
+def search_calls(*queries):
+    return ChatCompletionMessage.model_validate(
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{n}",
+                    "type": "function",
+                    "function": {"name": "web_search", "arguments": query},
+                }
+                for n, query in enumerate(queries)
+            ],
+        }
+    )
+
+
+def test_collect_stream_joins_content():
+    seen = []
+    chunks = [chunk("Royal "), chunk("Enfield"), chunk()]
+
+    message = asyncio.run(AsyncLLM.collect_stream(stream_of(chunks), seen.append))
+    assert message.content == "Royal Enfield"
+    assert message.tool_calls is None
+    assert seen == ["Royal ", "Royal Enfield"]
+
+
+def test_collect_stream_merges_interleaved_tool_call_fragments():
+    chunks = [
+        chunk(tool_calls=[fragment(0, '{"query": ', "call_a", "web_search")]),
+        chunk(tool_calls=[fragment(1, '{"query": "btc"}', "call_b", "web_search")]),
+        chunk(tool_calls=[fragment(0, '"bullet 350"}')]),
+    ]
+    chunks.append(chunks[0].model_copy(update={"choices": []}))
+
+    message = asyncio.run(AsyncLLM.collect_stream(stream_of(chunks)))
+    assert message.content is None
+    calls = [(c.id, c.function.name, c.function.arguments) for c in message.tool_calls]
+    assert calls == [
+        ("call_a", "web_search", '{"query": "bullet 350"}'),
+        ("call_b", "web_search", '{"query": "btc"}'),
+    ]
+
+
+def test_tool_calls_run_concurrently_and_answer_in_order():
+    llm = AsyncLLM("You are helpful.", api_key="test")
+
+    async def execute(call):
+        await asyncio.sleep(0.2 if call.id == "call_0" else 0.1)
+        return f"results for {call.function.arguments}"
+
+    start = time.perf_counter()
+    results = asyncio.run(llm.run_tool_calls(search_calls("a", "b"), execute))
+    assert time.perf_counter() - start < 0.3
+    assert results == ["results for a", "results for b"]
+    assistant, *answers = llm.conversation_history[-3:]
+    assert assistant["role"] == "assistant" and len(assistant["tool_calls"]) == 2
+    assert [(m["role"], m["tool_call_id"]) for m in answers] == [
+        ("tool", "call_0"),
+        ("tool", "call_1"),
+    ]
+
+
+def test_failed_tool_call_is_answered_with_its_error():
+    llm = AsyncLLM("You are helpful.", api_key="test")
+
+    async def execute(call):
+        if call.function.arguments == "bad":
+            raise RuntimeError("search failed")
+        return "ok"
+
+    results = asyncio.run(llm.run_tool_calls(search_calls("bad", "good"), execute))
+    assert results == ["Error running web_search: search failed", "ok"]
+    assert llm.conversation_history[-2]["content"] == results[0]
+
+
+def test_cancellation_in_a_tool_call_propagates():
+    llm = AsyncLLM("You are helpful.", api_key="test")
+
+    async def execute(call):
+        raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(llm.run_tool_calls(search_calls("a"), execute))
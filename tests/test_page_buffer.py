@@ -0,0 +1,76 @@
+from core.page_buffer import PageBuffer, PageHandle
+from core.scrape import Crawl4AIScraper
+
+BODY = "Café naïve 日本 " * 2000
+
+
+def test_small_bodies_stay_strings():
+    with PageBuffer(threshold=1024) as buffer:
+        assert buffer.spill("short") == "short"
+        assert buffer.spill(None) is None
+        assert buffer.stats() == {"spilled": 0, "bytes": 0}
+
+
+def test_large_bodies_round_trip_through_handles():
+    with PageBuffer(threshold=1024) as buffer:
+        first, second = buffer.spill(BODY), buffer.spill(BODY.upper())
+
+        assert isinstance(first, PageHandle) and first
+        assert str(first) == BODY and str(second) == BODY.upper()
+        assert len(first) == len(BODY.encode("utf-8"))
+        assert buffer.size == len(first) + len(second)
+
+
+def test_reads_slice_bytes_without_copying_the_body():
+    with PageBuffer(threshold=1024) as buffer:
+        handle = buffer.spill(BODY)
+
+        assert handle.read(0, 6) == "Café "  # "é" is two bytes
+        assert handle.read(0, 4) == "Caf"  # A character cut in half is dropped
+        with handle.memoryview(0, 4) as view:
+            assert bytes(view) == b"Caf\xc3"
+
+
+def test_handles_stay_valid_as_the_file_grows():
+    with PageBuffer(threshold=1024) as buffer:
+        first = buffer.spill(BODY)
+        assert str(first) == BODY  # Maps the file at its current size
+        handles = [buffer.spill(BODY + str(n)) for n in range(5)]
+
+        assert str(first) == BODY
+        assert [str(h)[-1] for h in handles] == list("01234")
+
+
+def test_spill_result_copies_and_replaces_large_bodies():
+    result = Crawl4AIScraper._empty_result("https://a.example/", 200)
+    result["content"]["markdown"]["raw"] = BODY
+    result["content"]["html"]["raw"] = "<p>small</p>"
+
+    with PageBuffer(threshold=1024) as buffer:
+        spilled = buffer.spill_result(result)
+
+        assert isinstance(spilled["content"]["markdown"]["raw"], PageHandle)
+        assert spilled["content"]["html"]["raw"] == "<p>small</p>"
+        assert spilled["metadata"] is result["metadata"]
+        assert result["content"]["markdown"]["raw"] == BODY  # Input untouched
+
+
+def test_scrape_results_can_be_spilled_when_projected():
+    result = Crawl4AIScraper._empty_result("https://a.example/", 200)
+    result["content"]["markdown"]["raw"] = BODY
+
+    with PageBuffer(threshold=1024) as buffer:
+        projected = Crawl4AIScraper._project(
+            result, ("content.markdown.raw", "metadata.url"), buffer
+        )
+        assert str(projected["content"]["markdown"]["raw"]) == BODY
+        assert buffer.stats()["spilled"] == 1
+
+
+def test_close_tolerates_views_still_in_use():
+    buffer = PageBuffer(threshold=1024)
+    view = buffer.spill(BODY).memoryview()
+
+    buffer.close()
+    assert bytes(view[:3]) == b"Caf"
+    view.release()
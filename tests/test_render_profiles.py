@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+from core.render_profiles import RenderProfile, RenderProfiles
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = []
+
+    async def route(self, pattern, handler):
+        self.handlers.append(handler)
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url, subframe=False):
+        frame = SimpleNamespace(parent_frame=object() if subframe else None)
+        self.request = SimpleNamespace(
+            resource_type=resource_type, url=url, frame=frame
+        )
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+
+def route_requests(profiles, page_url, requests):
+    """Render page_url's before_goto hook and send requests through its route."""
+    page = FakePage()
+
+    async def run():
+        await profiles._before_goto(page, url=page_url)
+        outcomes = []
+        for request in requests:
+            route = FakeRoute(*request)
+            for handler in page.handlers:
+                await handler(route)
+            outcomes.append(route.outcome)
+        return outcomes
+
+    return asyncio.run(run()), page
+
+
+def test_domain_overrides_match_parent_domains():
+    profiles = RenderProfiles(domain_profiles={"bloomberg.com": "full"})
+
+    assert profiles.profile_for("https://www.bloomberg.com/news").name == "full"
+    assert profiles.profile_for("https://notbloomberg.com/").name == "lite"
+
+
+def test_trackers_match_subdomains_only():
+    profiles = RenderProfiles()
+
+    assert profiles.is_tracker("https://www.google-analytics.com/collect")
+    assert not profiles.is_tracker("https://analytics.example.com/")
+
+
+def test_lite_profile_blocks_media_and_trackers():
+    profiles = RenderProfiles()
+    outcomes, _ = route_requests(
+        profiles,
+        "https://news.example/story",
+        [
+            ("document", "https://news.example/story"),
+            ("script", "https://news.example/app.js"),
+            ("image", "https://news.example/photo.jpg"),
+            ("script", "https://www.googletagmanager.com/gtm.js"),
+            ("document", "https://ad.doubleclick.net/frame", True),
+        ],
+    )
+
+    assert outcomes == ["fallback", "fallback", "abort", "abort", "abort"]
+    assert profiles.stats() == {
+        "pages": {"lite": 1},
+        "blocked": {"image": 1, "script": 1, "document": 1},
+    }
+
+
+def test_full_profile_adds_no_routing():
+    profiles = RenderProfiles(default="full")
+    _, page = route_requests(profiles, "https://news.example/", [])
+
+    assert page.handlers == []
+
+
+def test_document_type_is_never_blocked():
+    assert "document" not in RenderProfile("x", ("document", "image")).blocked_types
+
+
+def test_shared_profiles_read_the_environment(monkeypatch):
+    monkeypatch.setenv("RENDER_PROFILE", "text")
+    monkeypatch.setenv("RENDER_PROFILE_OVERRIDES", "a.example=full, b.example = lite")
+    monkeypatch.setattr(RenderProfiles, "_shared", None)
+
+    profiles = RenderProfiles.shared()
+    assert profiles.default.name == "text"
+    assert profiles.profile_for("https://a.example/").name == "full"
+    assert profiles.profile_for("https://b.example/").name == "lite"
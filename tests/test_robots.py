@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+
+from core.robots import RobotsCache
+
+ROBOTS = "User-agent: *\nDisallow: /private/\n\nUser-agent: BadBot\nDisallow: /\n"
+
+
+def client_serving(responses):
+    """HTTP client answering robots.txt per origin; counts the requests."""
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        answer = responses[request.url.host]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+def check(cache, client, urls, user_agent="*"):
+    async def run():
+        return [await cache.allowed(url, client, user_agent) for url in urls]
+
+    return asyncio.run(run())
+
+
+def test_rules_are_fetched_once_per_origin():
+    cache = RobotsCache()
+    client, requests = client_serving({"a.example": httpx.Response(200, text=ROBOTS)})
+    urls = ["https://a.example/", "https://a.example/private/x", "https://a.example/y"]
+
+    assert check(cache, client, urls) == [True, False, True]
+    assert check(cache, client, urls, user_agent="BadBot") == [False] * 3
+    assert requests == ["https://a.example/robots.txt"]
+    assert cache.stats()["hits"] == 5 and cache.stats()["disallowed"] == 4
+
+
+def test_concurrent_lookups_share_one_fetch():
+    cache = RobotsCache()
+    client, requests = client_serving({"a.example": httpx.Response(200, text=ROBOTS)})
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.allowed(f"https://a.example/{n}", client) for n in range(5))
+        )
+
+    assert asyncio.run(run()) == [True] * 5
+    assert len(requests) == 1
+
+
+def test_missing_and_unreachable_robots_allow_everything():
+    cache = RobotsCache(missing_ttl=100, error_ttl=0)
+    client, requests = client_serving(
+        {
+            "missing.example": httpx.Response(404),
+            "down.example": httpx.ConnectError("refused"),
+        }
+    )
+    urls = ["https://missing.example/private/", "https://down.example/private/"]
+
+    assert check(cache, client, urls) == [True, True]
+    check(cache, client, urls)
+    # The 404 is remembered; the unreachable origin is retried
+    assert requests.count("https://missing.example/robots.txt") == 1
+    assert requests.count("https://down.example/robots.txt") == 2
+
+
+def test_expired_rules_are_refetched():
+    cache = RobotsCache(ttl=0)
+    client, requests = client_serving({"a.example": httpx.Response(200, text=ROBOTS)})
+
+    check(cache, client, ["https://a.example/", "https://a.example/"])
+    assert len(requests) == 2
+
+
+def test_least_recently_used_origins_are_forgotten():
+    cache = RobotsCache(max_origins=2)
+    client, _ = client_serving(
+        {host: httpx.Response(404) for host in ("a.example", "b.example", "c.example")}
+    )
+
+    check(cache, client, ["https://a.example/", "https://b.example/"])
+    check(cache, client, ["https://a.example/", "https://c.example/"])
+    assert list(cache._entries) == ["https://a.example", "https://c.example"]
+
+
+def test_non_http_urls_are_allowed_without_a_fetch():
+    cache = RobotsCache()
+    client, requests = client_serving({})
+
+    assert check(cache, client, ["mailto:someone@example.com", "/relative"]) == [
+        True,
+        True,
+    ]
+    assert requests == []
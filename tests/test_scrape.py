@@ -0,0 +1,343 @@
+import asyncio
+
+import pytest
+
+from core.politeness import HostScheduler
+from core.scrape import Crawl4AIScraper
+
+GOOD = "https://good.example/page"
+DEAD = "http://127.0.0.1:1/dead"
+
+
+def make_scraper(**kwargs):
+    return Crawl4AIScraper(
+        monitor=False,
+        use_page_store=False,
+        use_http_fast_path=False,
+        host_scheduler=HostScheduler(min_interval=0),
+        **kwargs,
+    )
+
+
+def page(url, markdown="Some page text that is long enough to keep around."):
+    result = Crawl4AIScraper._empty_result(url, 200)
+    result["metadata"]["success"] = True
+    result["content"]["markdown"]["raw"] = markdown
+    return result
+
+
+def render_good_pages(scraper):
+    """Render GOOD without a browser; DEAD fails like an unreachable host."""
+
+    async def render(crawler, url, run_config):
+        if url == DEAD:
+            raise ConnectionError("connection refused")
+        return page(url)
+
+    scraper._render_unscheduled = render
+    return scraper
+
+
+def test_scrape_many_keeps_good_pages_when_one_fails():
+    scraper = render_good_pages(make_scraper())
+    results = asyncio.run(scraper.scrape_many([GOOD, DEAD]))
+
+    assert [r["metadata"]["url"] for r in results] == [GOOD, DEAD]
+    assert results[0]["metadata"]["success"]
+    assert not results[1]["metadata"]["success"]
+    assert "connection refused" in results[1]["metadata"]["error"]
+
+
+def test_scrape_many_stream_yields_failed_page():
+    scraper = render_good_pages(make_scraper())
+
+    async def collect():
+        stream = await scraper.scrape_many([DEAD, GOOD], stream=True)
+        return {r["metadata"]["index"]: r async for r in stream}
+
+    results = asyncio.run(collect())
+    assert results[1]["metadata"]["success"]
+    assert not results[0]["metadata"]["success"]
+
+
+def test_scrape_stream_yields_failed_page():
+    scraper = render_good_pages(make_scraper())
+
+    async def collect():
+        return [r async for r in scraper.scrape_stream([GOOD, DEAD])]
+
+    results = {r["metadata"]["url"]: r for r in asyncio.run(collect())}
+    assert results[GOOD]["metadata"]["success"]
+    assert "connection refused" in results[DEAD]["metadata"]["error"]
+
+
+def test_store_hits_only_serve_stored_fields():
+    from core.page_store import PageStore
+
+    renders = []
+    scraper = make_scraper()
+    scraper.page_store = PageStore()
+
+    async def render(crawler, url, run_config):
+        renders.append(url)
+        result = page(url)
+        result["content"]["html"]["raw"] = "<p>Some page text</p>"
+        return result
+
+    scraper._render_unscheduled = render
+    fields = ("metadata.url", "content.markdown.raw")
+
+    async def scenario():
+        first = await scraper.scrape(GOOD)
+        again = await scraper.scrape(GOOD)
+        projected = await scraper.scrape(GOOD, fields=fields)
+        many = await scraper.scrape_many([GOOD], fields=fields)
+        return first, again, projected, many[0]
+
+    first, again, projected, many = asyncio.run(scenario())
+    # Full results never come from the store, so their shape does not change
+    assert first["content"]["html"]["raw"] == again["content"]["html"]["raw"]
+    assert not again["metadata"].get("from_store")
+    # Callers that only want stored fields are served from the store
+    assert projected == {
+        "metadata": {"url": GOOD},
+        "content": {"markdown": {"raw": page(GOOD)["content"]["markdown"]["raw"]}},
+    }
+    assert renders == [GOOD, GOOD]
+    assert many == projected
+
+
+class FailingStrategy:
+    async def crawl(self, url, config=None):
+        raise ConnectionError("connection refused")
+
+
+class FakeCrawler:
+    """Crawler whose fetches fail like an unreachable host."""
+
+    def __init__(self, strategy=None):
+        self.crawler_strategy = strategy or FailingStrategy()
+
+    async def arun(self, url, config=None):
+        from crawl4ai.models import CrawlResult
+
+        return CrawlResult(url=url, html="", success=False, error_message="refused")
+
+
+def render_failure(scraper, crawler):
+    return asyncio.run(
+        scraper._render_unscheduled(crawler, DEAD, scraper.default_run_config)
+    )
+
+
+def test_failed_browser_fetch_is_a_failed_result():
+    result = render_failure(make_scraper(), FakeCrawler())
+    assert not result["metadata"]["success"]
+    assert result["content"]["markdown"]["raw"] is None
+    assert result["metadata"]["error"] == "refused"
+
+
+def test_failed_offloaded_fetch_is_a_failed_result():
+    from core.html_processing import HTMLProcessPool
+
+    scraper = make_scraper(offload_processing=True, html_pool=HTMLProcessPool())
+    result = render_failure(scraper, FakeCrawler())
+    assert not result["metadata"]["success"]
+    assert "connection refused" in result["metadata"]["error"]
+
+
+def test_failed_offloaded_processing_is_a_failed_result(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from crawl4ai.models import AsyncCrawlResponse
+
+    import core.html_processing
+    from core.html_processing import HTMLProcessPool
+
+    class Strategy:
+        async def crawl(self, url, config=None):
+            return AsyncCrawlResponse(
+                html="<p>text</p>", response_headers={}, status_code=200
+            )
+
+    def broken(*args):
+        raise ValueError("cannot parse page")
+
+    pool = HTMLProcessPool(workers=1)
+    pool._executor = ThreadPoolExecutor(1)  # Run in-process so the patch applies
+    monkeypatch.setattr(core.html_processing, "_process_html", broken)
+
+    scraper = make_scraper(offload_processing=True, html_pool=pool)
+    result = render_failure(scraper, FakeCrawler(Strategy()))
+    pool.close()
+    assert not result["metadata"]["success"]
+    assert result["metadata"]["status_code"] == 200
+    assert "cannot parse page" in result["metadata"]["error"]
+
+
+def test_robots_blocked_urls_do_not_wait_for_a_window_slot():
+    scraper = make_scraper()
+    blocked = ["https://good.example/private/1", "https://good.example/private/2"]
+
+    async def allowed(url):
+        return "/private/" not in url
+
+    async def collect():
+        release = asyncio.Event()
+
+        async def render(crawler, url, run_config):
+            await release.wait()
+            return page(url)
+
+        scraper._robots_allowed = allowed
+        scraper._render_unscheduled = render
+        stream = scraper._stream_crawl(
+            None,
+            [GOOD, *blocked],
+            scraper._resolve_config(None),
+            window=1,
+            coalesce=False,
+            check_robots_txt=True,
+        )
+        # GOOD holds the only slot; the blocked URLs come back regardless
+        results = [
+            await asyncio.wait_for(stream.__anext__(), timeout=1) for _ in blocked
+        ]
+        release.set()
+        results.append(await asyncio.wait_for(stream.__anext__(), timeout=1))
+        await stream.aclose()
+        return results
+
+    results = asyncio.run(collect())
+    assert [r["metadata"]["url"] for r in results] == [*blocked, GOOD]
+    assert all(r["metadata"]["robots_blocked"] for r in results[:2])
+    assert results[2]["metadata"]["success"]
+
+
+def render_with_delays(scraper, delays):
+    """Render every URL without a browser, after delays[url] seconds."""
+    rendered = []
+
+    async def render(crawler, url, run_config):
+        await asyncio.sleep(delays.get(url, 0))
+        rendered.append(url)
+        return page(url)
+
+    scraper._render_unscheduled = render
+    return rendered
+
+
+def test_scrape_many_stream_yields_in_completion_order():
+    scraper = make_scraper()
+    urls = [f"https://site{n}.example/" for n in range(3)]
+    rendered = render_with_delays(scraper, {urls[0]: 0.2, urls[1]: 0.1})
+
+    async def collect():
+        stream = await scraper.scrape_many(urls, stream=True)
+        arrivals = []
+        async for result in stream:
+            # Each result arrives as soon as its own page finishes
+            arrivals.append((result["metadata"]["index"], len(rendered)))
+        return arrivals
+
+    assert asyncio.run(collect()) == [(2, 1), (1, 2), (0, 3)]
+
+
+def test_scrape_many_stream_with_batch_size_keeps_indices():
+    scraper = make_scraper()
+    urls = [f"https://site{n}.example/" for n in range(5)]
+    render_with_delays(scraper, {urls[0]: 0.05})
+
+    async def collect():
+        stream = await scraper.scrape_many(urls, stream=True, batch_size=2)
+        return {r["metadata"]["index"]: r["metadata"]["url"] async for r in stream}
+
+    assert asyncio.run(collect()) == dict(enumerate(urls))
+
+
+def test_fields_are_validated_and_collapsed():
+    check = Crawl4AIScraper._check_fields
+
+    assert check(None) is None
+    assert check(["metadata.url", "metadata", "content.markdown.raw"]) == (
+        "content.markdown.raw",
+        "metadata",
+    )
+    with pytest.raises(ValueError):
+        check(["content.pdf"])
+
+
+def test_projection_keeps_only_requested_fields():
+    scraper = render_good_pages(make_scraper())
+    fields = ["content.markdown.raw", "metadata.url"]
+
+    results = asyncio.run(scraper.scrape_many([GOOD], fields=fields))
+    assert results == [
+        {
+            "content": {"markdown": {"raw": page(GOOD)["content"]["markdown"]["raw"]}},
+            "metadata": {"url": GOOD},
+        }
+    ]
+
+
+def test_projection_does_not_touch_the_full_result():
+    full = page(GOOD)
+    projected = Crawl4AIScraper._project(full, ("metadata.url",))
+
+    assert projected == {"metadata": {"url": GOOD}}
+    assert full["content"]["html"] == {"raw": "", "cleaned": None}
+
+
+def test_scrape_many_skips_pages_robots_txt_disallows():
+    scraper = render_good_pages(make_scraper())
+    blocked = "https://good.example/private/1"
+
+    async def allowed(url):
+        return "/private/" not in url
+
+    scraper._robots_allowed = allowed
+    results = asyncio.run(scraper.scrape_many([blocked, GOOD], check_robots_txt=True))
+
+    assert results[0]["metadata"]["robots_blocked"]
+    assert results[0]["metadata"]["status_code"] == 403
+    assert results[1]["metadata"]["success"]
+
+
+def test_deadline_returns_partial_results():
+    scraper = make_scraper()
+    fast, slow = "https://fast.example/", "https://slow.example/"
+    render_with_delays(scraper, {slow: 5})
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await scraper.scrape_many([slow, fast], deadline=0.2)
+        return results, loop.time() - start
+
+    results, elapsed = asyncio.run(run())
+    assert elapsed < 1
+    assert results[0]["metadata"]["timed_out"] and not results[0]["metadata"]["success"]
+    assert results[1]["metadata"]["success"]
+
+
+def test_first_k_stops_after_enough_good_pages():
+    scraper = make_scraper()
+    urls = [f"https://site{n}.example/" for n in range(3)]
+    rendered = render_with_delays(scraper, {urls[1]: 5, urls[2]: 5})
+
+    results = asyncio.run(scraper.scrape_many(urls, first_k=1))
+    assert results[0]["metadata"]["success"]
+    assert all(r["metadata"]["skipped"] for r in results[1:])
+    assert rendered == [urls[0]]
+
+
+def test_scrape_stream_ends_at_the_deadline():
+    scraper = make_scraper()
+    urls = ["https://fast.example/", "https://slow.example/"]
+    render_with_delays(scraper, {urls[1]: 5})
+
+    async def collect():
+        stream = scraper.scrape_stream(urls, deadline=0.2)
+        return [r["metadata"]["url"] async for r in stream]
+
+    assert asyncio.run(collect()) == urls[:1]
@@ -0,0 +1,117 @@
+import asyncio
+
+from core.cache import SearchCache
+from core.search import Search
+
+
+class ScriptedSerper:
+    """Answers each query with results named after it, after an optional delay."""
+
+    endpoint = "https://serper.test/search"
+    api_key = "test"
+
+    def __init__(self, delays=None, error=None):
+        self.delays = delays or {}
+        self.error = error
+        self.payloads = []
+
+    async def answer(self, query):
+        await asyncio.sleep(self.delays.get(query, 0))
+        return {
+            "organic": [
+                {
+                    "link": f"https://{n}.example/{query.replace(' ', '-')}",
+                    "title": f"{query} result {n}",
+                    "snippet": f"Snippet {n} about {query}",
+                }
+                for n in range(3)
+            ]
+        }
+
+    async def post(self, payload, timeout=None):
+        self.payloads.append(payload)
+        if self.error is not None:
+            raise self.error
+        if isinstance(payload, list):
+            return list(
+                await asyncio.gather(*(self.answer(item["q"]) for item in payload))
+            )
+        return await self.answer(payload["q"])
+
+
+def make_search(client, exclusions=(), **kwargs):
+    kwargs.setdefault("use_cache", False)
+    return Search(list(exclusions), client=client, use_session_index=False, **kwargs)
+
+
+def test_sync_wrapper_works_inside_a_running_loop():
+    engine = make_search(ScriptedSerper())
+
+    async def from_async_code():
+        return engine._execute_search("bikes", 2)
+
+    results = asyncio.run(from_async_code())
+    assert [r["title"] for r in results] == ["bikes result 0", "bikes result 1"]
+
+
+def test_exclusions_apply_only_when_asked():
+    engine = make_search(ScriptedSerper(), exclusions=["0.example"])
+
+    filtered = asyncio.run(engine._aexecute_search("bikes", 5, True))
+    unfiltered = asyncio.run(engine._aexecute_search("bikes", 5, False))
+    assert [r["link"] for r in filtered] == [
+        "https://1.example/bikes",
+        "https://2.example/bikes",
+    ]
+    assert len(unfiltered) == 3
+
+
+def test_failed_search_returns_no_results():
+    engine = make_search(ScriptedSerper(error=RuntimeError("Serper is down")))
+
+    assert asyncio.run(engine._aexecute_search("bikes")) == []
+
+
+def test_expired_results_are_served_while_serper_fails():
+    cache = SearchCache(ttls={"main": 0})
+    client = ScriptedSerper()
+    engine = make_search(client, use_cache=True, cache=cache)
+    fresh = asyncio.run(engine._aexecute_search("bikes"))
+
+    client.error = RuntimeError("Serper is down")
+    assert asyncio.run(engine._aexecute_search("bikes")) == fresh
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_main_and_generated_queries_run_as_one_fanout():
+    client = ScriptedSerper(delays={"main": 0.2, "gen a": 0.2, "gen b": 0.2})
+    engine = make_search(client, batch_size=0)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await engine.arun_all_searches(
+            "main", ["gen a", "gen b"], filter=False, dedupe=False
+        )
+        return results, loop.time() - start
+
+    results, elapsed = asyncio.run(run())
+    assert elapsed < 0.35  # Not 0.2 s for the main query plus 0.2 s for the rest
+    assert [r["title"] for r in results[:5]] == [
+        *(f"main result {n}" for n in range(3)),
+        "gen a result 0",
+        "gen a result 1",
+    ]
+
+
+def test_queries_past_the_deadline_are_dropped_and_recorded():
+    client = ScriptedSerper(delays={"slow": 5})
+    engine = make_search(client, batch_size=0)
+
+    results = asyncio.run(
+        engine.arun_all_searches(
+            "main", ["fast", "slow"], filter=False, dedupe=False, timeout=0.2
+        )
+    )
+    assert {r["title"].split()[0] for r in results} == {"main", "fast"}
+    assert engine.timed_out_queries == ["slow"]
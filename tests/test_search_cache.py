@@ -0,0 +1,58 @@
+import asyncio
+
+from core.cache import SearchCache
+from core.search import Search
+
+
+class FakeSerper:
+    endpoint = "https://serper.test/search"
+    api_key = "test"
+
+    def __init__(self):
+        self.requests = 0
+
+    async def post(self, payload, timeout=None):
+        self.requests += 1
+        return {
+            "organic": [
+                {"link": "https://a.com/x", "title": "A"},
+                {"link": "https://b.com/x", "title": "B"},
+                {"link": "https://c.com/x", "title": "C"},
+            ]
+        }
+
+
+def test_cache_key_includes_exclusions():
+    assert SearchCache.make_key("q", 5, ["a.com"]) != SearchCache.make_key(
+        "q", 5, ["b.com"]
+    )
+    assert SearchCache.make_key("q", 5, ["a.com", "b.com"]) == SearchCache.make_key(
+        "q", 5, ["b.com", "a.com"]
+    )
+    assert SearchCache.make_key("q", 5, None) != SearchCache.make_key("q", 5, [])
+
+
+def test_personas_do_not_share_filtered_results():
+    cache, client = SearchCache(), FakeSerper()
+    persona_a = Search(["a.com"], cache=cache, client=client, use_session_index=False)
+    persona_b = Search(["b.com"], cache=cache, client=client, use_session_index=False)
+
+    async def search(engine):
+        return [r["link"] for r in await engine._aexecute_search("q", 5, True)]
+
+    assert asyncio.run(search(persona_a)) == ["https://b.com/x", "https://c.com/x"]
+    assert asyncio.run(search(persona_b)) == ["https://a.com/x", "https://c.com/x"]
+    assert asyncio.run(search(persona_a)) == ["https://b.com/x", "https://c.com/x"]
+    assert client.requests == 2
+
+
+def test_batch_counts_each_miss_once():
+    cache, client = SearchCache(), FakeSerper()
+    engine = Search([], cache=cache, client=client, use_session_index=False)
+
+    asyncio.run(engine._aexecute_batch([("one", 5, False)]))
+    assert cache.stats()["misses"] == 1
+
+    asyncio.run(engine._aexecute_batch([("one", 5, False), ("two", 5, False)]))
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["memory_hits"] == 1
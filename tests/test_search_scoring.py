@@ -0,0 +1,43 @@
+from core.bm25 import IncrementalBM25Index
+from core.search import Search
+
+
+class NoSerper:
+    endpoint = "https://serper.test/search"
+    api_key = "test"
+
+BACKGROUND = [
+    {"title": f"Unrelated headline {n}", "snippet": f"weather report number {n}"}
+    for n in range(30)
+]
+
+
+def make_search(index):
+    return Search([], use_cache=False, client=NoSerper(), index=index)
+
+
+def test_scores_are_comparable_across_groups():
+    index = IncrementalBM25Index()
+    search = make_search(index)
+    search._score_incremental([dict(res) for res in BACKGROUND], "x", 0.0)
+
+    query = "blockchain technology stocks"
+    partial = search._score_incremental(
+        [{"title": "Technology stocks", "snippet": ""}], query, 0.0
+    )
+    full = search._score_incremental(
+        [{"title": "Blockchain technology stocks", "snippet": ""}], query, 0.0
+    )
+    single = search._score_incremental(
+        [{"title": "Blockchain explained", "snippet": ""}], query, 0.1
+    )
+
+    assert full[0]["relevance_score"] > partial[0]["relevance_score"]
+    assert single and single[0]["relevance_score"] >= 0.1
+
+
+def test_cold_index_passes_results_through():
+    search = make_search(IncrementalBM25Index())
+    results = [{"title": "Blockchain explained", "snippet": ""}]
+
+    assert search._score_incremental(results, "blockchain technology", 0.5) == results
@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.serper import (
+    CircuitBreaker,
+    CircuitOpenError,
+    SerperClient,
+    SerperHTTPError,
+    TokenBucket,
+)
+
+
+def make_client(handler, **kw):
+    """A client whose requests go to `handler` instead of the network."""
+    kw.setdefault("backoff_base", 0)
+    client = SerperClient(endpoint="https://serper.test/search", api_key="k", **kw)
+    transport = httpx.MockTransport(handler)
+    client._get_async_client = lambda: httpx.AsyncClient(transport=transport)
+    return client
+
+
+def responses(*items):
+    """Handler answering with `items` in turn (responses or exceptions)."""
+    items = list(items)
+
+    def handler(request):
+        item = items.pop(0)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    return handler
+
+
+def test_retries_server_errors_then_succeeds():
+    client = make_client(
+        responses(httpx.Response(503), httpx.Response(200, json={"organic": []}))
+    )
+
+    assert asyncio.run(client.post({"q": "x"})) == {"organic": []}
+    assert client.stats()["requests"] == 2
+    assert client.stats()["retries"] == 1
+    assert client.breaker.state == "closed"
+
+
+def test_client_errors_are_not_retried_and_keep_the_breaker_closed():
+    client = make_client(responses(httpx.Response(400, text="bad query")))
+
+    with pytest.raises(SerperHTTPError) as info:
+        asyncio.run(client.post({"q": "x"}))
+    assert info.value.status_code == 400
+    assert client.stats()["requests"] == 1
+    assert client.breaker.failures == 0
+
+
+def test_rate_limited_requests_wait_for_retry_after(monkeypatch):
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr("core.serper.asyncio.sleep", fake_sleep)
+    client = make_client(
+        responses(
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200, json={}),
+        )
+    )
+
+    asyncio.run(client.post({"q": "x"}))
+    assert slept == [3.0]
+    assert client.stats()["rate_limited"] == 1
+
+
+def test_backoff_caps_retry_after_and_ignores_dates():
+    client = SerperClient(endpoint="e", api_key="k", backoff_base=1, backoff_max=8)
+
+    assert client._backoff(0, "120") == 8
+    assert 0 <= client._backoff(0, "Wed, 21 Oct 2026 07:28:00 GMT") <= 1
+    assert all(0 <= client._backoff(10) <= 8 for _ in range(100))
+
+
+def test_breaker_opens_after_consecutive_failures():
+    client = make_client(
+        responses(*[httpx.ConnectError("down")] * 2), max_retries=0, failure_threshold=2
+    )
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(client.post({"q": "x"}))
+
+    assert client.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.post({"q": "x"}))
+    assert client.stats()["breaker_rejections"] == 1
+    assert client.stats()["requests"] == 2
+
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    breaker.opened_at -= 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # One trial at a time
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.opened_at -= 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def half_open_client(handler):
+    client = make_client(handler, max_retries=0, failure_threshold=1)
+    client.breaker.record_failure()
+    client.breaker.opened_at -= client.breaker.reset_timeout
+    return client
+
+
+def test_unexpected_error_in_trial_reopens_the_breaker():
+    client = half_open_client(responses(RuntimeError("boom")))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(client.post({"q": "x"}))
+    assert client.breaker.state == "open"
+    assert not client.breaker._trial_in_flight
+
+
+def test_cancelled_trial_is_released_without_a_verdict():
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    client = half_open_client(hang)
+
+    async def cancel_trial():
+        task = asyncio.create_task(client.post({"q": "x"}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert client.breaker.state == "half_open"
+    assert client.breaker.allow()
+
+
+def test_token_bucket_delays_requests_beyond_the_burst():
+    bucket = TokenBucket(rate=100, capacity=2)
+
+    waits = [bucket._reserve(1) for _ in range(4)]
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(0.01, abs=0.002)
+    assert waits[3] == pytest.approx(0.02, abs=0.002)
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.singleflight import Abandoned, SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flights, calls = SingleFlight(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "page"
+
+    async def run():
+        return await asyncio.gather(*(flights.do("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["page"] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flights, calls = SingleFlight(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("bad gateway")
+
+    async def run():
+        return await asyncio.gather(
+            *(flights.do("key", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+    errors = asyncio.run(run())
+    assert all(isinstance(e, ValueError) for e in errors)
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "page"
+
+    async def run():
+        first = asyncio.create_task(flights.do("key", fetch))
+        second = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "page"
+
+
+def test_work_is_cancelled_with_its_last_waiter():
+    flights, cancelled = SingleFlight(), []
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        waiters = [asyncio.create_task(flights.do("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert cancelled == [1]
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_waiters_retry_when_the_leader_abandons():
+    flights = SingleFlight()
+
+    async def run():
+        call, leader = flights.claim("key")
+        assert leader
+        follower = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0.01)
+        flights.abandon("key", call)
+        with pytest.raises(Abandoned):
+            await flights.wait("key", call)
+        return await follower
+
+    async def fetch():
+        return "retried"
+
+    assert asyncio.run(run()) == "retried"
+
+
+def test_callers_on_other_loops_share_the_result():
+    flights, calls = SingleFlight(), []
+    started = threading.Event()
+
+    async def fetch():
+        calls.append(1)
+        started.set()
+        await asyncio.sleep(0.1)
+        return "page"
+
+    results = []
+
+    def other_loop():
+        started.wait()
+        results.append(asyncio.run(flights.do("key", fetch)))
+
+    thread = threading.Thread(target=other_loop)
+    thread.start()
+    results.append(asyncio.run(flights.do("key", fetch)))
+    thread.join()
+
+    assert results == ["page", "page"]
+    assert len(calls) == 1
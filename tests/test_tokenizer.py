@@ -0,0 +1,51 @@
+import random
+import re
+import sys
+
+from core.tokenizer import _NON_DECIMAL_DIGITS, Tokenizer
+
+
+def reference_tokenize(text):
+    """The word-by-word tokenizer Tokenizer replaced."""
+    words = re.findall(r"\w+", text.lower())
+    tokens = []
+    i = 0
+    while i < len(words):
+        if i + 1 < len(words) and words[i + 1].isdigit():
+            tokens.append(f"{words[i]}_{words[i+1]}")
+            i += 2
+        else:
+            tokens.append(words[i])
+            i += 1
+    return tokens
+
+
+def test_merges_words_with_following_numbers():
+    assert Tokenizer()("Royal Enfield Bullet 350 vs Classic-350") == [
+        "royal",
+        "enfield",
+        "bullet_350",
+        "vs",
+        "classic_350",
+    ]
+
+
+def test_non_decimal_digits_merge_like_str_isdigit():
+    tokenizer = Tokenizer()
+    assert tokenizer("x ²") == reference_tokenize("x ²") == ["x_²"]
+    assert tokenizer("area m² 5") == reference_tokenize("area m² 5")
+
+
+def test_non_decimal_digit_ranges_match_this_unicode_version():
+    in_class = re.compile("[%s]" % _NON_DECIMAL_DIGITS).fullmatch
+    for c in map(chr, range(sys.maxunicode + 1)):
+        assert bool(in_class(c)) == (c.isdigit() and not c.isdecimal()), hex(ord(c))
+
+
+def test_matches_reference_tokenizer():
+    rng = random.Random(0)
+    alphabet = ["a", "b", "Z", "é", "1", "7", "٣", "²", "①", "_", " ", "-", ".", "\n"]
+    tokenizer = Tokenizer()
+    for _ in range(5000):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 16)))
+        assert tokenizer(text) == reference_tokenize(text), text